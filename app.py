@@ -10,47 +10,33 @@ sys.path.insert(0, str(project_root / "src"))
 sys.path.insert(0, str(project_root / "src" / "services"))
 sys.path.insert(0, str(project_root / "config"))
 
+import hashlib
+import yaml
 import streamlit as st
-from src.services.rag_service import RAGService
+from src.services.service_registry import registry
+from src.services.chat_history import ChatHistoryStore
+from src.core.telemetry import metrics, start_metrics_server
 from config.settings import settings
+from config.ui.utils.config_loader import UIConfigLoader
 
-# Direct import without ui module
-import yaml
-
-# Load UI configurations directly
-def load_css():
-    css_path = settings.CONFIG_DIR / "ui" / "styles.css"
+def load_ui_file(load, default):
+    """UI ფაილის ჩატვირთვა; დაზიანებული/წაუკითხავი ფაილისას - default (UI არ ვარდება)"""
     try:
-        with open(css_path, 'r', encoding='utf-8') as f:
-            return f.read()
-    except:
-        return ""
+        return load()
+    except (yaml.YAMLError, OSError, ValueError, AttributeError) as e:
+        print(f"⚠️ UI კონფიგურაცია ვერ ჩაიტვირთა: {e}")
+        return default
 
-def load_ui_config():
-    config_path = settings.CONFIG_DIR / "ui" / "ui_config.yaml"
-    try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
-    except:
-        return {}
 
-def load_sample_questions():
-    questions_path = settings.CONFIG_DIR / "ui" / "sample_questions.yaml"
-    try:
-        with open(questions_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-            return data.get('all_questions', [])
-    except:
-        return [
-            "რა არის დღგ?",
-            "როგორ უნდა გადავიხადო საშემოსავლო გადასახადი?",
-            "რა დოკუმენტები მჭირდება ბიზნესის რეგისტრაციისთვის?",
-        ]
-
-# Load configurations
-css = load_css()
-config = load_ui_config()
-sample_questions = load_sample_questions()
+# Load configurations (ფაილები დისკიდან მხოლოდ ცვლილებისას იკითხება, არა ყოველ rerun-ზე)
+ui_loader = UIConfigLoader()
+css = load_ui_file(ui_loader.load_css, "")
+config = load_ui_file(ui_loader.load_ui_config, {})
+sample_questions = load_ui_file(ui_loader.load_sample_questions, None) or [
+    "რა არის დღგ?",
+    "როგორ უნდა გადავიხადო საშემოსავლო გადასახადი?",
+    "რა დოკუმენტები მჭირდება ბიზნესის რეგისტრაციისთვის?",
+]
 
 # Page config
 st.set_page_config(
@@ -64,48 +50,73 @@ st.set_page_config(
 if css:
     st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
 
-# Session state
-if 'rag_service' not in st.session_state:
-    st.session_state.rag_service = None
+
+def history_owner_id():
+    """
+    დისკზე შენახული ისტორიის მფლობელი: ავტორიზებული მომხმარებლის (st.user)
+    email-ის hash. URL-ის პარამეტრი არ გამოდგება - ბმულის მიმღები სხვის
+    ისტორიას წაიკითხავდა. persist გამორთულია ან მომხმარებელი არ არის
+    შესული - None (ისტორია მხოლოდ სესიის მეხსიერებაშია)
+    """
+    if not settings.CHAT_HISTORY_PERSIST:
+        return None
+    user = getattr(st, "user", None)
+    if user is None or not getattr(user, "is_logged_in", False):
+        return None
+    email = getattr(user, "email", None)
+    return hashlib.sha256(email.encode("utf-8")).hexdigest()[:32] if email else None
+
+
+# Session state: ისტორია სესიისაა; დისკზე - მხოლოდ CHAT_HISTORY_PERSIST-ით და შესული მომხმარებლისთვის
 if 'chat_history' not in st.session_state:
-    st.session_state.chat_history = []
-if 'initialized' not in st.session_state:
-    st.session_state.initialized = False
+    st.session_state.chat_history = ChatHistoryStore(history_owner_id())
+    st.session_state.history_page = 0
+
+# Shared services: მოდელი, ბაზა და LLM კლიენტი ერთია ყველა სესიისთვის.
+# warm-up ფონურად მიმდინარეობს - გვერდი მის დასრულებას არ ელოდება
+registry.warm_up(prompt_type="base")
+
+# Prometheus /metrics (settings.METRICS_PORT > 0 შემთხვევაში)
+start_metrics_server()
 
 
 def initialize_rag_service():
-    """RAG სერვისის ინიციალიზაცია"""
-    if st.session_state.rag_service is None:
-        try:
-            with st.spinner('⏳ ვტვირთავ RAG სისტემას...'):
-                # Check if Vector DB exists, if not - create it
-                from src.services.vectordb_service import VectorDBService
-                import os
-                
-                vectordb_service = VectorDBService()
-                
-                # If Vector DB doesn't exist, create it
-                if not os.path.exists(settings.VECTOR_DB_DIR) or len(os.listdir(settings.VECTOR_DB_DIR)) == 0:
-                    st.info('📊 პირველი გაშვება - ვქმნი Vector Database-ს...')
-                    st.info('⏳ ეს შეიძლება 2-3 წუთი გასტანოს...')
-                    
-                    # Create Vector DB from documents
-                    vectordb_service.create_database(force_recreate=True)
-                    
-                    st.success('✅ Vector Database შეიქმნა!')
-                
-                # Now initialize RAG service
-                st.session_state.rag_service = RAGService(prompt_type="base")
-                st.session_state.initialized = True
+    """
+    RAG სერვისის ინიციალიზაცია (საერთო registry-დან)
+    
+    ბაზა თუ არსებობს, სერვისი ფონურად იტვირთება და აქ არ ველოდებით -
+    პირველი კითხვა დაელოდება warm-up-ის დასრულებას.
+    """
+    if registry.is_ready("base") and not registry.is_warming_up():
+        return True
+    
+    try:
+        # If Vector DB doesn't exist, create it
+        if not registry.database_exists():
+            st.info('📊 პირველი გაშვება - ვქმნი Vector Database-ს...')
+            progress_bar = st.progress(0.0, text='⏳ ვამუშავებ დოკუმენტებს...')
             
-            st.success('✅ სისტემა მზადაა!')
-            return True
-        except Exception as e:
-            st.error(f'❌ შეცდომა: {e}')
-            import traceback
-            st.error(traceback.format_exc())
-            return False
-    return True
+            def report_progress(done, total, message):
+                progress_bar.progress(done / total if total else 1.0, text=message)
+            
+            # Create Vector DB from documents
+            if registry.ensure_database(progress_callback=report_progress):
+                st.success('✅ Vector Database შეიქმნა!')
+            progress_bar.empty()
+            registry.warm_up(prompt_type="base")
+        
+        if registry.last_error is not None:
+            raise registry.last_error
+        
+        if registry.is_warming_up():
+            st.info(f'⏳ სისტემა ფონურად იტვირთება ({registry.warmup_status})... '
+                    'შეგიძლიათ უკვე დასვათ კითხვა')
+        return True
+    except Exception as e:
+        st.error(f'❌ შეცდომა: {e}')
+        import traceback
+        st.error(traceback.format_exc())
+        return False
 
 
 # Header
@@ -123,8 +134,8 @@ with st.sidebar:
         for section in sidebar_config:
             if section['name'] == 'info':
                 st.header(section['title'])
-                if st.session_state.initialized and section.get('show_stats'):
-                    stats = st.session_state.rag_service.get_stats()
+                if registry.is_ready("base") and section.get('show_stats'):
+                    stats = registry.get_rag_service("base").get_stats()
                     st.metric("დოკუმენტები", stats['documents_in_db'])
                     st.metric("კითხვები", len(st.session_state.chat_history))
             
@@ -134,26 +145,43 @@ with st.sidebar:
     else:
         # Default sidebar if no config
         st.header("ℹ️ ინფორმაცია")
-        if st.session_state.initialized:
-            stats = st.session_state.rag_service.get_stats()
+        if registry.is_ready("base"):
+            stats = registry.get_rag_service("base").get_stats()
             st.metric("დოკუმენტები", stats['documents_in_db'])
             st.metric("კითხვები", len(st.session_state.chat_history))
     
+    stage_stats = metrics.snapshot("rag_stage_seconds")
+    if stage_stats:
+        with st.expander("📈 მეტრიკები"):
+            st.table([
+                {
+                    "ეტაპი": stage,
+                    "n": values["count"],
+                    "p50 (ms)": round(values["p50"] * 1000, 1),
+                    "p95 (ms)": round(values["p95"] * 1000, 1)
+                }
+                for stage, values in sorted(stage_stats.items())
+            ])
+            if registry.is_ready("base"):
+                prompt_cache = registry.get_rag_service("base").get_prompt_cache_stats()
+                if prompt_cache is not None:
+                    st.caption(f"prompt cache: {prompt_cache['hit']} hit / {prompt_cache['miss']} miss")
+    
     st.markdown("---")
     st.header("⚙️ მოქმედებები")
     
     if st.button("🔄 გადატვირთვა"):
-        st.session_state.rag_service = None
-        st.session_state.initialized = False
+        # საერთო სერვისები თავიდან იქმნება ყველა სესიისთვის
+        registry.reload(prompt_type="base")
         st.rerun()
     
     if st.button("🗑️ გაწმენდა"):
-        st.session_state.chat_history = []
+        st.session_state.chat_history.clear()
+        st.session_state.history_page = 0
         st.rerun()
 
 # Initialize
-if not st.session_state.initialized:
-    initialize_rag_service()
+initialized = initialize_rag_service()
 
 # Main Interface
 col1, col2 = st.columns([2, 1])
@@ -207,28 +235,71 @@ if search_clicked:
     elif selected and selected != input_config.get('sample_questions_default', 'აირჩიე კითხვა...'):
         final_question = selected
 
-if final_question and st.session_state.initialized:
-    with st.spinner('🔎 ვეძებ პასუხს...'):
-        try:
-            response = st.session_state.rag_service.ask(final_question)
-            st.session_state.chat_history.insert(0, response)
-        except Exception as e:
-            st.error(f'❌ შეცდომა: {e}')
+def render_sources(sources):
+    """წყაროების ჩვენება"""
+    with st.expander("📚 წყაროები"):
+        for i, src in enumerate(sources, 1):
+            article = f' · მუხლი {src["article"]}' if src.get("article") else ''
+            st.markdown(f'<div class="source-box"><strong>{i}. {src["file"]}</strong><br>📄 გვერდი: {src["page"]}{article}<br><em>{src["content_preview"]}</em></div>', unsafe_allow_html=True)
 
-# Chat History
-if st.session_state.chat_history:
+
+if final_question and initialized:
+    # პასუხი ტოკენ-ტოკენ ჩანს; დასრულების შემდეგ გადადის ისტორიაში
+    live = st.empty()
+    try:
+        with live.container():
+            st.markdown(f'<div class="question-box"><strong>❓ შენ:</strong><br>{final_question}</div>', unsafe_allow_html=True)
+            
+            with st.spinner('🔎 ვეძებ პასუხს...'):
+                # warm-up თუ ჯერ მიმდინარეობს, get_rag_service მის დასრულებას ელოდება
+                events = registry.get_rag_service("base").ask_stream(final_question)
+                sources_event = next(events)
+            
+            answer_placeholder = st.empty()
+            render_sources(sources_event["sources"])
+            
+            answer_text = ""
+            response = None
+            for event in events:
+                if event["type"] == "token":
+                    answer_text += event["text"]
+                    answer_placeholder.markdown(f'<div class="answer-box"><strong>🤖 ასისტენტი:</strong><br>{answer_text}▌</div>', unsafe_allow_html=True)
+                elif event["type"] == "done":
+                    response = event["response"]
+        
+        live.empty()
+        if response is not None:
+            st.session_state.chat_history.append(response)
+            st.session_state.history_page = 0
+    except Exception as e:
+        st.error(f'❌ შეცდომა: {e}')
+
+# Chat History (მხოლოდ მიმდინარე გვერდი - rerun-ის დრო ისტორიის ზომაზე არ არის დამოკიდებული)
+history = st.session_state.chat_history
+if len(history):
     st.markdown("---")
     st.header("📜 ისტორია")
     
-    for chat in st.session_state.chat_history:
+    pages = history.page_count()
+    page = min(st.session_state.history_page, pages - 1)
+    
+    for chat in history.page(page):
         st.markdown(f'<div class="question-box"><strong>❓ შენ:</strong><br>{chat["question"]}</div>', unsafe_allow_html=True)
         st.markdown(f'<div class="answer-box"><strong>🤖 ასისტენტი:</strong><br>{chat["answer"]}</div>', unsafe_allow_html=True)
         
-        with st.expander("📚 წყაროები"):
-            for i, src in enumerate(chat['sources'], 1):
-                st.markdown(f'<div class="source-box"><strong>{i}. {src["file"]}</strong><br>📄 გვერდი: {src["page"]}<br><em>{src["content_preview"]}</em></div>', unsafe_allow_html=True)
+        render_sources(chat['sources'])
         
         st.markdown("---")
+    
+    if pages > 1:
+        newer_col, page_col, older_col = st.columns([1, 2, 1])
+        if newer_col.button("◀ ახალი", key="history_newer", disabled=page == 0):
+            st.session_state.history_page = page - 1
+            st.rerun()
+        page_col.caption(f"გვერდი {page + 1} / {pages} ({len(history)} კითხვა)")
+        if older_col.button("ძველი ▶", key="history_older", disabled=page >= pages - 1):
+            st.session_state.history_page = page + 1
+            st.rerun()
 
 # Footer
 footer_config = config.get('footer', {})
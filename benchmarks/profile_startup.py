@@ -0,0 +1,141 @@
+"""
+Startup Profile - იმპორტების დრო და start-to-ready
+
+თითო მოდული იმპორტდება ცალკე პროცესში (`python -X importtime`), ასე რომ
+შედეგზე სხვა მოდულების ქეში არ მოქმედებს. --ready დამატებით ზომავს
+registry-ს warm-up-ს (ბაზა + embedding მოდელი + LLM კლიენტი).
+
+გამოყენება:
+    python benchmarks/profile_startup.py
+    python benchmarks/profile_startup.py --ready --top 15 --output startup.json
+"""
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import json
+import time
+import argparse
+import platform
+import subprocess
+from datetime import datetime
+
+from config.settings import settings
+
+
+# რა იტვირთება app.py-ის გახსნისას და რა - warm-up-ში
+MODULES = [
+    "src.services.service_registry",
+    "src.core.telemetry",
+    "streamlit",
+    "src.services.vectordb_service",
+    "src.services.rag_service",
+    "langchain_anthropic",
+    "langchain_community.embeddings",
+    "langchain_community.vectorstores",
+    "chromadb",
+    "sentence_transformers",
+]
+
+
+def import_profile(module, top):
+    """
+    მოდულის იმპორტის დრო ახალ პროცესში
+    
+    Returns:
+        dict: {"module", "seconds", "top": [{"module", "cumulative_ms", "self_ms"}, ...]}
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         f"import sys; sys.path.insert(0, {str(project_root)!r}); import {module}"],
+        cwd=project_root, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "unknown"
+        return {"module": module, "error": error}
+    
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # სათაურის ხაზი
+        rows.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "cumulative_ms": int(cumulative_us) / 1000,
+            "self_ms": int(self_us) / 1000
+        })
+    
+    # ჯამი - მხოლოდ ზედა დონის იმპორტები (ჩადგმულები მათშივე ითვლება)
+    total_ms = sum(row["cumulative_ms"] for row in rows if row["depth"] == 0)
+    rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+    return {"module": module, "seconds": total_ms / 1000, "top": rows[:top]}
+
+
+def time_to_ready(prompt_type):
+    """registry-ს სრული warm-up იმავე პროცესში (საჭიროა ბაზა და API key)"""
+    started = time.perf_counter()
+    from src.services.service_registry import registry
+    imported = time.perf_counter() - started
+    
+    registry.warm_up(prompt_type=prompt_type, background=False)
+    if registry.last_error is not None:
+        return {"error": f"{type(registry.last_error).__name__}: {registry.last_error}"}
+    
+    return {
+        "import_seconds": imported,
+        "ready_seconds": time.perf_counter() - started,
+        "status": registry.warmup_status
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup import-time profile")
+    parser.add_argument("--modules", nargs="+", default=MODULES)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--ready", action="store_true", help="warm-up-ის დროის გაზომვაც")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "imports": []
+    }
+    
+    print("⏱️ იმპორტების დრო (ცალკე პროცესებში):")
+    for module in args.modules:
+        profile = import_profile(module, args.top)
+        report["imports"].append(profile)
+        if "error" in profile:
+            print(f"  ⚠️ {module}: {profile['error']}")
+            continue
+        print(f"  {profile['seconds'] * 1000:8.0f}ms  {module}")
+        for row in profile["top"][1:4]:
+            print(f"  {'':10}{row['cumulative_ms']:8.0f}ms  └ {row['module']}")
+    
+    if args.ready:
+        print("\n🔥 warm-up (start-to-ready)...")
+        report["ready"] = time_to_ready("base")
+        if "error" in report["ready"]:
+            print(f"  ❌ {report['ready']['error']}")
+        else:
+            print(f"  import: {report['ready']['import_seconds'] * 1000:.0f}ms, "
+                  f"ready: {report['ready']['ready_seconds']:.2f}s")
+    
+    output = Path(args.output) if args.output else (
+        settings.DATA_DIR / "benchmarks" / f"startup-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    
+    print(f"\n✅ შედეგები: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Benchmark Suite - ingestion, embeddings, ძებნა და RAG ეტაპები
+
+ეშვება offline: LLM ჩანაცვლებულია stub მოდელით, ქეშები გამორთულია.
+შედეგი იწერება JSON-ად, რომ commit-ებს შორის შედარება შეიძლებოდეს.
+
+გამოყენება:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --corpus-sizes 500 2000 --k 1 3 5 --output bench.json
+"""
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+
+import numpy as np
+
+from config.settings import settings
+from config.ui.utils.config_loader import UIConfigLoader
+
+
+def percentiles(samples):
+    """ლატენტობის სტატისტიკა მილიწამებში"""
+    values = np.asarray(samples, dtype=np.float64) * 1000
+    if values.size == 0:
+        return {}
+    return {
+        "count": int(values.size),
+        "mean_ms": float(values.mean()),
+        "p50_ms": float(np.percentile(values, 50)),
+        "p95_ms": float(np.percentile(values, 95)),
+        "p99_ms": float(np.percentile(values, 99)),
+        "max_ms": float(values.max())
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=project_root, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_ingestion(documents_dir, workers):
+    """PDF-ების დამუშავება: გვერდები/წმ და chunks/წმ"""
+    from src.services.document_service import DocumentService
+    
+    service = DocumentService(workers=workers)
+    files = service.list_pdf_files(documents_dir)
+    
+    started = time.perf_counter()
+    pages = []
+    for _, file_pages, error in service.iter_file_pages(files):
+        if error is None:
+            pages.extend(file_pages)
+    parse_seconds = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    chunks = service.split_documents(pages)
+    split_seconds = time.perf_counter() - started
+    
+    return chunks, {
+        "files": len(files),
+        "failed_files": len(service.load_errors),
+        "workers": service.workers,
+        "pages": len(pages),
+        "chunks": len(chunks),
+        "parse_seconds": parse_seconds,
+        "split_seconds": split_seconds,
+        "pages_per_second": len(pages) / parse_seconds if parse_seconds else None,
+        "chunks_per_second": len(chunks) / split_seconds if split_seconds else None
+    }
+
+
+def bench_embeddings(embeddings, texts, batch_size):
+    """embedding-ების გამტარუნარიანობა (chunks/წმ)"""
+    embeddings.embed_documents(texts[:1])  # მოდელის ჩატვირთვა გაზომვის გარეთ
+    
+    vectors = []
+    started = time.perf_counter()
+    for start in range(0, len(texts), batch_size):
+        vectors.extend(embeddings.embed_documents(texts[start:start + batch_size]))
+    seconds = time.perf_counter() - started
+    
+    return vectors, {
+        "texts": len(texts),
+        "batch_size": batch_size,
+        "seconds": seconds,
+        "texts_per_second": len(texts) / seconds if seconds else None
+    }
+
+
+def synthetic_corpus(chunks, vectors, size):
+    """კორპუსი საჭირო ზომამდე (რეალური chunks, საჭიროებისას გამეორებით)"""
+    ids, documents, embeddings = [], [], []
+    for i in range(size):
+        chunk = chunks[i % len(chunks)]
+        ids.append(f"bench-{i}")
+        documents.append(chunk)
+        embeddings.append(vectors[i % len(chunks)])
+    return ids, documents, embeddings
+
+
+def bench_search(chunks, vectors, questions, corpus_sizes, k_values, repeat, backend, workdir):
+    """VectorDBService.search ლატენტობა სხვადასხვა k-სა და კორპუსის ზომაზე"""
+    from src.services.vectordb_service import VectorDBService
+    
+    results = []
+    query_embeddings = None
+    
+    for size in corpus_sizes:
+        service = VectorDBService(persist_directory=Path(workdir) / f"corpus_{size}", backend=backend)
+        if query_embeddings is None:
+            query_embeddings = [service.embed_query(question) for question in questions]
+        
+        started = time.perf_counter()
+        service.add_precomputed(*synthetic_corpus(chunks, vectors, size))
+        build_seconds = time.perf_counter() - started
+        
+        service.load_database()
+        for k in k_values:
+            samples = []
+            for _ in range(repeat):
+                for question, embedding in zip(questions, query_embeddings):
+                    started = time.perf_counter()
+                    service.search_by_vector(embedding, k=k, query=question)
+                    samples.append(time.perf_counter() - started)
+            results.append({
+                "backend": backend,
+                "hybrid": service.hybrid_search,
+                "corpus_size": size,
+                "k": k,
+                "build_seconds": build_seconds,
+                **percentiles(samples)
+            })
+            print(f"  🔍 corpus={size} k={k}: p50={results[-1]['p50_ms']:.2f}ms "
+                  f"p95={results[-1]['p95_ms']:.2f}ms")
+    
+    return results
+
+
+def bench_rag(questions, backend, workdir, chunks, vectors, repeat):
+    """RAGService.ask ეტაპების ხარჯი stub LLM-ით"""
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+    from src.services.vectordb_service import VectorDBService
+    from src.services.rag_service import RAGService
+    
+    service = VectorDBService(persist_directory=Path(workdir) / "rag", backend=backend)
+    service.add_precomputed(*synthetic_corpus(chunks, vectors, len(chunks)))
+    
+    llm = FakeListChatModel(responses=["stub პასუხი"])
+    rag = RAGService(prompt_type="base", vectordb_service=service, llm=llm)
+    
+    stages = {}
+    for _ in range(repeat):
+        for question in questions:
+            response = rag.ask(question)
+            for stage, seconds in response["timings"].items():
+                stages.setdefault(stage, []).append(seconds)
+    
+    return {stage: percentiles(samples) for stage, samples in stages.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RAG benchmark suite")
+    parser.add_argument("--documents-dir", default=str(settings.DOCUMENTS_DIR))
+    parser.add_argument("--backend", default=settings.VECTOR_STORE_BACKEND)
+    parser.add_argument("--workers", type=int, default=settings.DOCUMENT_LOADER_WORKERS)
+    parser.add_argument("--embedding-backend", choices=["torch", "onnx"],
+                        default=settings.EMBEDDING_BACKEND)
+    parser.add_argument("--batch-size", type=int, default=settings.EMBEDDING_BATCH_SIZE)
+    parser.add_argument("--corpus-sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5, 10])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    
+    # გაზომვა ქეშების გარეშე
+    settings.CACHE_ENABLED = False
+    settings.EMBEDDING_CACHE_ENABLED = False
+    settings.PAGE_CACHE_ENABLED = False
+    settings.EMBEDDING_BACKEND = args.embedding_backend
+    
+    questions = UIConfigLoader().load_sample_questions()
+    if not questions:
+        raise SystemExit("❌ sample_questions.yaml-ში კითხვები ვერ მოიძებნა")
+    
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "settings": {
+            "embedding_model": settings.EMBEDDING_MODEL,
+            "embedding_backend": args.embedding_backend,
+            "onnx_quantize": args.embedding_backend == "onnx" and settings.ONNX_QUANTIZE,
+            "chunk_size": settings.CHUNK_SIZE,
+            "chunk_overlap": settings.CHUNK_OVERLAP,
+            "chunking_strategy": settings.CHUNKING_STRATEGY,
+            "top_k": settings.TOP_K_RESULTS,
+            "backend": args.backend,
+            "hybrid_search": settings.HYBRID_SEARCH_ENABLED,
+            "rerank": settings.RERANK_ENABLED and settings.RERANK_MODEL
+        },
+        "questions": len(questions)
+    }
+    
+    print("📂 Ingestion...")
+    chunks, report["ingestion"] = bench_ingestion(args.documents_dir, args.workers)
+    if not chunks:
+        raise SystemExit("❌ დოკუმენტები ცარიელია")
+    
+    print("🧮 Embeddings...")
+    from src.services.vectordb_service import VectorDBService
+    embeddings = VectorDBService(backend=args.backend).embeddings
+    vectors, report["embeddings"] = bench_embeddings(
+        embeddings, [chunk.page_content for chunk in chunks], args.batch_size
+    )
+    
+    with tempfile.TemporaryDirectory(prefix="rag-bench-") as workdir:
+        print("🔍 Search...")
+        report["search"] = bench_search(chunks, vectors, questions, args.corpus_sizes,
+                                        args.k, args.repeat, args.backend, workdir)
+        
+        print("🤖 RAG stages (stub LLM)...")
+        report["rag_stages"] = bench_rag(questions, args.backend, workdir,
+                                         chunks, vectors, args.repeat)
+    
+    output = Path(args.output) if args.output else (
+        settings.DATA_DIR / "benchmarks" / f"bench-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    
+    print(f"\n✅ შედეგები: {output}")
+
+
+if __name__ == "__main__":
+    main()
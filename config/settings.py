@@ -39,30 +39,84 @@ class Settings:
     CLAUDE_MODEL = "claude-sonnet-4-20250514"
     CLAUDE_TEMPERATURE = 0.0
     CLAUDE_MAX_TOKENS = 2000
+    LLM_MAX_CONCURRENCY = 8  # ერთდროული Claude გამოძახებები (async API)
+    # Anthropic prompt cache: system prompt-ი cache_control-ით მხოლოდ ამ ზომიდან
+    # (მოკლე prefix-ს API არ აქეშებს; Haiku მოდელებისთვის ზღვარი 2048-ია)
+    PROMPT_CACHE_MIN_TOKENS = 1024
     
     # === RAG Settings ===
     CHUNK_SIZE = 1000
     CHUNK_OVERLAP = 200
     TOP_K_RESULTS = 3
+    CONTEXT_CHARS_PER_TOKEN = 2.0  # ქართული ტექსტი: ~2 სიმბოლო ტოკენზე (მიახლოებით)
+    # "legal" - მუხლების/პუნქტების საზღვრებზე, "recursive" - სიმბოლოების მიხედვით
+    CHUNKING_STRATEGY = os.getenv("CHUNKING_STRATEGY", "legal")
+    # კითხვიდან ამოცნობილი გადასახადის სახით ძებნის შეზღუდვა (tax_type ფილტრი)
+    METADATA_FILTER_AUTO = True
+    
+    # === Hybrid Search (BM25 + vector) ===
+    HYBRID_SEARCH_ENABLED = True
+    HYBRID_CANDIDATES = 20  # კანდიდატები თითო რანჟირებიდან fusion-მდე
+    RRF_K = 60
+    BM25_K1 = 1.5
+    BM25_B = 0.75
+    
+    # === Reranking (cross-encoder) ===
+    RERANK_ENABLED = False
+    RERANK_MODEL = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"  # მრავალენოვანი, CPU-ზე მსუბუქი
+    RERANK_CANDIDATES = 20  # რამდენი კანდიდატი გადაფასდება top_k-ის ასარჩევად
+    RERANK_BATCH_SIZE = 16
+    RERANK_LATENCY_BUDGET_MS = 300  # გადაჭარბებისას რჩება ვექტორული რიგი (0 = შეზღუდვის გარეშე)
+    
+    # === Document Loading ===
+    # PDF-ების პარალელური დამუშავება (1 = თანმიმდევრული); default შეზღუდულია -
+    # spawn პროცესი ცალკე ტვირთავს langchain/pypdf-ს, დიდ ჰოსტზე ყველა ბირთვი არ გვჭირდება
+    DOCUMENT_LOADER_WORKERS = int(os.getenv("DOCUMENT_LOADER_WORKERS", min(os.cpu_count() or 1, 4)))
     
     # === Embeddings ===
     EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
     EMBEDDING_DEVICE = "cpu"
+    EMBEDDING_BATCH_SIZE = 64  # chunks ერთ add_documents გამოძახებაზე
+    EMBEDDING_CACHE_ENABLED = True  # CACHE_DIR/embeddings.sqlite3
+    EMBEDDING_CACHE_SIZE = 10000  # ვექტორები მეხსიერების LRU-ში
+    EMBEDDING_EXECUTOR_WORKERS = 2  # async API-ში embedding/ძებნის thread-ები
+    # ინდექსის აგებისას embedding პროცესები (1 = იმავე პროცესში)
+    EMBEDDING_WORKERS = int(os.getenv("EMBEDDING_WORKERS", "1"))
+    # "torch" (sentence-transformers) ან "onnx" (ONNX Runtime, CACHE_DIR/onnx)
+    EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+    ONNX_QUANTIZE = True  # დინამიკური int8 კვანტიზაცია
+    ONNX_THREADS = 0  # intra-op thread-ები (0 = onnxruntime-ის ნაგულისხმევი)
     
     # === Vector Database ===
     COLLECTION_NAME = "tax_documents"
+    # "chroma" ან "numpy" (memory-mapped .npy, brute-force ძებნა)
+    VECTOR_STORE_BACKEND = os.getenv("VECTOR_STORE_BACKEND", "chroma")
+    # shard-ები: None - ერთი კოლექცია, "year" - issue_date-ის წლით, "tax_type" - გადასახადის სახით
+    SHARD_BY = os.getenv("SHARD_BY") or None
+    SHARD_SEARCH_WORKERS = 4  # shard-ების პარალელური ძებნის thread-ები
     
     # === Cache ===
     CACHE_ENABLED = True
     CACHE_TTL = 3600  # 1 hour in seconds
+    CACHE_MAX_ENTRIES = 500  # LRU ლიმიტი
+    CACHE_SIMILARITY_THRESHOLD = 0.95  # სემანტიკური დამთხვევის ზღვარი (cosine)
+    PAGE_CACHE_ENABLED = True  # PDF-ის გვერდები CACHE_DIR/pages-ში (ხელახალი დაყოფა parse-ის გარეშე)
     
     # === Logging ===
     LOG_LEVEL = "INFO"
     LOG_FILE = LOGS_DIR / "app.log"
+    LOG_MAX_BYTES = 10 * 1024 * 1024  # როტაცია 10 MB-ზე
+    LOG_BACKUP_COUNT = 5  # app.log.1 ... app.log.5
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # /metrics endpoint, 0 = გამორთული
     
     # === UI ===
     UI_TITLE = "საგადასახადო RAG ასისტენტი"
     UI_ICON = "🤖"
+    CHAT_HISTORY_DIR = DATA_DIR / "history"  # ავტორიზებული მომხმარებლების ისტორია (JSONL)
+    CHAT_HISTORY_PERSIST = False  # True - ისტორია დისკზე (მხოლოდ st.user-ით შესულებისთვის)
+    CHAT_HISTORY_RETENTION_DAYS = 30  # უფრო ძველი (განუახლებელი) ისტორიის ფაილები იშლება
+    CHAT_HISTORY_PAGE_SIZE = 5  # ერთ გვერდზე ნაჩვენები კითხვა-პასუხი
+    CHAT_HISTORY_MAX_ENTRIES = 200  # სესიაზე შენახული ჩანაწერები
     
     @classmethod
     def validate(cls):
@@ -1,54 +1,81 @@
 """
 UI Configuration Loader
 """
+import os
+import copy
+import threading
+
 import yaml
 from pathlib import Path
 from config.settings import settings
 
 
+# {(path, parser): (mtime_ns, size, value)} - საერთო ყველა სესიისა და rerun-ისთვის
+_file_cache = {}
+_file_cache_lock = threading.Lock()
+
+
+def read_cached(path, parse, default=None):
+    """
+    ფაილის წაკითხვა ქეშით: დისკიდან მხოლოდ მაშინ, როცა mtime/ზომა შეიცვალა
+    
+    Args:
+        path: ფაილის გზა
+        parse: callable(text) -> value
+        default: დაბრუნდება, თუ ფაილი არ არსებობს
+    """
+    path = Path(path)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return default
+    
+    key = (str(path), parse)
+    with _file_cache_lock:
+        cached = _file_cache.get(key)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        value = parse(f.read())
+    with _file_cache_lock:
+        _file_cache[key] = (stat.st_mtime_ns, stat.st_size, value)
+    return value
+
+
+def _parse_text(text):
+    return text
+
+
+def _parse_yaml(text):
+    return yaml.safe_load(text) or {}
+
+
 class UIConfigLoader:
-    """UI კონფიგურაციების ჩატვირთვა"""
+    """UI კონფიგურაციების ჩატვირთვა (mtime-ით ინვალიდირებადი ქეშით)"""
     
     def __init__(self):
         self.config_dir = settings.CONFIG_DIR / "ui"
     
+    def _load_yaml(self, name):
+        # ქეშირებული ობიექტი საერთოა - გამომძახებელმა რომ ვერ შეცვალოს, ბრუნდება ასლი
+        return copy.deepcopy(read_cached(self.config_dir / name, _parse_yaml, {}))
+    
     def load_css(self):
         """CSS-ის ჩატვირთვა"""
-        css_path = self.config_dir / "styles.css"
-        try:
-            with open(css_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except FileNotFoundError:
-            return ""
+        return read_cached(self.config_dir / "styles.css", _parse_text, "")
     
     def load_ui_config(self):
         """UI კონფიგურაციის ჩატვირთვა"""
-        config_path = self.config_dir / "ui_config.yaml"
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
-        except FileNotFoundError:
-            return {}
+        return self._load_yaml("ui_config.yaml")
     
     def load_sample_questions(self):
         """სატესტო კითხვების ჩატვირთვა"""
-        questions_path = self.config_dir / "sample_questions.yaml"
-        try:
-            with open(questions_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-                return data.get('all_questions', [])
-        except FileNotFoundError:
-            return []
+        return self._load_yaml("sample_questions.yaml").get('all_questions', [])
     
     def load_questions_by_category(self):
         """კითხვები კატეგორიებად"""
-        questions_path = self.config_dir / "sample_questions.yaml"
-        try:
-            with open(questions_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-                return data.get('categories', {})
-        except FileNotFoundError:
-            return {}
+        return self._load_yaml("sample_questions.yaml").get('categories', {})
 
 
 # Helper function
@@ -60,4 +87,4 @@ def load_ui_css():
 def load_questions():
     """კითხვების სწრაფი ჩატვირთვა"""
     loader = UIConfigLoader()
-    return loader.load_sample_questions()
\ No newline at end of file
+    return loader.load_sample_questions()
@@ -0,0 +1,197 @@
+"""
+Context Builder - prompt-ის კონტექსტის აწყობა ტოკენების ბიუჯეტით
+"""
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import re
+
+from config.settings import settings
+from src.services.bm25_index import tokenize
+
+
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?;:])\s+|\n+")
+# ტექსტით დადგენილი გადაფარვის მინიმალური სიგრძე (სიმბოლოები)
+MIN_OVERLAP = 20
+
+
+class ContextAssembler:
+    """
+    retrieval-ის შედეგებიდან კონტექსტის აწყობა
+    
+    1. ერთი გვერდის chunks ერთიანდება ერთ ბლოკად (ერთი სათაური);
+    2. მეზობელ chunks-ს შორის CHUNK_OVERLAP-ით გამეორებული ტექსტი იშლება;
+    3. ბიუჯეტის გადაჭარბებისას იშლება ის წინადადებები, რომლებიც კითხვას
+       ყველაზე ნაკლებად ემთხვევა (ჯერ დაბალი რანგის ბლოკებიდან).
+    
+    ტოკენები ითვლება მიახლოებით: სიმბოლოები / CONTEXT_CHARS_PER_TOKEN.
+    """
+    
+    def __init__(self, token_budget=None, chars_per_token=None):
+        self.token_budget = token_budget
+        self.chars_per_token = chars_per_token or settings.CONTEXT_CHARS_PER_TOKEN
+        self.max_overlap = settings.CHUNK_OVERLAP
+    
+    def estimate_tokens(self, text):
+        return int(len(text) / self.chars_per_token) + 1
+    
+    def assemble(self, docs, question=None):
+        """
+        Args:
+            docs: Document-ები რელევანტურობის რიგით
+            question: კითხვა (წინადადებების შესაფასებლად)
+        
+        Returns:
+            str: ფორმატირებული კონტექსტი
+        """
+        blocks = self._merge_pages(docs)
+        if self.token_budget and self._total_tokens(blocks) > self.token_budget:
+            blocks = self._trim(blocks, question or "")
+        
+        formatted = []
+        for i, block in enumerate(blocks, 1):
+            formatted.append(
+                f"[დოკუმენტი {i}: {block['source']}, გვ. {block['page']}]\n{block['text']}\n"
+            )
+        return "\n".join(formatted)
+    
+    def _merge_pages(self, docs):
+        """ერთი (ფაილი, გვერდი)-ის chunks → ერთი ბლოკი, საუკეთესო რანგის პოზიციაზე"""
+        groups = {}
+        for rank, doc in enumerate(docs):
+            source = doc.metadata.get('source', 'უცნობი')
+            if '/' in source or '\\' in source:
+                source = Path(source).name
+            page = doc.metadata.get('page', 'N/A')
+            group = groups.setdefault((source, page), {
+                "source": source, "page": page, "rank": rank, "chunks": []
+            })
+            group["chunks"].append(doc)
+        
+        blocks = []
+        for group in groups.values():
+            positioned = sorted(
+                (chunk for chunk in group["chunks"] if self._start(chunk) is not None),
+                key=self._start
+            )
+            # პოზიციის გარეშე chunks-ის რიგი უცნობია - ისინი ტექსტის გადაფარვით ეწყობა
+            pieces = [self._merge_positioned(positioned)] if positioned else []
+            pieces += [chunk.page_content for chunk in group["chunks"] if self._start(chunk) is None]
+            group["text"] = self._chain(pieces).strip()
+            blocks.append(group)
+        
+        return sorted(blocks, key=lambda block: block["rank"])
+    
+    @staticmethod
+    def _start(doc):
+        return doc.metadata.get('start_index')
+    
+    def _merge_positioned(self, chunks):
+        """start_index-ით დალაგებული chunks → ტექსტი (წყვეტა აღინიშნება "…"-ით)"""
+        text = chunks[0].page_content
+        end = self._start(chunks[0]) + len(text)
+        for chunk in chunks[1:]:
+            content = chunk.page_content
+            start = self._start(chunk)
+            # მუხლის გაგრძელების chunk-ს თავში სათაური აქვს (start_index მის წინ ითვლება);
+            # ბლოკში უკვე ნაჩვენები სათაური აღარ მეორდება
+            heading, _, body = content.partition("\n")
+            if body and chunk.metadata.get('article') and heading.startswith("მუხლი") \
+                    and f"{heading}\n" in text:
+                content = body
+                start += len(heading) + 1
+            # start_index-ით ზუსტად ვიცით გადაფარვის სიგრძე; თუ ტექსტი არ ემთხვევა
+            # (მაგ. chunk-ის თავში მუხლის სათაურია), გადაფარვა ტექსტით დგინდება
+            overlap = max(0, min(end - start, len(content)))
+            if overlap and not text.endswith(content[:overlap]):
+                overlap = self._text_overlap(text, content)
+            rest = content[overlap:]
+            if start > end + 1:
+                text += "\n…\n" + rest
+            else:
+                text += ("" if overlap else " ") + rest
+            end = max(end, start + len(content))
+        return text
+    
+    def _chain(self, pieces):
+        """
+        ტექსტების ჯაჭვებად შეერთება გადაფარვით
+        
+        ჯაჭვი იწყება ნაწილით, რომელსაც სხვა არ უსწრებს, და გრძელდება
+        ნაწილებით, რომელთა დასაწყისიც მის ბოლოს ემთხვევა; ჯაჭვებს შორის
+        (რანგის რიგით) დგება "…".
+        """
+        remaining = list(range(len(pieces)))
+        chains = []
+        while remaining:
+            head = next(
+                (i for i in remaining
+                 if not any(j != i and self._text_overlap(pieces[j], pieces[i]) for j in remaining)),
+                remaining[0]
+            )
+            remaining.remove(head)
+            text = pieces[head]
+            while True:
+                following = next(
+                    ((i, overlap) for i in remaining
+                     for overlap in [self._text_overlap(text, pieces[i])] if overlap),
+                    None
+                )
+                if following is None:
+                    break
+                index, overlap = following
+                remaining.remove(index)
+                text += pieces[index][overlap:]
+            chains.append(text)
+        return "\n…\n".join(chains)
+    
+    def _text_overlap(self, previous, current):
+        """
+        previous-ის ბოლოსა და current-ის დასაწყისს შორის საერთო ტექსტის სიგრძე
+        
+        MIN_OVERLAP-ზე მოკლე დამთხვევა შემთხვევითად ითვლება (0).
+        """
+        for size in range(min(self.max_overlap, len(previous), len(current)), MIN_OVERLAP - 1, -1):
+            if previous.endswith(current[:size]):
+                return size
+        return 0
+    
+    def _total_tokens(self, blocks):
+        return sum(self.estimate_tokens(block["text"]) + 10 for block in blocks)
+    
+    def _trim(self, blocks, question):
+        """დაბალი რელევანტურობის წინადადებების წაშლა ბიუჯეტამდე"""
+        question_terms = set(tokenize(question))
+        
+        sentences = []
+        for block_index, block in enumerate(blocks):
+            parts = [part for part in SENTENCE_PATTERN.split(block["text"]) if part.strip()]
+            block["sentences"] = parts
+            block["keep"] = [True] * len(parts)
+            for sentence_index, sentence in enumerate(parts):
+                terms = set(tokenize(sentence))
+                score = len(terms & question_terms) / (len(question_terms) or 1)
+                # თანაბარ ქულებში ჯერ დაბალი რანგის ბლოკი და ბოლო წინადადებები იშლება
+                sentences.append((score, -block_index, -sentence_index, block_index, sentence_index))
+        
+        total = self._total_tokens(blocks)
+        for score, _, _, block_index, sentence_index in sorted(sentences):
+            if total <= self.token_budget:
+                break
+            block = blocks[block_index]
+            block["keep"][sentence_index] = False
+            total -= self.estimate_tokens(block["sentences"][sentence_index])
+            if not any(block["keep"]):
+                total -= 10
+        
+        trimmed = []
+        for block in blocks:
+            kept = [sentence for sentence, keep in zip(block["sentences"], block["keep"]) if keep]
+            if kept:
+                block["text"] = " ".join(sentence.strip() for sentence in kept)
+                trimmed.append(block)
+        return trimmed
@@ -50,7 +50,8 @@ class PromptManager:
         prompt_config = self.get_prompt(prompt_name)
         return {
             'temperature': prompt_config.get('temperature', 0.0),
-            'max_tokens': prompt_config.get('max_tokens', 2000)
+            'max_tokens': prompt_config.get('max_tokens', 2000),
+            'context_token_budget': prompt_config.get('context_token_budget')
         }
     
     def list_prompts(self):
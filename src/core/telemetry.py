@@ -0,0 +1,288 @@
+"""
+Telemetry - spans, სტრუქტურირებული ლოგები და მეტრიკები
+"""
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import json
+import time
+import uuid
+import logging
+import logging.handlers
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config.settings import settings
+
+
+# ლატენტობის bucket-ები წამებში (Prometheus histogram)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_trace_id = contextvars.ContextVar("trace_id", default=None)
+
+
+class JsonFormatter(logging.Formatter):
+    """ერთი JSON ობიექტი თითო ხაზზე"""
+    
+    def format(self, record):
+        payload = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        payload.update(getattr(record, "fields", {}))
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+_logger = None
+_logger_lock = threading.Lock()
+
+
+def get_logger():
+    """
+    სტრუქტურირებული logger (settings.LOG_FILE, settings.LOG_LEVEL)
+    
+    ფაილი როტირდება LOG_MAX_BYTES-ზე, ინახება LOG_BACKUP_COUNT ძველი ფაილი -
+    span-ების ლოგი შეუზღუდავად აღარ იზრდება
+    """
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            logger = logging.getLogger("tax_rag")
+            logger.setLevel(settings.LOG_LEVEL)
+            logger.propagate = False
+            try:
+                settings.LOGS_DIR.mkdir(parents=True, exist_ok=True)
+                handler = logging.handlers.RotatingFileHandler(
+                    settings.LOG_FILE, maxBytes=settings.LOG_MAX_BYTES,
+                    backupCount=settings.LOG_BACKUP_COUNT, encoding="utf-8"
+                )
+            except OSError:
+                handler = logging.StreamHandler()
+            handler.setFormatter(JsonFormatter())
+            logger.addHandler(handler)
+            _logger = logger
+        return _logger
+
+
+def log_event(event, level=logging.INFO, **fields):
+    """სტრუქტურირებული ჩანაწერი მიმდინარე trace_id-ით"""
+    fields = {"event": event, "trace_id": _trace_id.get(), **fields}
+    get_logger().log(level, event, extra={"fields": fields})
+
+
+class MetricsRegistry:
+    """In-process counters და histograms (Prometheus ტექსტური ფორმატით)"""
+    
+    def __init__(self, buckets=LATENCY_BUCKETS, sample_size=1000):
+        self.buckets = buckets
+        self.sample_size = sample_size
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+    
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+    
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+    
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = {
+                    "counts": [0] * len(self.buckets),
+                    "count": 0,
+                    "sum": 0.0,
+                    "samples": deque(maxlen=self.sample_size)
+                }
+                self._histograms[key] = histogram
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram["counts"][i] += 1
+            histogram["count"] += 1
+            histogram["sum"] += value
+            histogram["samples"].append(value)
+    
+    def snapshot(self, name):
+        """
+        histogram-ის შეჯამება label-ების მიხედვით (sidebar-ისთვის)
+        
+        Returns:
+            dict: {labels: {"count", "avg", "p50", "p95"}}
+        """
+        result = {}
+        with self._lock:
+            for (metric, labels), histogram in self._histograms.items():
+                if metric != name:
+                    continue
+                samples = sorted(histogram["samples"])
+                result[dict(labels).get("stage", labels)] = {
+                    "count": histogram["count"],
+                    "avg": histogram["sum"] / histogram["count"],
+                    "p50": samples[int(0.50 * (len(samples) - 1))],
+                    "p95": samples[int(0.95 * (len(samples) - 1))]
+                }
+        return result
+    
+    def counter(self, name, **labels):
+        with self._lock:
+            return self._counters.get(self._key(name, labels), 0)
+    
+    def render_prometheus(self):
+        """ყველა მეტრიკა Prometheus exposition ფორმატში"""
+        lines = []
+        with self._lock:
+            for name in sorted({metric for metric, _ in self._counters}):
+                lines.append(f"# TYPE {name} counter")
+                for (metric, labels), value in sorted(self._counters.items()):
+                    if metric == name:
+                        lines.append(f"{name}{self._labels(labels)} {value}")
+            
+            for name in sorted({metric for metric, _ in self._histograms}):
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, labels), histogram in sorted(self._histograms.items(),
+                                                          key=lambda item: item[0]):
+                    if metric != name:
+                        continue
+                    for bound, count in zip(self.buckets, histogram["counts"]):
+                        bucket_labels = labels + (("le", repr(bound)),)
+                        lines.append(f"{name}_bucket{self._labels(bucket_labels)} {count}")
+                    inf_labels = labels + (("le", "+Inf"),)
+                    lines.append(f"{name}_bucket{self._labels(inf_labels)} {histogram['count']}")
+                    lines.append(f"{name}_sum{self._labels(labels)} {histogram['sum']}")
+                    lines.append(f"{name}_count{self._labels(labels)} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+    
+    @staticmethod
+    def _labels(labels):
+        if not labels:
+            return ""
+        return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+# Global metrics instance
+metrics = MetricsRegistry()
+
+
+class Span:
+    """გაზომილი ეტაპი; duration წამებშია"""
+    
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = attributes
+        self.duration = 0.0
+    
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+
+def new_trace_id():
+    return uuid.uuid4().hex[:16]
+
+
+@contextmanager
+def trace(trace_id=None):
+    """
+    trace_id-ის მიბმა span-ის ჩანაწერის გარეშე (მაგ. generator-ისთვის,
+    რომელიც span-ს yield-ებს შორის ვერ გააჩერებს)
+    
+    Args:
+        trace_id: არსებული trace (None - მიმდინარე ან ახალი)
+    
+    Yields:
+        str: trace_id - იგივე trace-ის გასაგრძელებლად
+    """
+    trace_id = trace_id or _trace_id.get() or new_trace_id()
+    token = _trace_id.set(trace_id)
+    try:
+        yield trace_id
+    finally:
+        _trace_id.reset(token)
+
+
+@contextmanager
+def span(name, **attributes):
+    """
+    ეტაპის გაზომვა: rag_stage_seconds{stage=name} histogram + JSON ლოგი
+    
+    trace_id თუ ჯერ არ არსებობს (root span), იქმნება ახალი - ერთი
+    მოთხოვნის ყველა ეტაპი ერთ trace_id-ს იზიარებს.
+    """
+    token = None
+    if _trace_id.get() is None:
+        token = _trace_id.set(new_trace_id())
+    
+    current = Span(name, dict(attributes))
+    started = time.perf_counter()
+    status = "ok"
+    try:
+        yield current
+    except Exception as e:
+        status = "error"
+        current.set(error=f"{type(e).__name__}: {e}")
+        metrics.inc("rag_stage_errors_total", stage=name)
+        raise
+    finally:
+        current.duration = time.perf_counter() - started
+        metrics.observe("rag_stage_seconds", current.duration, stage=name)
+        log_event("span", span=name, status=status,
+                  duration_ms=round(current.duration * 1000, 3), **current.attributes)
+        if token is not None:
+            _trace_id.reset(token)
+
+
+def observe(name, seconds, **attributes):
+    """უკვე გაზომილი ეტაპის ჩაწერა (მაგ. worker პროცესიდან დაბრუნებული დრო) მიმდინარე trace-ში"""
+    metrics.observe("rag_stage_seconds", seconds, stage=name)
+    log_event("span", span=name, status="ok", duration_ms=round(seconds * 1000, 3), **attributes)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = metrics.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+_metrics_server = None
+
+
+def start_metrics_server(port=None):
+    """/metrics endpoint ლოკალურ პორტზე (settings.METRICS_PORT, 0 = გამორთული)"""
+    global _metrics_server
+    port = settings.METRICS_PORT if port is None else port
+    with _logger_lock:
+        if _metrics_server is not None or not port:
+            return _metrics_server
+        try:
+            _metrics_server = ThreadingHTTPServer(("127.0.0.1", port), _MetricsHandler)
+        except OSError as e:
+            print(f"⚠️ metrics endpoint ვერ გაეშვა (:{port}): {e}")
+            return None
+        threading.Thread(target=_metrics_server.serve_forever,
+                         name="metrics-server", daemon=True).start()
+        print(f"📈 metrics: http://127.0.0.1:{port}/metrics")
+        return _metrics_server
@@ -0,0 +1,145 @@
+"""
+BM25 Index - ლექსიკური (სიტყვების) ინდექსი ვექტორული ძებნის გვერდით
+"""
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import re
+import json
+import math
+from collections import Counter
+
+from config.settings import settings
+
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text):
+    """ტექსტის დაყოფა ტოკენებად (ქართული ასოები, ციფრები, ლათინური)"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """
+    Inverted index BM25 ქულებით
+    
+    ინახება მხოლოდ ტერმინების სიხშირეები და chunk-ების სიგრძეები;
+    ტექსტი და metadata ვექტორულ ბაზაშია, chunk ID-ით. მეხსიერებაში
+    დამატებით არის chunk ID → ტერმინები (doc_terms), რომ წაშლა მხოლოდ
+    ამ ტერმინების posting-ებს შეეხოს; დისკზე არ ინახება - load-ისას აიგება.
+    """
+    
+    def __init__(self, index_path, k1=None, b=None):
+        self.index_path = Path(index_path)
+        self.k1 = settings.BM25_K1 if k1 is None else k1
+        self.b = settings.BM25_B if b is None else b
+        self.postings = {}
+        self.doc_lengths = {}
+        self.doc_terms = {}
+        self.total_length = 0
+    
+    def __len__(self):
+        return len(self.doc_lengths)
+    
+    def exists(self):
+        return self.index_path.exists()
+    
+    def add(self, ids, texts):
+        """chunks-ის დამატება ინდექსში (არსებული ID-ები იცვლება)"""
+        batch = dict(zip(ids, texts))  # batch-ში განმეორებული ID - ბოლო ტექსტი
+        self.remove(batch)
+        for doc_id, text in batch.items():
+            tokens = tokenize(text)
+            counts = Counter(tokens)
+            self.doc_lengths[doc_id] = len(tokens)
+            self.doc_terms[doc_id] = list(counts)
+            self.total_length += len(tokens)
+            for term, count in counts.items():
+                self.postings.setdefault(term, {})[doc_id] = count
+    
+    def remove(self, ids):
+        """chunks-ის წაშლა ინდექსიდან"""
+        for doc_id in set(ids) & self.doc_lengths.keys():
+            self.total_length -= self.doc_lengths.pop(doc_id)
+            # მხოლოდ ამ chunk-ის ტერმინები - არა მთელი ლექსიკონი
+            for term in self.doc_terms.pop(doc_id, ()):
+                posting = self.postings.get(term)
+                if posting is None:
+                    continue
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self.postings[term]
+    
+    def search(self, query, k=10, allowed_ids=None):
+        """
+        BM25 ძებნა
+        
+        Args:
+            allowed_ids: თუ გადაეცა, ქულდება მხოლოდ ეს chunks (metadata ფილტრი)
+        
+        Returns:
+            list: [(chunk_id, score), ...] კლებადობით
+        """
+        if not self.doc_lengths:
+            return []
+        
+        n_docs = len(self.doc_lengths)
+        avg_length = self.total_length / n_docs or 1.0
+        scores = {}
+        
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc_id, tf in posting.items():
+                if allowed_ids is not None and doc_id not in allowed_ids:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+    
+    def save(self):
+        """ინდექსის შენახვა დისკზე"""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"postings": self.postings, "doc_lengths": self.doc_lengths},
+                      f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+    
+    def load(self):
+        """ინდექსის ჩატვირთვა დისკიდან"""
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.postings = data["postings"]
+        self.doc_lengths = data["doc_lengths"]
+        self.total_length = sum(self.doc_lengths.values())
+        self.doc_terms = {doc_id: [] for doc_id in self.doc_lengths}
+        for term, posting in self.postings.items():
+            for doc_id in posting:
+                self.doc_terms.setdefault(doc_id, []).append(term)
+        return self
+
+
+def reciprocal_rank_fusion(rankings, rrf_k=None):
+    """
+    რამდენიმე რანჟირების გაერთიანება (Reciprocal Rank Fusion)
+    
+    Args:
+        rankings: ID-ების სიების სია (თითო - საუკეთესოდან უარესისკენ)
+    
+    Returns:
+        list: [(chunk_id, score), ...] კლებადობით
+    """
+    rrf_k = settings.RRF_K if rrf_k is None else rrf_k
+    scores = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (rrf_k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
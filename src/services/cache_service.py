@@ -0,0 +1,189 @@
+"""
+Answer Cache - პასუხების ქეში (ზუსტი და სემანტიკური დამთხვევით)
+"""
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from config.settings import settings
+
+
+class AnswerCache:
+    """
+    RAG პასუხების ქეში
+    
+    ჩანაწერი იძებნება ჯერ ნორმალიზებული კითხვით, შემდეგ (თუ embedding
+    გადმოეცა) კოსინუსური მსგავსებით. ყველა ჩანაწერი ეკუთვნის namespace-ს
+    (prompt ტიპი + მოდელი + ინდექსის ვერსია + კითხვის ფილტრი), ამიტომ
+    რეინდექსაციის შემდეგ ძველი პასუხები აღარ ემთხვევა, ხოლო სხვა
+    გადასახადზე დასმული მსგავსი კითხვა სხვის პასუხს ვერ მიიღებს.
+    
+    ფაილი append-only JSONL-ია: set() მხოლოდ ერთ ხაზს ამატებს, მთლიანად
+    თავიდან იწერება მხოლოდ მაშინ, როცა ხაზები max_entries-ზე ორჯერ მეტია.
+    """
+    
+    def __init__(self, cache_file=None, ttl=None, max_entries=None, similarity_threshold=None):
+        self.cache_file = Path(cache_file or settings.CACHE_DIR / "answers.jsonl")
+        self.ttl = settings.CACHE_TTL if ttl is None else ttl
+        self.max_entries = max_entries or settings.CACHE_MAX_ENTRIES
+        self.similarity_threshold = (settings.CACHE_SIMILARITY_THRESHOLD
+                                     if similarity_threshold is None else similarity_threshold)
+        self._entries = OrderedDict()
+        self._log_lines = 0
+        self._lock = threading.Lock()
+        self._load()
+    
+    @staticmethod
+    def normalize(question):
+        """კითხვის ნორმალიზაცია: პატარა ასოები, ზედმეტი სივრცეები და პუნქტუაცია"""
+        text = re.sub(r"\s+", " ", question.strip().lower())
+        return text.strip(" ?!.,;:")
+    
+    @staticmethod
+    def namespace(prompt_type, model, index_version, filters=None):
+        """
+        ქეშის namespace - ნებისმიერი კომპონენტის შეცვლა ძველ ჩანაწერებს აუქმებს
+        
+        filters: კითხვიდან ამოცნობილი metadata ფილტრი (მაგ. {"tax_type": "vat"}) -
+            სემანტიკური დამთხვევა მხოლოდ იმავე ფილტრის კითხვებს შორის
+        """
+        scope = json.dumps(filters or {}, sort_keys=True, ensure_ascii=False, default=list)
+        return f"{prompt_type}|{model}|v{index_version}|{scope}"
+    
+    @staticmethod
+    def _key(namespace, normalized):
+        return hashlib.sha256(f"{namespace}\n{normalized}".encode("utf-8")).hexdigest()
+    
+    def get(self, question, namespace, embedding=None):
+        """
+        ქეშში ძებნა
+        
+        Returns:
+            tuple: (response, match_type) ან (None, None)
+        """
+        normalized = self.normalize(question)
+        key = self._key(namespace, normalized)
+        
+        with self._lock:
+            self._evict_expired()
+            
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry["response"], "exact"
+            
+            if embedding is None or self.similarity_threshold >= 1.0:
+                return None, None
+            
+            candidates = [(k, e) for k, e in self._entries.items()
+                          if e["namespace"] == namespace and e.get("embedding")]
+            if not candidates:
+                return None, None
+            
+            matrix = np.asarray([e["embedding"] for _, e in candidates], dtype=np.float32)
+            query = np.asarray(embedding, dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+            scores = matrix @ query / np.maximum(norms, 1e-12)
+            
+            best = int(np.argmax(scores))
+            if scores[best] < self.similarity_threshold:
+                return None, None
+            
+            best_key, entry = candidates[best]
+            self._entries.move_to_end(best_key)
+            return entry["response"], "semantic"
+    
+    def set(self, question, namespace, response, embedding=None):
+        """პასუხის შენახვა ქეშში"""
+        normalized = self.normalize(question)
+        key = self._key(namespace, normalized)
+        
+        entry = {
+            "namespace": namespace,
+            "question": normalized,
+            "embedding": [round(float(x), 6) for x in embedding] if embedding is not None else None,
+            "response": response,
+            "created_at": time.time()
+        }
+        line = json.dumps([key, entry], ensure_ascii=False) + "\n"
+        
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            
+            self._evict_expired()
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            
+            # ძველი/გამოძევებული ხაზები გროვდება - დროდადრო ფაილი იკუმშება
+            if self._log_lines >= 2 * self.max_entries:
+                self._save()
+            else:
+                self._append(line)
+    
+    def clear(self):
+        """ქეშის გასუფთავება"""
+        with self._lock:
+            self._entries.clear()
+            self._save()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def _evict_expired(self):
+        if not self.ttl:
+            return
+        deadline = time.time() - self.ttl
+        expired = [k for k, e in self._entries.items() if e["created_at"] < deadline]
+        for key in expired:
+            del self._entries[key]
+    
+    def _load(self):
+        if not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except OSError as e:
+            print(f"⚠️ ქეში ვერ ჩაიტვირთა: {e}")
+            return
+        
+        # ხაზები ჩაწერის რიგითაა - ბოლო ჩანაწერი იგებს, რიგი = LRU
+        for line in lines:
+            try:
+                key, entry = json.loads(line)
+            except ValueError:
+                continue  # ნახევრად ჩაწერილი ხაზი
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+        self._log_lines = len(lines)
+        self._evict_expired()
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def _append(self, line):
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_file, 'a', encoding='utf-8') as f:
+            f.write(line)
+        self._log_lines += 1
+    
+    def _save(self):
+        """ფაილის შეკუმშვა: მხოლოდ მიმდინარე ჩანაწერები, LRU რიგით"""
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_file.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for key, entry in self._entries.items():
+                f.write(json.dumps([key, entry], ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.cache_file)
+        self._log_lines = len(self._entries)
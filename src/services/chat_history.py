@@ -0,0 +1,146 @@
+"""
+Chat History - სესიის კითხვა-პასუხების ისტორია (მეხსიერებაში ან JSONL ფაილში)
+"""
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import re
+import json
+import time
+import threading
+from datetime import datetime
+
+from config.settings import settings
+
+
+# ისტორიაში ინახება მხოლოდ ის, რაც ჩვენებას სჭირდება
+HISTORY_FIELDS = ("question", "answer", "sources")
+
+
+def remove_expired(history_dir=None, retention_days=None):
+    """
+    ისტორიის ფაილების წაშლა, რომლებიც retention_days-ზე მეტხანს არ განახლებულა
+    
+    Returns:
+        int: წაშლილი ფაილები
+    """
+    history_dir = Path(history_dir or settings.CHAT_HISTORY_DIR)
+    retention_days = settings.CHAT_HISTORY_RETENTION_DAYS if retention_days is None else retention_days
+    if not retention_days or not history_dir.exists():
+        return 0
+    
+    cutoff = time.time() - retention_days * 86400
+    removed = 0
+    for path in history_dir.glob("*.jsonl"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            continue  # პარალელურმა სესიამ უკვე წაშალა
+    return removed
+
+
+class ChatHistoryStore:
+    """
+    სესიის ისტორია: მეხსიერებაში ჩატვირთული სია + (სურვილისამებრ) append-only JSONL
+    
+    owner_id-ის გარეშე ისტორია მხოლოდ მეხსიერებაშია (სესიასთან ერთად
+    ქრება). owner_id - სერვერზე ცნობილი მომხმარებლის იდენტიფიკატორი
+    (არა URL-ის პარამეტრი, რომელსაც ბმულთან ერთად სხვაც მიიღებს);
+    მაშინ ახალი ჩანაწერი ფაილის ბოლოს ემატება (მთელი ისტორია თავიდან
+    არ იწერება), ხოლო CHAT_HISTORY_RETENTION_DAYS-ზე ძველი ფაილები
+    იშლება. ჩვენება ხდება გვერდებად - უახლესი პირველია. მეხსიერებაში
+    რჩება ბოლო max_entries ჩანაწერი, ფაილი კი მათზე იკუმშება, როცა მასში
+    2 × max_entries ხაზი დაგროვდება (როგორც AnswerCache-ის JSONL).
+    """
+    
+    def __init__(self, owner_id=None, history_dir=None, max_entries=None):
+        self.history_dir = Path(history_dir or settings.CHAT_HISTORY_DIR)
+        self.path = None
+        if owner_id:
+            # ფაილის სახელში მხოლოდ უსაფრთხო სიმბოლოები
+            owner_id = re.sub(r"[^A-Za-z0-9_-]", "", owner_id)[:64] or "default"
+            self.path = self.history_dir / f"{owner_id}.jsonl"
+        self.max_entries = max_entries or settings.CHAT_HISTORY_MAX_ENTRIES
+        self._entries = []
+        self._log_lines = 0
+        self._lock = threading.Lock()
+        if self.persistent:
+            remove_expired(self.history_dir)
+            self._load()
+    
+    @property
+    def persistent(self):
+        return self.path is not None
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def append(self, response):
+        """RAG პასუხის დამატება ისტორიაში"""
+        entry = {field: response.get(field) for field in HISTORY_FIELDS}
+        entry["created_at"] = datetime.now().isoformat(timespec="seconds")
+        
+        with self._lock:
+            self._entries.append(entry)
+            if len(self._entries) > self.max_entries:
+                self._entries = self._entries[-self.max_entries:]
+            if not self.persistent:
+                return
+            # ძველი ხაზები გროვდება - ფაილი იკუმშება მხოლოდ 2 × max_entries-ზე
+            if self._log_lines >= 2 * self.max_entries:
+                self._rewrite()
+            else:
+                self.history_dir.mkdir(parents=True, exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                self._log_lines += 1
+    
+    def page(self, number, size=None):
+        """
+        Args:
+            number: გვერდის ნომერი (0 - უახლესი)
+        
+        Returns:
+            list: ჩანაწერები, უახლესი პირველი
+        """
+        size = size or settings.CHAT_HISTORY_PAGE_SIZE
+        end = len(self._entries) - number * size
+        if end <= 0:
+            return []
+        return self._entries[max(0, end - size):end][::-1]
+    
+    def page_count(self, size=None):
+        size = size or settings.CHAT_HISTORY_PAGE_SIZE
+        return max(1, -(-len(self._entries) // size))
+    
+    def clear(self):
+        with self._lock:
+            self._entries = []
+            self._log_lines = 0
+            if self.persistent and self.path.exists():
+                self.path.unlink()
+    
+    def _load(self):
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    self._entries.append(json.loads(line))
+                except ValueError:
+                    continue  # ნახევრად ჩაწერილი ხაზი (მაგ. პროცესის გათიშვისას)
+        self._log_lines = len(self._entries)
+        self._entries = self._entries[-self.max_entries:]
+    
+    def _rewrite(self):
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in self._entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.path)
+        self._log_lines = len(self._entries)
@@ -6,19 +6,53 @@ from pathlib import Path
 project_root = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from langchain_community.document_loaders import PyPDFLoader, DirectoryLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
 import os
+import multiprocessing
+import time
+import hashlib
 from config.settings import settings
+from src.services.legal_splitter import GeorgianLegalTextSplitter
+from src.services.metadata_extractor import extract_document_metadata, infer_tax_type
+from src.services.page_cache import PageCache
+from src.core.telemetry import span, observe
+
+
+# იზრდება metadata-ს ველების ან chunks-ის ფორმის ცვლილებისას - ბაზა თავიდან ინდექსირდება
+METADATA_VERSION = 4
+
+
+def _load_pdf_pages(file_path):
+    """
+    ერთი PDF-ის გვერდების ჩატვირთვა (worker პროცესში)
+    
+    Returns:
+        tuple: (file_path, pages, error, seconds) - შეცდომა არ ვრცელდება გარეთ
+    """
+    from langchain_community.document_loaders import PyPDFLoader
+    
+    started = time.perf_counter()
+    try:
+        pages = PyPDFLoader(str(file_path)).load()
+        return file_path, pages, None, time.perf_counter() - started
+    except Exception as e:
+        return file_path, [], f"{type(e).__name__}: {e}", time.perf_counter() - started
 
 
 class DocumentService:
     """დოკუმენტების ჩატვირთვა და დამუშავება"""
     
-    def __init__(self):
+    def __init__(self, workers=None):
         self.documents_dir = settings.DOCUMENTS_DIR
         self.chunk_size = settings.CHUNK_SIZE
         self.chunk_overlap = settings.CHUNK_OVERLAP
+        self.chunking_strategy = settings.CHUNKING_STRATEGY
+        self.document_metadata = {}
+        self.workers = workers or settings.DOCUMENT_LOADER_WORKERS
+        self.load_errors = {}
+        self.page_cache = PageCache() if settings.PAGE_CACHE_ENABLED else None
     
     def load_documents(self, directory_path=None):
         """
@@ -35,44 +69,188 @@ class DocumentService:
         
         print(f"📂 ვტვირთავ დოკუმენტებს: {directory_path}")
         
-        if not os.path.exists(directory_path):
-            raise FileNotFoundError(f"საქაღალდე ვერ მოიძებნა: {directory_path}")
-        
-        # ვტვირთავ PDF-ებს
-        loader = DirectoryLoader(
-            str(directory_path),
-            glob="**/*.pdf",
-            loader_cls=PyPDFLoader,
-            show_progress=True
-        )
+        # ვტვირთავ PDF-ებს (გაფუჭებული ფაილი დანარჩენებს არ აჩერებს)
+        documents = []
+        for file_path, pages, error in self.iter_file_pages(self.list_pdf_files(directory_path)):
+            if error is None:
+                documents.extend(pages)
         
-        try:
-            documents = loader.load()
-            print(f"✅ ჩაიტვირთა {len(documents)} გვერდი")
-        except Exception as e:
-            print(f"❌ შეცდომა: {e}")
-            return []
+        print(f"✅ ჩაიტვირთა {len(documents)} გვერდი")
+        if self.load_errors:
+            print(f"⚠️ {len(self.load_errors)} ფაილი ვერ ჩაიტვირთა")
         
         if len(documents) == 0:
             print("⚠️ არცერთი დოკუმენტი ვერ მოიძებნა!")
             return []
         
         # ვყოფთ chunks-ად
-        chunks = self._split_documents(documents)
+        chunks = self.split_documents(documents)
         print(f"✂️ შეიქმნა {len(chunks)} ტექსტური ნაწილი")
         
         return chunks
     
-    def _split_documents(self, documents):
-        """ტექსტის chunks-ად დაყოფა"""
-        text_splitter = RecursiveCharacterTextSplitter(
+    def list_pdf_files(self, directory_path=None):
+        """ყველა PDF ფაილის სია (დალაგებული)"""
+        if directory_path is None:
+            directory_path = self.documents_dir
+        
+        if not os.path.exists(directory_path):
+            raise FileNotFoundError(f"საქაღალდე ვერ მოიძებნა: {directory_path}")
+        
+        return sorted(Path(directory_path).glob("**/*.pdf"))
+    
+    def iter_chunks(self, directory_path=None):
+        """
+        chunks ნაკადად - ფაილი ფაილზე, მთელი კორპუსის მეხსიერებაში
+        ჩატვირთვის გარეშე
+        """
+        files = self.list_pdf_files(directory_path)
+        for file_path, pages, error in self.iter_file_pages(files):
+            if error is None:
+                yield from self.split_documents(pages)
+    
+    def iter_file_pages(self, files, hashes=None):
+        """
+        PDF-ების გვერდები ფაილების მიხედვით, იმავე რიგით
+        
+        უცვლელი ფაილების გვერდები იკითხება page cache-იდან, დანარჩენი
+        PDF-ები მუშავდება და ქეშში ინახება. ქეშიდან გვერდები იტვირთება
+        მხოლოდ yield-ის წინ - მეხსიერებაში ერთდროულად ერთი ფაილია.
+        workers > 1 შემთხვევაში ფაილები პროცესების pool-ში მუშავდება;
+        ერთდროულად მხოლოდ შეზღუდული რაოდენობის ფაილია "ფრენაში".
+        
+        Args:
+            files: PDF ფაილების გზები
+            hashes: {file_path: sha256} - უკვე გამოთვლილი hash-ები (მეორედ აღარ ითვლება)
+        
+        Yields:
+            tuple: (file_path, pages, error)
+        """
+        files = list(files)
+        hashes = dict(hashes or {})
+        self.load_errors = {}
+        
+        cached = set()
+        if self.page_cache is not None:
+            for file_path in files:
+                if file_path not in hashes:
+                    hashes[file_path] = self.file_hash(file_path)
+                if self.page_cache.contains(hashes[file_path]):
+                    cached.add(file_path)
+            if cached:
+                print(f"📦 {len(cached)}/{len(files)} ფაილი გვერდების ქეშიდან")
+        
+        # parse-ის შედეგები მოდის to_parse-ის რიგით
+        to_parse = [file_path for file_path in files if file_path not in cached]
+        parsed = self._parse_files(to_parse)
+        for file_path in files:
+            if file_path in cached:
+                pages = self.page_cache.get(file_path, hashes[file_path])
+                if pages is not None:
+                    yield file_path, pages, None
+                    continue
+                # ჩანაწერი დაზიანებულია ან წაიშალა - ეს ფაილი ადგილზე მუშავდება
+                file_path, pages, error = next(self._parse_files([file_path]))
+            else:
+                file_path, pages, error = next(parsed)
+            if error is None and self.page_cache is not None:
+                self.page_cache.put(hashes[file_path], pages)
+            yield file_path, pages, error
+    
+    def _parse_files(self, files):
+        """PDF-ების parse (თანმიმდევრულად ან პროცესების pool-ში)"""
+        if self.workers <= 1 or len(files) <= 1:
+            results = map(_load_pdf_pages, files)
+            yield from self._collect_errors(results)
+            return
+        
+        workers = min(self.workers, len(files))
+        print(f"⚙️ PDF-ების დამუშავება {workers} პროცესით...")
+        
+        # spawn: fork-ი მრავალნაკადიან (Streamlit) პროცესში, სადაც torch შეიძლება
+        # უკვე ჩატვირთული იყოს, შეიძლება გაიჭედოს (იგივე, რაც ParallelEmbedder-ში)
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context("spawn")) as executor:
+            yield from self._collect_errors(
+                self._bounded_map(executor, _load_pdf_pages, files, workers * 2)
+            )
+    
+    @staticmethod
+    def _bounded_map(executor, fn, items, window):
+        """executor.map-ის ანალოგი, რომელიც ყველა task-ს წინასწარ არ აგზავნის"""
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    
+    def _collect_errors(self, results):
+        for file_path, pages, error, seconds in results:
+            # worker პროცესში გაზომილი დრო მეტრიკებში აქ იწერება
+            observe("document_load", seconds, file=Path(file_path).name,
+                    pages=len(pages), error=error)
+            if error is not None:
+                self.load_errors[str(file_path)] = error
+                print(f"❌ ვერ ჩაიტვირთა {Path(file_path).name}: {error}")
+            yield file_path, pages, error
+    
+    @staticmethod
+    def file_hash(file_path):
+        """ფაილის შიგთავსის sha256 hash"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    @property
+    def chunking(self):
+        """დაყოფის პარამეტრების ხელმოწერა (manifest-ში - ცვლილებისას ხელახალი დაყოფა)"""
+        return f"{self.chunking_strategy}/{self.chunk_size}/{self.chunk_overlap}/meta{METADATA_VERSION}"
+    
+    def split_documents(self, documents):
+        """ტექსტის chunks-ად დაყოფა (settings.CHUNKING_STRATEGY)"""
+        if self.chunking_strategy == "legal":
+            text_splitter = GeorgianLegalTextSplitter(self.chunk_size, self.chunk_overlap)
+        elif self.chunking_strategy == "recursive":
+            text_splitter = self._recursive_splitter()
+        else:
+            raise ValueError(f"უცნობი chunking სტრატეგია: {self.chunking_strategy}")
+        
+        with span("split", pages=len(documents), strategy=self.chunking_strategy) as current:
+            chunks = text_splitter.split_documents(documents)
+            self._annotate(documents, chunks)
+            current.set(chunks=len(chunks))
+        return chunks
+    
+    def _annotate(self, pages, chunks):
+        """
+        ფილტრებისთვის metadata: doc_number, issue_date (დოკუმენტიდან) და
+        tax_type (chunk-იდან, თუ მასში გადასახადი არ არის ნახსენები - დოკუმენტიდან)
+        """
+        by_source = {}
+        for page in pages:
+            by_source.setdefault(page.metadata.get("source"), []).append(page)
+        for source, source_pages in by_source.items():
+            self.document_metadata[source] = extract_document_metadata(source_pages)
+        
+        for chunk in chunks:
+            document = self.document_metadata.get(chunk.metadata.get("source"), {})
+            chunk.metadata.update(document)
+            tax_type = infer_tax_type(chunk.page_content) or document.get("tax_type")
+            if tax_type:
+                chunk.metadata["tax_type"] = tax_type
+    
+    def _recursive_splitter(self):
+        return RecursiveCharacterTextSplitter(
             chunk_size=self.chunk_size,
             chunk_overlap=self.chunk_overlap,
             length_function=len,
-            separators=["\n\n", "\n", " ", ""]
+            separators=["\n\n", "\n", " ", ""],
+            add_start_index=True  # ContextAssembler-ს გადაფარვის ზუსტად მოსაშორებლად
         )
-        
-        return text_splitter.split_documents(documents)
     
     def get_documents_info(self):
         """დოკუმენტების შესახებ ინფორმაცია"""
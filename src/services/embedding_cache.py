@@ -0,0 +1,148 @@
+"""
+Embedding Cache - embeddings-ის ქეში (მეხსიერება + დისკი)
+"""
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from config.settings import settings
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    ნებისმიერი Embeddings-ის wrapper ქეშით
+    
+    ჯერ მოწმდება მეხსიერების LRU, შემდეგ SQLite ფაილი დისკზე; მხოლოდ ქეშში
+    არმყოფი ტექსტები იგზავნება მოდელში, ერთი batch-ით. გასაღები არის
+    მოდელის სახელი + ტექსტის sha256, ამიტომ მოდელის შეცვლა ქეშს არ ურევს.
+    """
+    
+    def __init__(self, underlying, model_name, cache_file=None, memory_size=None):
+        self.underlying = underlying
+        self.model_name = model_name
+        self.cache_file = Path(cache_file or settings.CACHE_DIR / "embeddings.sqlite3")
+        self.memory_size = memory_size or settings.EMBEDDING_CACHE_SIZE
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+        self.hits = 0
+        self.misses = 0
+    
+    def embed_documents(self, texts):
+        """დოკუმენტების embeddings (ქეშირებული)"""
+        return self._embed(texts, "document", self.underlying.embed_documents)
+    
+    def embed_query(self, text):
+        """კითხვის embedding (ქეშირებული)"""
+        return self._embed([text], "query",
+                           lambda missing: [self.underlying.embed_query(t) for t in missing])[0]
+    
+    def embed_queries(self, texts):
+        """რამდენიმე კითხვის embedding ერთი batch-ით (იგივე ქეში, რაც embed_query-ს)"""
+        return self._embed(texts, "query", self.underlying.embed_documents)
+    
+    def embed_documents_using(self, texts, compute):
+        """
+        დოკუმენტების embeddings იგივე ქეშით, მაგრამ გარე გამომთვლელით
+        
+        Args:
+            compute: callable(texts) -> vectors, მხოლოდ ქეშში არმყოფი
+                ტექსტებისთვის (მაგ. embedding worker-ების pool)
+        """
+        return self._embed(texts, "document", compute)
+    
+    def _embed(self, texts, kind, compute):
+        keys = [self._key(kind, text) for text in texts]
+        vectors = self._lookup(keys)
+        
+        # ქეშში არმყოფი უნიკალური ტექსტები
+        missing = {}
+        for key, text, vector in zip(keys, texts, vectors):
+            if vector is None and key not in missing:
+                missing[key] = text
+        
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        
+        if missing:
+            computed = compute(list(missing.values()))
+            fresh = dict(zip(missing.keys(), computed))
+            self._store(fresh)
+            vectors = [fresh[key] if vector is None else vector
+                       for key, vector in zip(keys, vectors)]
+        
+        return [list(map(float, vector)) for vector in vectors]
+    
+    def _key(self, kind, text):
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{self.model_name}|{kind}|{digest}"
+    
+    def _lookup(self, keys):
+        vectors = [None] * len(keys)
+        disk_lookup = {}
+        
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    vectors[i] = vector
+                else:
+                    disk_lookup.setdefault(key, []).append(i)
+            
+            if not disk_lookup:
+                return vectors
+            
+            connection = self._connect()
+            pending = list(disk_lookup)
+            for start in range(0, len(pending), 500):
+                batch = pending[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = connection.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    vector = np.frombuffer(blob, dtype=np.float32)
+                    self._remember(key, vector)
+                    for i in disk_lookup[key]:
+                        vectors[i] = vector
+        
+        return vectors
+    
+    def _store(self, fresh):
+        with self._lock:
+            rows = []
+            for key, vector in fresh.items():
+                vector = np.asarray(vector, dtype=np.float32)
+                self._remember(key, vector)
+                rows.append((key, vector.tobytes()))
+            
+            connection = self._connect()
+            connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+            )
+            connection.commit()
+    
+    def _remember(self, key, vector):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+    
+    def _connect(self):
+        if self._connection is None:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(str(self.cache_file), check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+        return self._connection
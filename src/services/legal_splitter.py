@@ -0,0 +1,239 @@
+"""
+Legal Splitter - ქართული სამართლებრივი ტექსტის სტრუქტურული დაყოფა
+"""
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import re
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from config.settings import settings
+
+
+NUMBER = r"\d+[¹²³⁴⁵⁶⁷⁸⁹⁰]*"
+
+# მუხლი 166. / მუხლი 166¹. სათაური
+ARTICLE_PATTERN = re.compile(rf"^მუხლი\s+({NUMBER})\.?(?:\s|$)")
+# 1. პუნქტი / 3¹. პუნქტი
+PARAGRAPH_PATTERN = re.compile(rf"^({NUMBER})\.\s")
+# ა) ქვეპუნქტი / ა.ა) ქვეპუნქტი
+SUBPOINT_PATTERN = re.compile(r"^([ა-ჰ](?:\.[ა-ჰ])*)\)\s")
+
+SENTENCE_END = (".", ":", ";", "!", "?")
+
+# გრძელი ტექსტის დაყოფის საზღვრები; წერტილი პუნქტის ნომრის შემდეგ ("1. ")
+# საზღვარი არ არის - თორემ ნომერი ცალკე ნაწილად გამოიყოფოდა
+FALLBACK_SEPARATORS = ["\n\n", "\n", "; ", r"(?<![\d¹²³⁴⁵⁶⁷⁸⁹⁰])\. ", " ", ""]
+
+
+def is_structural(line):
+    """იწყება თუ არა ხაზი მუხლით, პუნქტით ან ქვეპუნქტით"""
+    return bool(ARTICLE_PATTERN.match(line) or PARAGRAPH_PATTERN.match(line)
+                or SUBPOINT_PATTERN.match(line))
+
+
+def repair_line_breaks(text):
+    """
+    PDF-იდან ამოღებული ტექსტის ხაზების აღდგენა
+    
+    - "სიტყ-\\nვა" → "სიტყვა" (გადატანა)
+    - წინადადების შუაში გაწყვეტილი ხაზი ერთდება წინასთან, თუ შემდეგი
+      ხაზი სტრუქტურული ელემენტით (მუხლი/პუნქტი/ქვეპუნქტი) არ იწყება
+    - ცარიელი ხაზი (აბზაცი) ნარჩუნდება
+    """
+    text = re.sub(r"(\w)-\n(\w)", r"\1\2", text)
+    
+    lines = []
+    for raw in text.split("\n"):
+        line = re.sub(r"[ \t]+", " ", raw).strip()
+        if not line:
+            if lines and lines[-1] != "":
+                lines.append("")
+            continue
+        previous = lines[-1] if lines else ""
+        if previous and not previous.endswith(SENTENCE_END) and not is_structural(line):
+            lines[-1] = f"{previous} {line}"
+        else:
+            lines.append(line)
+    return "\n".join(lines).strip()
+
+
+class GeorgianLegalTextSplitter:
+    """
+    chunks მუხლების, პუნქტებისა და ქვეპუნქტების საზღვრებზე
+    
+    chunk არასდროს კვეთს მუხლის საზღვარს; ერთი მუხლის პუნქტები ერთ
+    chunk-ში ერთიანდება chunk_size-მდე. მუხლის გაგრძელების chunk-ს
+    თავში ემატება მუხლის სათაური, რომ თითოეული chunk დამოუკიდებლად
+    იკითხებოდეს. chunk_size-ზე გრძელი პუნქტი იყოფა ჩვეულებრივი
+    RecursiveCharacterTextSplitter-ით.
+    
+    metadata: article (მუხლის ნომერი), paragraph (პირველი პუნქტი chunk-ში),
+    start_index (პოზიცია გვერდის გასწორებულ ტექსტში - ContextAssembler-ი
+    ამით ალაგებს ერთი გვერდის chunks-ს და აშორებს გადაფარვას).
+    მუხლი, რომელიც წინა გვერდზე დაიწყო, გრძელდება შემდეგ გვერდზეც.
+    """
+    
+    def __init__(self, chunk_size=None, chunk_overlap=None):
+        self.chunk_size = chunk_size or settings.CHUNK_SIZE
+        self.chunk_overlap = settings.CHUNK_OVERLAP if chunk_overlap is None else chunk_overlap
+        self._fallback = RecursiveCharacterTextSplitter(
+            chunk_size=self.chunk_size,
+            chunk_overlap=self.chunk_overlap,
+            length_function=len,
+            separators=FALLBACK_SEPARATORS,
+            is_separator_regex=True,
+            add_start_index=True  # გადაფარვადი ნაწილების პოზიცია (იხ. _emit)
+        )
+    
+    def split_documents(self, documents):
+        """
+        Args:
+            documents: გვერდები (PyPDFLoader-ის Document-ები, ფაილის რიგით)
+        
+        Returns:
+            list: chunks
+        """
+        chunks = []
+        state, source = (None, None, None), None
+        for document in documents:
+            # ახალ ფაილში მუხლი თავიდან იწყება
+            if document.metadata.get("source") != source:
+                source = document.metadata.get("source")
+                state = (None, None, None)
+            page_chunks, state = self._split_page(document, state)
+            chunks.extend(page_chunks)
+        return chunks
+    
+    def _split_page(self, document, state):
+        """
+        Args:
+            state: (article, heading, paragraph) წინა გვერდის ბოლოდან
+        """
+        units = self._units(repair_line_breaks(document.page_content), *state)
+        
+        chunks = []
+        current = []
+        for unit in units:
+            size = sum(len(item["text"]) + 1 for item in current)
+            new_article = unit["starts_article"] or (current and unit["article"] != current[0]["article"])
+            if current and (new_article or size + len(unit["text"]) > self.chunk_size):
+                chunks.extend(self._flush(document, current))
+                current = []
+            current.append(unit)
+        chunks.extend(self._flush(document, current))
+        
+        if units:
+            last = units[-1]
+            state = (last["article"], last["heading"], last["paragraph"])
+        return chunks, state
+    
+    @staticmethod
+    def _heading_only(units):
+        """შეიცავს თუ არა ჯგუფი მხოლოდ მუხლის სათაურის ხაზს"""
+        return len(units) == 1 and units[0]["starts_article"] and "\n" not in units[0]["text"]
+    
+    def _flush(self, document, units):
+        """
+        ჯგუფი → chunks; მარტო სათაური ცალკე chunk-ად არ გამოდის - ის state-ით
+        გადადის და შემდეგ chunk-ს _emit-ი წინ დაურთავს
+        """
+        if not units or self._heading_only(units):
+            return []
+        return self._emit(document, units)
+    
+    @staticmethod
+    def _units(text, article, heading, paragraph):
+        """ტექსტი → სტრუქტურული ერთეულები (მუხლის სათაური, პუნქტი, ქვეპუნქტი, აბზაცი)"""
+        units = []
+        bounds = [0] + [match.end() for match in re.finditer(r"\n(?=\S)", text)] + [len(text)]
+        for position, end in zip(bounds, bounds[1:]):
+            block = text[position:end].strip()
+            if not block:
+                continue
+            starts_article = False
+            match = ARTICLE_PATTERN.match(block)
+            if match:
+                article, heading = match.group(1), block.split("\n")[0][:120]
+                paragraph = None
+                starts_article = True
+            else:
+                match = PARAGRAPH_PATTERN.match(block)
+                if match:
+                    paragraph = match.group(1)
+            
+            if units and not starts_article and SUBPOINT_PATTERN.match(block) is None \
+                    and PARAGRAPH_PATTERN.match(block) is None and units[-1]["article"] == article:
+                # ჩვეულებრივი აბზაცი უერთდება წინა ერთეულს
+                units[-1]["text"] += "\n" + block
+                continue
+            
+            units.append({
+                "text": block,
+                "article": article,
+                "heading": heading,
+                "paragraph": paragraph,
+                "starts_article": starts_article,
+                "start": position
+            })
+        return units
+    
+    def _emit(self, document, units):
+        """ერთეულების ჯგუფი → chunks (მუხლის სათაურით თითოეულის თავში)"""
+        first = units[0]
+        body = "\n".join(unit["text"] for unit in units)
+        body_start = first["start"]
+        heading = first["heading"]
+        if first["starts_article"]:
+            # საკუთარი სათაურის ხაზი ტექსტიდან გამოიყოფა, რომ ყველა ნაწილს დაერთოს
+            if heading and body.startswith(heading + "\n"):
+                body = body[len(heading) + 1:]
+                body_start += len(heading) + 1
+            else:
+                heading = None
+        prefix = len(heading) + 1 if heading else 0
+        
+        metadata = dict(document.metadata)
+        if first["article"]:
+            metadata["article"] = first["article"]
+        paragraph = next((unit["paragraph"] for unit in units if unit["paragraph"]), None)
+        if paragraph:
+            metadata["paragraph"] = paragraph
+        
+        if prefix + len(body) <= self.chunk_size:
+            pieces = [Document(page_content=body, metadata={**metadata, "start_index": 0})]
+        else:
+            pieces = self._body_splitter(prefix).split_documents(
+                [Document(page_content=body, metadata=metadata)]
+            )
+        
+        for piece in pieces:
+            if heading:
+                piece.page_content = f"{heading}\n{piece.page_content}"
+            # start_index - სადაც chunk გვერდზე დაიწყებოდა, სათაური მის წინ რომ ყოფილიყო;
+            # ასე ერთი ჯგუფის გადაფარვადი ნაწილების პოზიციები ერთმანეთთან შეთანხმებულია.
+            # წინა გვერდიდან გადმოსული სათაური ამ გვერდზე არ ეტევა - პოზიცია უცნობია
+            start = body_start + piece.metadata["start_index"] - prefix
+            if start < 0:
+                del piece.metadata["start_index"]
+            else:
+                piece.metadata["start_index"] = start
+        return pieces
+    
+    def _body_splitter(self, prefix):
+        """chunk_size-ზე გრძელი ტექსტის splitter-ი, სათაურისთვის დატოვებული ადგილით"""
+        if not prefix:
+            return self._fallback
+        chunk_size = max(self.chunk_size - prefix, self.chunk_size // 2)
+        return RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=min(self.chunk_overlap, chunk_size // 2),
+            length_function=len,
+            separators=FALLBACK_SEPARATORS,
+            is_separator_regex=True,
+            add_start_index=True
+        )
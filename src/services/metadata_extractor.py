@@ -0,0 +1,148 @@
+"""
+Metadata Extractor - დოკუმენტის ნომერი, თარიღი და გადასახადის სახე
+"""
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import re
+
+
+# ინდექსირებული metadata ველები (ფილტრებისთვის)
+FILTER_FIELDS = ("doc_number", "issue_date", "tax_type", "article")
+
+# გადასახადის სახე → საკვანძო ფრაზები (ქვესტრიქონი, მცირე ასოებით)
+TAX_TYPE_KEYWORDS = {
+    "vat": ("დღგ", "დამატებული ღირებულების გადასახად"),
+    "income": ("საშემოსავლო", "საპენსიო"),
+    "profit": ("მოგების გადასახად",),
+    "property": ("ქონების გადასახად",),
+    "excise": ("აქციზ",),
+    "customs": ("საბაჟო", "იმპორტის გადასახად"),
+}
+
+MONTHS = {
+    "იანვ": 1, "თებერვ": 2, "მარტ": 3, "აპრილ": 4, "მაის": 5, "ივნის": 6,
+    "ივლის": 7, "აგვისტ": 8, "სექტემბ": 9, "ოქტომბ": 10, "ნოემბ": 11, "დეკემბ": 12,
+}
+
+# დოკუმენტის ნომერი სათაურის ხაზის დასაწყისში: "N 2926", "№ 2926", "ბრძანება №2926"
+# (ტექსტის შიგნით "№" სხვა დოკუმენტებს ეკუთვნის - ოქმი, საჩივარი, მოთხოვნა)
+DOC_NUMBER_PATTERN = re.compile(r"^(?:[ა-ჰ]+\s+)?(?:№|N)\s*([0-9][\w\-/]*)", re.MULTILINE)
+MONTH_PATTERN = "(" + "|".join(MONTHS) + r")[ა-ჰ]*"
+# 2010 წლის 17 სექტემბერი
+GEORGIAN_DATE_PATTERN = re.compile(r"(\d{4})\s*წლის\s*(\d{1,2})\s*" + MONTH_PATTERN)
+# 11 თებერვალი 2026
+GEORGIAN_DMY_DATE_PATTERN = re.compile(r"\b(\d{1,2})\s+" + MONTH_PATTERN + r"\s+(\d{4})\b")
+# 17.09.2010
+NUMERIC_DATE_PATTERN = re.compile(r"\b(\d{1,2})\.(\d{1,2})\.(\d{4})\b")
+
+# სათაურის ზედა ხაზები - ნომერი და გამოცემის თარიღი აქაა, ტექსტის თარიღები სხვა მოვლენებისაა
+HEADER_LINES = 5
+
+
+def count_tax_types(text):
+    """{tax_type: შეხვედრების რაოდენობა}"""
+    text = text.lower()
+    counts = {}
+    for tax_type, keywords in TAX_TYPE_KEYWORDS.items():
+        count = sum(text.count(keyword) for keyword in keywords)
+        if count:
+            counts[tax_type] = count
+    return counts
+
+
+def infer_tax_type(text, unique=False):
+    """
+    ყველაზე ხშირად ნახსენები გადასახადის სახე
+    
+    Args:
+        unique: True - მხოლოდ თუ ერთადერთი სახეა ნახსენები (კითხვებისთვის)
+    """
+    counts = count_tax_types(text)
+    if not counts or (unique and len(counts) > 1):
+        return None
+    return max(counts, key=counts.get)
+
+
+def _iso_date(year, month, day):
+    year, month, day = int(year), int(month), int(day)
+    if 1 <= month <= 12 and 1 <= day <= 31:
+        return f"{year:04d}-{month:02d}-{day:02d}"
+    return None
+
+
+def extract_issue_date(text):
+    """ტექსტში პირველი (პოზიციით) თარიღი, ISO ფორმატით (YYYY-MM-DD)"""
+    found = []
+    for match in GEORGIAN_DATE_PATTERN.finditer(text):
+        year, day, month = match.group(1), match.group(2), MONTHS[match.group(3)]
+        found.append((match.start(), _iso_date(year, month, day)))
+    for match in GEORGIAN_DMY_DATE_PATTERN.finditer(text):
+        day, month, year = match.group(1), MONTHS[match.group(2)], match.group(3)
+        found.append((match.start(), _iso_date(year, month, day)))
+    for match in NUMERIC_DATE_PATTERN.finditer(text):
+        day, month, year = match.groups()
+        found.append((match.start(), _iso_date(year, month, day)))
+    
+    dates = [date for _, date in sorted(found) if date]
+    return dates[0] if dates else None
+
+
+def _header_lines(text, count=HEADER_LINES):
+    """პირველი count არაცარიელი ხაზი"""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    return "\n".join(lines[:count])
+
+
+def extract_document_metadata(pages, header_pages=2):
+    """
+    დოკუმენტის დონის metadata (ნომერი და თარიღი - პირველი გვერდებიდან)
+    
+    Returns:
+        dict: მხოლოდ ნაპოვნი ველები (Chroma None მნიშვნელობებს არ იღებს)
+    """
+    header = "\n".join(page.page_content for page in pages[:header_pages])
+    top = _header_lines(header)
+    full_text = "\n".join(page.page_content for page in pages)
+    
+    metadata = {}
+    match = DOC_NUMBER_PATTERN.search(top)
+    if match:
+        metadata["doc_number"] = match.group(1).rstrip("-/")
+    # სათაურის თარიღი უპირატესია ტექსტში ნახსენებ თარიღებზე (საჩივარი, სხდომა...)
+    issue_date = extract_issue_date(top) or extract_issue_date(header)
+    if issue_date:
+        metadata["issue_date"] = issue_date
+    tax_type = infer_tax_type(full_text)
+    if tax_type:
+        metadata["tax_type"] = tax_type
+    return metadata
+
+
+# ტესტი (regression: data/documents/ბრძანება N 2926.pdf)
+if __name__ == "__main__":
+    from langchain_core.documents import Document
+    
+    header = (
+        "N 2926\n11 თებერვალი 2026\n \nბ რ ძ ა ნ ე ბ ა\n \n"
+        "სს „---ის“ (ს/ნ ----)\n(მის.: ----) 2026 წლის 12 იანვრის\n"
+        "საჩივრის დაკმაყოფილებაზე უარის თქმის თაობაზე\n"
+        "შემოსავლების სამსახურმა დავების განხილვის საბჭოს 2026 წლის 5 თებერვლის\n"
+        "სხდომაზე (ოქმი №11) განიხილა ... №99901/1/2026 საჩივარი ... დღგ-ით დაბეგვრას"
+    )
+    expected = {"doc_number": "2926", "issue_date": "2026-02-11", "tax_type": "vat"}
+    metadata = extract_document_metadata([Document(page_content=header)])
+    assert metadata == expected, metadata
+    print("✅ სათაური:", metadata)
+    
+    from config.settings import settings
+    
+    pdf_path = settings.DOCUMENTS_DIR / "ბრძანება N 2926.pdf"
+    if pdf_path.exists():
+        from langchain_community.document_loaders import PyPDFLoader
+        
+        metadata = extract_document_metadata(PyPDFLoader(str(pdf_path)).load())
+        assert metadata == expected, metadata
+        print("✅ PDF:", metadata)
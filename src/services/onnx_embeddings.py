@@ -0,0 +1,189 @@
+"""
+ONNX Embeddings - sentence-transformers მოდელი ONNX Runtime-ზე (CPU)
+"""
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import threading
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from config.settings import settings
+
+
+class OnnxEmbeddings(Embeddings):
+    """
+    Embeddings ONNX Runtime-ით, PyTorch-ის გარეშე
+    
+    პირველ გაშვებაზე მოდელი ექსპორტდება ONNX-ში (optimum) და, თუ
+    quantize=True, დინამიკური int8 კვანტიზაციით; შედეგი ინახება
+    CACHE_DIR/onnx-ში. შემდეგ საჭიროა მხოლოდ onnxruntime და tokenizers -
+    torch/transformers საერთოდ არ იმპორტდება.
+    
+    pooling: mean (attention mask-ით) + L2 ნორმალიზაცია, როგორც
+    sentence-transformers-ის all-MiniLM-L6-v2-ში.
+    """
+    
+    def __init__(self, model_name=None, quantize=None, model_dir=None,
+                 batch_size=None, max_length=256, threads=None):
+        self.model_name = model_name or settings.EMBEDDING_MODEL
+        self.quantize = settings.ONNX_QUANTIZE if quantize is None else quantize
+        self.model_dir = Path(model_dir or settings.CACHE_DIR / "onnx" /
+                              self.model_name.replace("/", "__"))
+        self.batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+        self.max_length = max_length
+        self.threads = settings.ONNX_THREADS if threads is None else threads
+        self._session = None
+        self._tokenizer = None
+        self._input_names = ()
+        self._lock = threading.Lock()
+    
+    @property
+    def model_path(self):
+        return self.model_dir / ("model_quantized.onnx" if self.quantize else "model.onnx")
+    
+    @property
+    def variant(self):
+        """ვექტორების წყაროს სახელი (ანგარიშებისა და parity-სთვის)"""
+        return "onnx-int8" if self.quantize else "onnx"
+    
+    def export(self):
+        """მოდელის ONNX ექსპორტი (და კვანტიზაცია) - მხოლოდ ერთხელ"""
+        if self.model_path.exists() and (self.model_dir / "tokenizer.json").exists():
+            return self.model_path
+        
+        try:
+            from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+            from transformers import AutoTokenizer
+        except ImportError as e:
+            raise ImportError(
+                "ONNX ექსპორტისთვის საჭიროა: pip install optimum[onnxruntime]"
+            ) from e
+        
+        print(f"📦 ვაექსპორტებ {self.model_name} → ONNX ({self.model_dir})...")
+        self.model_dir.mkdir(parents=True, exist_ok=True)
+        model = ORTModelForFeatureExtraction.from_pretrained(self.model_name, export=True)
+        model.save_pretrained(self.model_dir)
+        AutoTokenizer.from_pretrained(self.model_name).save_pretrained(self.model_dir)
+        
+        if self.quantize:
+            print("🗜️ int8 კვანტიზაცია...")
+            quantizer = ORTQuantizer.from_pretrained(self.model_dir, file_name="model.onnx")
+            config = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+            quantizer.quantize(save_dir=self.model_dir, quantization_config=config)
+        
+        return self.model_path
+    
+    def _load(self):
+        with self._lock:
+            if self._session is not None:
+                return
+            try:
+                import onnxruntime as ort
+                from tokenizers import Tokenizer
+            except ImportError as e:
+                raise ImportError("ONNX backend-ს სჭირდება: pip install onnxruntime tokenizers") from e
+            
+            self.export()
+            
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            if self.threads:
+                options.intra_op_num_threads = self.threads
+            session = ort.InferenceSession(str(self.model_path), options,
+                                           providers=["CPUExecutionProvider"])
+            
+            tokenizer = Tokenizer.from_file(str(self.model_dir / "tokenizer.json"))
+            tokenizer.enable_truncation(max_length=self.max_length)
+            tokenizer.enable_padding()
+            
+            self._input_names = {node.name for node in session.get_inputs()}
+            self._tokenizer = tokenizer
+            self._session = session
+            print(f"✅ ONNX მოდელი ჩაიტვირთა ({self.model_path.name})")
+    
+    def _encode(self, texts):
+        encodings = self._tokenizer.encode_batch(texts)
+        input_ids = np.array([encoding.ids for encoding in encodings], dtype=np.int64)
+        attention_mask = np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64)
+        
+        inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            inputs["token_type_ids"] = np.zeros_like(input_ids)
+        
+        hidden = self._session.run(None, inputs)[0]  # (batch, tokens, dim)
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        return pooled / np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+    
+    def embed_documents(self, texts):
+        """batch-ები სიგრძით დალაგებული (ნაკლები padding), შედეგი - საწყისი რიგით"""
+        texts = list(texts)
+        if not texts:
+            return []
+        self._load()
+        
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        vectors = [None] * len(texts)
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            for i, vector in zip(batch, self._encode([texts[i] for i in batch])):
+                vectors[i] = vector.tolist()
+        return vectors
+    
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def parity_check(texts, onnx_embeddings=None, reference_embeddings=None):
+    """
+    ONNX ვექტორების გადახრა PyTorch (HuggingFaceEmbeddings) ვექტორებიდან
+    
+    Returns:
+        dict: mean/min cosine და max drift (1 - min cosine)
+    """
+    onnx_embeddings = onnx_embeddings or OnnxEmbeddings()
+    if reference_embeddings is None:
+        from langchain_community.embeddings import HuggingFaceEmbeddings
+        
+        reference_embeddings = HuggingFaceEmbeddings(
+            model_name=onnx_embeddings.model_name,
+            model_kwargs={'device': 'cpu'}
+        )
+    
+    onnx_vectors = np.asarray(onnx_embeddings.embed_documents(texts), dtype=np.float32)
+    reference = np.asarray(reference_embeddings.embed_documents(texts), dtype=np.float32)
+    reference /= np.maximum(np.linalg.norm(reference, axis=1, keepdims=True), 1e-12)
+    
+    cosines = (onnx_vectors * reference).sum(axis=1)
+    return {
+        "texts": len(texts),
+        "variant": onnx_embeddings.variant,
+        "mean_cosine": float(cosines.mean()),
+        "min_cosine": float(cosines.min()),
+        "max_drift": float(1.0 - cosines.min())
+    }
+
+
+# ტესტი
+if __name__ == "__main__":
+    import time
+    import resource
+    from config.ui.utils.config_loader import UIConfigLoader
+    
+    texts = UIConfigLoader().load_sample_questions() or ["რა არის დღგ?"]
+    
+    for quantize in (False, True):
+        embeddings = OnnxEmbeddings(quantize=quantize)
+        embeddings.embed_query("warm-up")
+        started = time.perf_counter()
+        embeddings.embed_documents(texts)
+        seconds = time.perf_counter() - started
+        print(f"\n⏱️ {embeddings.variant}: {len(texts) / seconds:.1f} ტექსტი/წმ")
+        print("📐 parity:", parity_check(texts, embeddings))
+    
+    print(f"\n🧠 max RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
@@ -0,0 +1,101 @@
+"""
+Page Cache - PDF-ებიდან ამოღებული გვერდების ქეში დისკზე
+"""
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import gzip
+import json
+
+from langchain_core.documents import Document
+
+from config.settings import settings
+from src.core.telemetry import metrics
+
+
+# იზრდება PDF-ის დამუშავების (loader/გასუფთავების) ცვლილებისას - ძველი ჩანაწერები აღარ ემთხვევა
+PARSER_VERSION = "pypdf-1"
+
+
+class PageCache:
+    """
+    PyPDFLoader-ის შედეგი ფაილის hash-ით
+    
+    თითო PDF → ერთი gzip JSON ფაილი (გვერდის ტექსტი + metadata).
+    გასაღები არის ფაილის sha256 + PARSER_VERSION, ამიტომ შეცვლილი PDF
+    ან ახალი parser-ი ძველ ჩანაწერს არ იყენებს. source metadata არ
+    ინახება - ჩატვირთვისას ემატება ფაილის მიმდინარე გზა (გადატანილ
+    ფაილსაც იგივე ჩანაწერი ემთხვევა).
+    """
+    
+    def __init__(self, cache_dir=None, parser_version=PARSER_VERSION):
+        self.cache_dir = Path(cache_dir or settings.CACHE_DIR / "pages")
+        self.parser_version = parser_version
+        self.hits = 0
+        self.misses = 0
+    
+    def _path(self, file_hash):
+        return self.cache_dir / self.parser_version / f"{file_hash}.json.gz"
+    
+    def contains(self, file_hash):
+        """ჩანაწერის არსებობა (ფაილი არ იკითხება)"""
+        return self._path(file_hash).exists()
+    
+    def get(self, file_path, file_hash):
+        """
+        Returns:
+            list | None: გვერდები (Document) ან None, თუ ქეშში არ არის
+        """
+        path = self._path(file_hash)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return self._miss()
+        except (OSError, ValueError) as e:
+            print(f"⚠️ გვერდების ქეში დაზიანებულია ({path.name}): {e}")
+            return self._miss()
+        
+        self.hits += 1
+        metrics.inc("rag_page_cache_total", result="hit")
+        source = str(file_path)
+        return [
+            Document(page_content=page["text"], metadata={"source": source, **page["metadata"]})
+            for page in data["pages"]
+        ]
+    
+    def _miss(self):
+        self.misses += 1
+        metrics.inc("rag_page_cache_total", result="miss")
+        return None
+    
+    def put(self, file_hash, pages):
+        """გვერდების შენახვა (ატომურად - ნახევრად ჩაწერილი ფაილი არ რჩება)"""
+        path = self._path(file_hash)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "parser": self.parser_version,
+            "pages": [
+                {
+                    "text": page.page_content,
+                    "metadata": {key: value for key, value in page.metadata.items()
+                                 if key != "source"}
+                }
+                for page in pages
+            ]
+        }
+        tmp_path = path.with_suffix(".tmp")
+        with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"), default=str)
+        os.replace(tmp_path, path)
+    
+    def clear(self):
+        """ყველა ვერსიის ჩანაწერის წაშლა"""
+        removed = 0
+        for path in self.cache_dir.glob("*/*.json.gz"):
+            path.unlink()
+            removed += 1
+        return removed
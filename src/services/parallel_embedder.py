@@ -0,0 +1,161 @@
+"""
+Parallel Embedder - chunks-ის embedding რამდენიმე პროცესში (ინდექსის აგებისას)
+"""
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from config.settings import settings
+
+
+# worker პროცესის მოდელი (ერთხელ იტვირთება initializer-ში)
+_worker_embeddings = None
+
+
+def _init_worker(backend, model_name, device, threads):
+    """worker-ის ინიციალიზაცია: thread-ების ლიმიტი და მოდელის ჩატვირთვა"""
+    global _worker_embeddings
+    # ყველა worker-მა ყველა ბირთვი რომ არ დაიკავოს (torch/onnxruntime იმპორტამდე)
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[variable] = str(threads)
+    settings.ONNX_THREADS = threads
+    
+    from src.services.vectordb_service import create_embeddings
+    
+    _worker_embeddings = create_embeddings(backend, model_name, device)
+    _worker_embeddings.embed_documents(["warm-up"])
+
+
+def _embed_shard(texts):
+    """
+    Returns:
+        tuple: (pid, float32 ვექტორები, წამები)
+    """
+    started = time.perf_counter()
+    vectors = np.asarray(_worker_embeddings.embed_documents(texts), dtype=np.float32)
+    return os.getpid(), vectors, time.perf_counter() - started
+
+
+class ParallelEmbedder:
+    """
+    embedding worker-ების pool
+    
+    თითო worker პროცესი ერთხელ ტვირთავს მოდელს, ტექსტები იყოფა
+    shard_size ზომის shard-ებად და ნაწილდება თავისუფალ worker-ებზე.
+    პროცესები იქმნება spawn-ით - fork-ი უკვე ჩატვირთულ torch-თან
+    შეიძლება გაიჭედოს. ქეშში უკვე არსებული ტექსტები pool-ში არ იგზავნება.
+    
+    last_stats: ბოლო embed-ის გამტარობა (chunk/წმ) ჯამში და worker-ების მიხედვით.
+    """
+    
+    def __init__(self, workers=None, shard_size=None, backend=None, model_name=None,
+                 device=None, cache=None):
+        self.workers = workers or settings.EMBEDDING_WORKERS
+        self.shard_size = shard_size or settings.EMBEDDING_BATCH_SIZE
+        self.backend = backend or settings.EMBEDDING_BACKEND
+        self.model_name = model_name or settings.EMBEDDING_MODEL
+        self.device = device or settings.EMBEDDING_DEVICE
+        self.threads = max(1, (os.cpu_count() or 1) // self.workers)
+        self.cache = cache
+        self.last_stats = None
+        self._pool = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    @property
+    def pool(self):
+        if self._pool is None:
+            print(f"⚙️ ვუშვებ {self.workers} embedding worker-ს ({self.threads} thread თითოზე)...")
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.backend, self.model_name, self.device, self.threads)
+            )
+        return self._pool
+    
+    @property
+    def flush_size(self):
+        """რამდენი chunk დაგროვდეს pool-ში გაგზავნამდე (ყველა worker-ს რამდენიმე shard)"""
+        return self.workers * self.shard_size * 4
+    
+    def embed(self, texts):
+        """
+        Args:
+            texts: chunk-ების ტექსტები
+        
+        Returns:
+            list: ვექტორები texts-ის რიგით (ჯერ ქეში, თუ მოცემულია, შემდეგ pool)
+        """
+        texts = list(texts)
+        if self.cache is not None:
+            return self.cache.embed_documents_using(texts, self._compute)
+        return self._compute(texts)
+    
+    def _compute(self, texts):
+        if not texts:
+            return []
+        
+        started = time.perf_counter()
+        futures = {
+            self.pool.submit(_embed_shard, texts[start:start + self.shard_size]): start
+            for start in range(0, len(texts), self.shard_size)
+        }
+        
+        vectors = [None] * len(texts)
+        per_worker = {}
+        for future in as_completed(futures):
+            pid, shard, seconds = future.result()
+            start = futures[future]
+            vectors[start:start + len(shard)] = shard.tolist()
+            worker = per_worker.setdefault(pid, {"chunks": 0, "seconds": 0.0})
+            worker["chunks"] += len(shard)
+            worker["seconds"] += seconds
+        
+        elapsed = time.perf_counter() - started
+        for worker in per_worker.values():
+            worker["chunks_per_second"] = worker["chunks"] / worker["seconds"] if worker["seconds"] else 0.0
+        self.last_stats = {
+            "chunks": len(texts),
+            "seconds": elapsed,
+            "chunks_per_second": len(texts) / elapsed if elapsed else 0.0,
+            "workers": per_worker
+        }
+        
+        print(f"⚡ {len(texts)} chunk / {elapsed:.1f}წმ "
+              f"({self.last_stats['chunks_per_second']:.0f} chunk/წმ, {len(per_worker)} worker)")
+        for pid, worker in sorted(per_worker.items()):
+            print(f"   worker {pid}: {worker['chunks']} chunk, {worker['chunks_per_second']:.0f} chunk/წმ")
+        return vectors
+    
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+# ტესტი
+if __name__ == "__main__":
+    from src.services.document_service import DocumentService
+    
+    doc_service = DocumentService()
+    chunks = list(doc_service.iter_chunks())
+    texts = [chunk.page_content for chunk in chunks]
+    
+    for workers in (1, 2, os.cpu_count() or 1):
+        with ParallelEmbedder(workers=workers) as embedder:
+            embedder.embed(texts[:200])  # worker-ების გახურება
+            embedder.embed(texts)
+            print(f"📊 {workers} worker: {embedder.last_stats['chunks_per_second']:.0f} chunk/წმ\n")
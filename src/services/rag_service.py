@@ -2,109 +2,596 @@
 RAG Service - მთავარი RAG ლოგიკა
 """
 import sys
+import time
+import threading
+import asyncio
+import weakref
+import contextvars
+from functools import partial
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 project_root = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from langchain_anthropic import ChatAnthropic
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.messages import SystemMessage
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
 
 from config.settings import settings
 from src.core.prompt_manager import PromptManager
 from src.services.vectordb_service import VectorDBService
+from src.services.cache_service import AnswerCache
+from src.core.telemetry import span, trace, observe, metrics
+from src.core.context_builder import ContextAssembler
+from src.services.metadata_extractor import infer_tax_type
 
 
 class RAGService:
     """RAG სისტემა"""
     
-    def __init__(self, prompt_type="base"):
+    def __init__(self, prompt_type="base", vectordb_service=None, llm=None):
         print("🚀 ვაქტიურებ RAG სერვისს...")
         
-        if not settings.ANTHROPIC_API_KEY:
+        if llm is None and not settings.ANTHROPIC_API_KEY:
             raise ValueError("❌ ANTHROPIC_API_KEY არ არის დაყენებული!")
         
         self.prompt_manager = PromptManager()
         self.prompt_type = prompt_type
         
-        self.vectordb_service = VectorDBService()
-        self.vectordb = self.vectordb_service.load_database()
+        # რამდენიმე prompt ტიპს შეუძლია ერთი ბაზის (და embedding მოდელის) გაზიარება
+        self.vectordb_service = vectordb_service or VectorDBService()
+        self.vectordb = self.vectordb_service.get_database()
         
+        # llm გადაეცემა ტესტებსა და benchmark-ებში (stub მოდელი)
         prompt_metadata = self.prompt_manager.get_metadata(prompt_type)
-        self.llm = ChatAnthropic(
-            model=settings.CLAUDE_MODEL,
-            anthropic_api_key=settings.ANTHROPIC_API_KEY,
-            temperature=prompt_metadata['temperature'],
-            max_tokens=prompt_metadata['max_tokens']
-        )
+        if llm is None:
+            # langchain_anthropic (anthropic SDK, httpx) იტვირთება მხოლოდ საჭიროებისას
+            from langchain_anthropic import ChatAnthropic
+            
+            llm = ChatAnthropic(
+                model=settings.CLAUDE_MODEL,
+                anthropic_api_key=settings.ANTHROPIC_API_KEY,
+                temperature=prompt_metadata['temperature'],
+                max_tokens=prompt_metadata['max_tokens']
+            )
+        self.llm = llm
         
-        self.retriever = self.vectordb.as_retriever(
-            search_kwargs={"k": settings.TOP_K_RESULTS}
+        self.top_k = settings.TOP_K_RESULTS
+        self.context_assembler = ContextAssembler(
+            token_budget=prompt_metadata.get('context_token_budget')
         )
         
+        # ქეშის namespace რეინდექსაციისას იცვლება (იხ. _cache_namespace)
+        self.answer_cache = AnswerCache() if settings.CACHE_ENABLED else None
+        
+        # async API: embedding/ძებნა ცალკე thread-ებში, LLM ზღვრული პარალელიზმით
+        self.llm_max_concurrency = settings.LLM_MAX_CONCURRENCY
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._llm_semaphores = weakref.WeakKeyDictionary()
+        
+        # Anthropic prompt cache: hit/miss მთვლელები სერვისის სიცოცხლის განმავლობაში
+        self.prompt_cache_stats = {"hit": 0, "miss": 0}
+        self._stats_lock = threading.Lock()
+        
         self._build_chain()
         print("✅ RAG სერვისი მზადაა!")
     
     def _build_chain(self):
         prompt_config = self.prompt_manager.get_prompt(self.prompt_type)
-        full_prompt = prompt_config['system'] + "\n\n" + prompt_config['template']
-        
-        self.prompt_template = ChatPromptTemplate.from_template(full_prompt)
-        
-        self.chain = (
-            {
-                "context": self.retriever | self._format_docs,
-                "question": RunnablePassthrough()
-            }
-            | self.prompt_template
-            | self.llm
-            | StrOutputParser()
-        )
+        
+        # system ინსტრუქციები სტატიკური ბლოკია; PROMPT_CACHE_MIN_TOKENS-ზე გრძელს
+        # ემატება cache_control - Anthropic მას cache-ში ინახავს და prefix-ის ფასი
+        # ერთხელ იხდება cache-ის ფანჯარაში. უფრო მოკლე prefix-ს API არ აქეშებს,
+        # ამიტომ მაშინ არც მარკერი და არც hit/miss მთვლელები არ გამოიყენება
+        system_block = {"type": "text", "text": prompt_config['system']}
+        prompt_tokens = self.context_assembler.estimate_tokens(prompt_config['system'])
+        self.prompt_cache_enabled = prompt_tokens >= settings.PROMPT_CACHE_MIN_TOKENS
+        if self.prompt_cache_enabled:
+            system_block["cache_control"] = {"type": "ephemeral"}
+        system_message = SystemMessage(content=[system_block])
+        self.prompt_template = ChatPromptTemplate.from_messages([
+            system_message,
+            ("human", prompt_config['template'])
+        ])
+        
+        # retrieval ჯაჭვის გარეთ ხდება (ask), რომ ერთი და იგივე დოკუმენტები
+        # მოხვდეს როგორც კონტექსტში, ისე წყაროებში. ჯაჭვი AIMessage-ს
+        # აბრუნებს (usage_metadata-სთვის), ტექსტს output_parser იღებს
+        self.output_parser = StrOutputParser()
+        self.chain = self.prompt_template | self.llm
     
-    def _format_docs(self, docs):
-        formatted = []
-        for i, doc in enumerate(docs, 1):
-            source = doc.metadata.get('source', 'უცნობი')
+    def _format_docs(self, docs, question=None):
+        """კონტექსტი ტოკენების ბიუჯეტით (გადაფარვების გარეშე, გვერდებად გაერთიანებული)"""
+        return self.context_assembler.assemble(docs, question)
+    
+    def _build_sources(self, docs):
+        sources = []
+        for doc in docs:
+            source = doc.metadata.get("source", "უცნობი")
             if '/' in source or '\\' in source:
                 source = Path(source).name
-            page = doc.metadata.get('page', 'N/A')
-            formatted.append(
-                f"[დოკუმენტი {i}: {source}, გვ. {page}]\n{doc.page_content}\n"
-            )
-        return "\n".join(formatted)
+            
+            sources.append({
+                "file": source,
+                "page": doc.metadata.get("page", "N/A"),
+                "article": doc.metadata.get("article"),
+                "content_preview": doc.page_content[:200] + "..."
+            })
+        return sources
     
     def ask(self, question):
         print(f"\n❓ კითხვა: {question}")
         print("🔍 ვეძებ რელევანტურ დოკუმენტებს...")
         
-        relevant_docs = self.retriever.invoke(question)
+        timings = {}
+        started = time.perf_counter()
+        
+        with span("ask", prompt_type=self.prompt_type) as root:
+            cached, query_embedding, relevant_docs, context = self._prepare(question, timings, started)
+            if cached is not None:
+                root.set(cached=True)
+                return cached
+            
+            print("🤖 ვეკითხები Claude-ს...")
+            
+            # ჯაჭვის ეტაპები ცალ-ცალკე, რომ თითოეულს საკუთარი span ჰქონდეს
+            with span("prompt_build") as current:
+                prompt = self.prompt_template.invoke({"context": context, "question": question})
+            timings["prompt_build"] = current.duration
+            
+            with span("llm", model=settings.CLAUDE_MODEL) as current:
+                message = self.llm.invoke(prompt)
+            timings["llm"] = current.duration
+            
+            with span("parse") as current:
+                answer = self.output_parser.invoke(message)
+            timings["parse"] = current.duration
+            
+            timings["total"] = time.perf_counter() - started
+            usage = self._record_usage(message)
+            root.set(cached=False, sources=len(relevant_docs), prompt_cache=usage["prompt_cache"])
+            
+            return self._finalize_response(question, answer, relevant_docs, timings,
+                                           query_embedding, usage)
+    
+    def ask_stream(self, question):
+        """
+        პასუხის სტრიმინგი ტოკენებად
+        
+        Yields:
+            dict: ჯერ {"type": "sources"} (გენერაციის დაწყებამდე), შემდეგ
+            {"type": "token", "text": ...} ტოკენები და ბოლოს
+            {"type": "done", "response": ...} სრული პასუხით
+        """
+        print(f"\n❓ კითხვა (stream): {question}")
+        
+        timings = {}
+        started = time.perf_counter()
+        
+        # generator-ში trace yield-ებს შორის ღია არ რჩება (გამომძახებლის კოდს არ
+        # "ეკვრის") - ყველა ეტაპი ერთი trace_id-ით იწერება
+        with trace() as trace_id:
+            cached, query_embedding, relevant_docs, context = self._prepare(question, timings, started)
+        if cached is not None:
+            yield {"type": "sources", "sources": cached["sources"]}
+            yield {"type": "token", "text": cached["answer"]}
+            yield {"type": "done", "response": cached}
+            return
+        
+        yield {"type": "sources", "sources": self._build_sources(relevant_docs)}
+        
+        parts = []
+        message = None
+        stage_start = time.perf_counter()
+        for chunk in self.chain.stream({"context": context, "question": question}):
+            # chunks-ის ჯამი ინახავს usage_metadata-ს (prompt cache-ის სტატისტიკა)
+            message = chunk if message is None else message + chunk
+            token = self.output_parser.invoke(chunk)
+            if not token:
+                continue
+            if not parts:
+                timings["first_token"] = time.perf_counter() - started
+            parts.append(token)
+            yield {"type": "token", "text": token}
+        timings["llm"] = time.perf_counter() - stage_start
+        
+        timings["total"] = time.perf_counter() - started
+        
+        # generator-ში span-ს yield-ებს შორის ვერ გავაჩერებთ - დრო post factum იწერება
+        with trace(trace_id):
+            observe("llm_stream", timings["llm"], model=settings.CLAUDE_MODEL,
+                    first_token_ms=round(timings.get("first_token", 0) * 1000, 3))
+            observe("ask_stream", timings["total"], prompt_type=self.prompt_type)
+            
+            response = self._finalize_response(
+                question, "".join(parts), relevant_docs, timings, query_embedding,
+                self._record_usage(message)
+            )
+        yield {"type": "done", "response": response}
+    
+    def _prepare(self, question, timings, started):
+        """
+        ქეში → embedding → ძებნა → კონტექსტი (ask და ask_stream-ისთვის)
+        
+        Returns:
+            tuple: (cached_response, query_embedding, docs, context)
+        """
+        cached = self._cached_response(question, started)
+        if cached is not None:
+            return cached, None, None, None
+        
+        # ერთი embedding და ერთი ძებნა თითო კითხვაზე
+        with span("embed") as current:
+            query_embedding = self.vectordb_service.embed_query(question)
+        timings["embed"] = current.duration
+        
+        cached = self._cached_response(question, started, query_embedding)
+        if cached is not None:
+            return cached, None, None, None
+        
+        filters = self._question_filters(question)
+        with span("search", k=self.top_k, filters=filters) as current:
+            relevant_docs = self.vectordb_service.search_by_vector(
+                query_embedding, k=self.top_k, query=question, filters=filters, strict=False
+            )
+            current.set(results=len(relevant_docs))
+        timings["search"] = current.duration
         
         print(f"📚 ვიპოვე {len(relevant_docs)} რელევანტური დოკუმენტი")
-        print("🤖 ვეკითხები Claude-ს...")
         
-        answer = self.chain.invoke(question)
+        with span("format") as current:
+            context = self._format_docs(relevant_docs, question)
+            current.set(context_chars=len(context))
+        timings["format"] = current.duration
+        
+        return None, query_embedding, relevant_docs, context
+    
+    async def ask_async(self, question):
+        """
+        ask-ის async ვერსია
+        
+        embedding და ძებნა executor-ში სრულდება (event loop არ იბლოკება),
+        Claude-ის გამოძახებები კი LLM_MAX_CONCURRENCY-ით არის შეზღუდული.
+        """
+        with span("ask_async", prompt_type=self.prompt_type):
+            return await self._ask_async(question)
+    
+    async def _ask_async(self, question):
+        loop = asyncio.get_running_loop()
+        timings = {}
+        started = time.perf_counter()
+        
+        cached = self._cached_response(question, started)
+        if cached is not None:
+            return cached
+        
+        with span("embed") as current:
+            query_embedding = await self._run_in_executor(
+                loop, self.vectordb_service.embed_query, question
+            )
+        timings["embed"] = current.duration
+        
+        cached = self._cached_response(question, started, query_embedding)
+        if cached is not None:
+            return cached
+        
+        filters = self._question_filters(question)
+        with span("search", k=self.top_k, filters=filters) as current:
+            relevant_docs = await self._run_in_executor(
+                loop, partial(
+                    self.vectordb_service.search_by_vector,
+                    query_embedding, k=self.top_k, query=question,
+                    filters=filters, strict=False
+                )
+            )
+        timings["search"] = current.duration
+        
+        with span("format") as current:
+            context = self._format_docs(relevant_docs, question)
+        timings["format"] = current.duration
+        
+        async with self._llm_semaphore():
+            with span("llm", model=settings.CLAUDE_MODEL) as current:
+                message = await self.chain.ainvoke({"context": context, "question": question})
+            timings["llm"] = current.duration
+        
+        answer = self.output_parser.invoke(message)
+        timings["total"] = time.perf_counter() - started
+        
+        return await self._run_in_executor(
+            loop, self._finalize_response,
+            question, answer, relevant_docs, timings, query_embedding,
+            self._record_usage(message)
+        )
+    
+    def _run_in_executor(self, loop, function, *args):
+        """run_in_executor მიმდინარე context-ით - executor-ის thread-ში span-ები იმავე trace-შია"""
+        context = contextvars.copy_context()
+        return loop.run_in_executor(self.executor, partial(context.run, function, *args))
+    
+    @property
+    def executor(self):
+        """embedding/ძებნის thread pool (იქმნება პირველ async გამოძახებაზე ან close()-ის შემდეგ)"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=settings.EMBEDDING_EXECUTOR_WORKERS,
+                    thread_name_prefix="rag-embed"
+                )
+            return self._executor
+    
+    def close(self):
+        """
+        thread pool-ის დახურვა (registry.reload-ისას ჩანაცვლებული სერვისისთვის).
+        მიმდინარე ამოცანები სრულდება; vectordb_service საერთოა და ცალკე იხურება
+        """
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+    
+    async def abatch(self, questions, return_exceptions=False):
+        """
+        რამდენიმე კითხვა ერთდროულად (შედეგები იგივე რიგით)
+        
+        Args:
+            questions: კითხვების სია
+            return_exceptions: True - შეცდომა ბრუნდება შედეგად და batch არ წყდება
+        """
+        return await asyncio.gather(
+            *(self.ask_async(question) for question in questions),
+            return_exceptions=return_exceptions
+        )
+    
+    def ask_many(self, questions, max_concurrency=None):
+        """
+        კითხვების სია ერთი გამოძახებით (ბუღალტრული/back-office სამუშაოებისთვის)
+        
+        ყველა კითხვის embedding ერთი batch-ით, ძებნა ერთი ვექტორიზებული
+        გამოძახებით, იდენტური (კითხვა, კონტექსტი) წყვილებისთვის Claude-ს
+        ერთხელ ვეკითხებით, LLM გამოძახებები კი max_concurrency-ით არის შეზღუდული.
+        
+        Returns:
+            list: პასუხები იგივე რიგით; შეცდომის შემთხვევაში პასუხს აქვს
+            "error" ველი და დანარჩენი კითხვები არ ჩერდება
+        """
+        questions = list(questions)
+        with span("ask_many", questions=len(questions), prompt_type=self.prompt_type):
+            return self._ask_many(questions, max_concurrency)
+    
+    def _ask_many(self, questions, max_concurrency=None):
+        max_concurrency = max_concurrency or self.llm_max_concurrency
+        responses = [None] * len(questions)
+        started = time.perf_counter()
+        timings = {}
+        
+        print(f"\n📋 {len(questions)} კითხვა batch-ად")
+        
+        pending = []
+        for i, question in enumerate(questions):
+            cached = self._cached_response(question, started)
+            if cached is not None:
+                responses[i] = cached
+            else:
+                pending.append(i)
+        
+        embeddings = {}
+        if pending:
+            try:
+                with span("batch_embed", questions=len(pending)) as current:
+                    vectors = self.vectordb_service.embed_queries([questions[i] for i in pending])
+                timings["batch_embed"] = current.duration
+                embeddings = dict(zip(pending, vectors))
+            except Exception as e:
+                for i in pending:
+                    responses[i] = self._error_response(questions[i], e)
+                pending = []
+        
+        remaining = []
+        for i in pending:
+            cached = self._cached_response(questions[i], started, embeddings[i])
+            if cached is not None:
+                responses[i] = cached
+            else:
+                remaining.append(i)
+        pending = remaining
+        
+        documents = {}
+        if pending:
+            try:
+                with span("batch_search", questions=len(pending), k=self.top_k) as current:
+                    results = self.vectordb_service.search_many_by_vector(
+                        [embeddings[i] for i in pending], k=self.top_k,
+                        queries=[questions[i] for i in pending],
+                        filters=[self._question_filters(questions[i]) for i in pending],
+                        strict=False
+                    )
+                timings["batch_search"] = current.duration
+                documents = dict(zip(pending, results))
+            except Exception as e:
+                for i in pending:
+                    responses[i] = self._error_response(questions[i], e)
+                pending = []
         
+        # იდენტური კითხვა + კონტექსტი → ერთი LLM გამოძახება
+        llm_inputs = {}
+        input_keys = {}
+        for i in pending:
+            try:
+                context = self._format_docs(documents[i], questions[i])
+            except Exception as e:
+                responses[i] = self._error_response(questions[i], e)
+                continue
+            key = (AnswerCache.normalize(questions[i]), context)
+            llm_inputs.setdefault(key, {"context": context, "question": questions[i]})
+            input_keys[i] = key
+        pending = [i for i in pending if i in input_keys]
+        
+        if llm_inputs:
+            print(f"🤖 {len(llm_inputs)} უნიკალური გამოძახება Claude-თან (max {max_concurrency} ერთდროულად)...")
+            keys = list(llm_inputs)
+            with span("batch_llm", calls=len(keys), model=settings.CLAUDE_MODEL) as current:
+                answers = self.chain.batch(
+                    [llm_inputs[key] for key in keys],
+                    config={"max_concurrency": max_concurrency},
+                    return_exceptions=True
+                )
+            timings["batch_llm"] = current.duration
+            
+            # usage ერთხელ ითვლება თითო LLM გამოძახებაზე (არა თითო კითხვაზე)
+            results = {}
+            for key, message in zip(keys, answers):
+                if isinstance(message, Exception):
+                    results[key] = (message, None)
+                    continue
+                try:
+                    results[key] = (self.output_parser.invoke(message), self._record_usage(message))
+                except Exception as e:
+                    results[key] = (e, None)
+            
+            for i in pending:
+                answer, usage = results[input_keys[i]]
+                if isinstance(answer, Exception):
+                    responses[i] = self._error_response(questions[i], answer)
+                    continue
+                try:
+                    responses[i] = self._finalize_response(
+                        questions[i], answer, documents[i], dict(timings), embeddings[i], usage
+                    )
+                except Exception as e:
+                    responses[i] = self._error_response(questions[i], e)
+        
+        timings["batch_total"] = time.perf_counter() - started
+        for response in responses:
+            response["timings"]["batch_total"] = timings["batch_total"]
+        
+        failed = sum(1 for response in responses if response.get("error"))
+        print(f"✅ batch დასრულდა: {len(questions) - failed} წარმატებული, {failed} შეცდომა")
+        
+        return responses
+    
+    def _question_filters(self, question):
+        """
+        კითხვიდან ამოცნობილი metadata ფილტრი (მაგ. "დღგ" → {"tax_type": "vat"})
+        
+        ფილტრი მხოლოდ მაშინ, როცა კითხვაში ერთი გადასახადია ნახსენები;
+        ძებნა არამკაცრია - ნაკლები შედეგი ივსება ფილტრის გარეშე.
+        """
+        if not settings.METADATA_FILTER_AUTO:
+            return None
+        tax_type = infer_tax_type(question, unique=True)
+        return {"tax_type": tax_type} if tax_type else None
+    
+    def _error_response(self, question, error):
+        return {
+            "question": question,
+            "answer": None,
+            "sources": [],
+            "timings": {},
+            "cached": False,
+            "error": f"{type(error).__name__}: {error}"
+        }
+    
+    def _llm_semaphore(self):
+        """semaphore თითო event loop-ზე (asyncio.Semaphore loop-ზეა მიბმული)"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._llm_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.llm_max_concurrency)
+            self._llm_semaphores[loop] = semaphore
+        return semaphore
+    
+    def _finalize_response(self, question, answer, docs, timings, query_embedding, usage=None):
+        """პასუხის აწყობა და ქეშში შენახვა"""
         response = {
             "question": question,
             "answer": answer,
-            "sources": []
+            "sources": self._build_sources(docs),
+            "timings": timings,
+            "cached": False,
+            "usage": usage,
+            "prompt_cache": self.get_prompt_cache_stats()
         }
         
-        for doc in relevant_docs:
-            source = doc.metadata.get("source", "უცნობი")
-            if '/' in source or '\\' in source:
-                source = Path(source).name
-            
-            source_info = {
-                "file": source,
-                "page": doc.metadata.get("page", "N/A"),
-                "content_preview": doc.page_content[:200] + "..."
-            }
-            response["sources"].append(source_info)
+        if self.answer_cache is not None:
+            self.answer_cache.set(
+                question, self._cache_namespace(question),
+                {"answer": answer, "sources": response["sources"]},
+                embedding=query_embedding
+            )
         
         return response
     
+    def _record_usage(self, message):
+        """
+        ტოკენების ხარჯი და prompt cache-ის სტატუსი Claude-ის პასუხიდან
+        
+        hit - system prefix წაიკითხა cache-დან; miss - prefix ჩაიწერა
+        cache-ში. prompt_cache - None, თუ prefix cache-ისთვის მოკლეა.
+        """
+        usage = getattr(message, "usage_metadata", None) or {}
+        details = usage.get("input_token_details") or {}
+        raw_usage = (getattr(message, "response_metadata", None) or {}).get("usage") or {}
+        
+        cache_read = details.get("cache_read", raw_usage.get("cache_read_input_tokens")) or 0
+        cache_creation = details.get("cache_creation", raw_usage.get("cache_creation_input_tokens")) or 0
+        status = None
+        if self.prompt_cache_enabled:
+            status = "hit" if cache_read else "miss"
+            with self._stats_lock:
+                self.prompt_cache_stats[status] += 1
+            metrics.inc("rag_prompt_cache_total", result=status)
+            metrics.inc("rag_prompt_cache_tokens_total", cache_read, kind="read")
+            metrics.inc("rag_prompt_cache_tokens_total", cache_creation, kind="creation")
+        
+        return {
+            "input_tokens": usage.get("input_tokens", 0),
+            "output_tokens": usage.get("output_tokens", 0),
+            "cache_read_tokens": cache_read,
+            "cache_creation_tokens": cache_creation,
+            "prompt_cache": status
+        }
+    
+    def get_prompt_cache_stats(self):
+        """prompt cache-ის hit/miss მთვლელები (None - system prompt-ი cache-ისთვის მოკლეა)"""
+        if not self.prompt_cache_enabled:
+            return None
+        with self._stats_lock:
+            return dict(self.prompt_cache_stats)
+    
+    def _cache_namespace(self, question):
+        """
+        პასუხების ქეშის namespace - ინდექსის ვერსია იკითხება ყოველ ძებნაზე,
+        რომ სხვა პროცესის რეინდექსაციის შემდეგ ძველი პასუხები აღარ დაბრუნდეს;
+        კითხვის ფილტრი (tax_type) სხვა გადასახადის პასუხს გამორიცხავს
+        """
+        return AnswerCache.namespace(
+            self.prompt_type, settings.CLAUDE_MODEL, self.vectordb_service.get_index_version(),
+            self._question_filters(question)
+        )
+    
+    def _cached_response(self, question, started, query_embedding=None):
+        """ქეშიდან პასუხი (ზუსტი ან, embedding-ით, სემანტიკური დამთხვევა)"""
+        if self.answer_cache is None:
+            return None
+        
+        cached, match = self.answer_cache.get(question, self._cache_namespace(question), query_embedding)
+        metrics.inc("rag_answer_cache_total", result=match or "miss",
+                    lookup="exact" if query_embedding is None else "semantic")
+        if cached is None:
+            return None
+        
+        print(f"⚡ პასუხი ქეშიდან ({match})")
+        return {
+            "question": question,
+            "answer": cached["answer"],
+            "sources": list(cached["sources"]),
+            "timings": {"total": time.perf_counter() - started},
+            "cached": True,
+            "cache_match": match
+        }
+    
     def print_response(self, response):
         print("\n" + "="*70)
         print("📋 პასუხი:")
@@ -118,6 +605,18 @@ class RAGService:
             print(f"\n{i}. ფაილი: {source['file']}")
             print(f"   გვერდი: {source['page']}")
             print(f"   ამონარიდი: {source['content_preview']}")
+        
+        timings = response.get("timings")
+        if timings:
+            print("\n⏱️ დრო: " + ", ".join(
+                f"{stage}={seconds * 1000:.0f}ms" for stage, seconds in timings.items()
+            ))
+        
+        usage = response.get("usage")
+        if usage:
+            print(f"🧾 ტოკენები: input={usage['input_tokens']}, output={usage['output_tokens']}, "
+                  f"cache read={usage['cache_read_tokens']}, "
+                  f"cache write={usage['cache_creation_tokens']} ({usage['prompt_cache'] or 'off'})")
     
     def get_stats(self):
         db_info = self.vectordb_service.get_database_info()
@@ -127,7 +626,8 @@ class RAGService:
             "prompt_type": self.prompt_type,
             "documents_in_db": db_info.get("documents_count", 0),
             "top_k": settings.TOP_K_RESULTS,
-            "chunk_size": settings.CHUNK_SIZE
+            "chunk_size": settings.CHUNK_SIZE,
+            "prompt_cache": self.get_prompt_cache_stats()
         }
 
 
@@ -154,7 +654,7 @@ if __name__ == "__main__":
             print("\n" + "="*70 + "\n")
         
         print("✅ RAG სისტემა წარმატებით მუშაობს!")
-        
+    
     except Exception as e:
         print(f"❌ შეცდომა: {e}")
         import traceback
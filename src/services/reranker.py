@@ -0,0 +1,84 @@
+"""
+Reranker - კანდიდატების გადაფასება cross-encoder მოდელით
+"""
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import time
+import threading
+
+from config.settings import settings
+from src.core.telemetry import span, metrics
+
+
+class CrossEncoderReranker:
+    """
+    (კითხვა, chunk) წყვილების შეფასება cross-encoder-ით
+    
+    ვექტორული/hybrid ძებნა იღებს RERANK_CANDIDATES კანდიდატს, reranker
+    მათ batch-ებად აფასებს და ტოვებს საუკეთესო k-ს. თუ შეფასება
+    RERANK_LATENCY_BUDGET_MS-ში ვერ ეტევა, ბრუნდება საწყისი რიგი.
+    """
+    
+    def __init__(self, model_name=None, batch_size=None, latency_budget_ms=None, device=None):
+        self.model_name = model_name or settings.RERANK_MODEL
+        self.batch_size = batch_size or settings.RERANK_BATCH_SIZE
+        self.latency_budget_ms = (settings.RERANK_LATENCY_BUDGET_MS
+                                  if latency_budget_ms is None else latency_budget_ms)
+        self.device = device or settings.EMBEDDING_DEVICE
+        self.fallbacks = 0
+        self._model = None
+        self._lock = threading.Lock()
+    
+    @property
+    def model(self):
+        """Lazy load cross-encoder"""
+        with self._lock:
+            if self._model is None:
+                from sentence_transformers import CrossEncoder
+                
+                print(f"🎯 ვტვირთავ reranker-ს: {self.model_name}")
+                self._model = CrossEncoder(self.model_name, device=self.device)
+            return self._model
+    
+    def warm_up(self):
+        """მოდელის ჩატვირთვა პირველ კითხვამდე (ჩატვირთვა ბიუჯეტში არ ითვლება)"""
+        return self.model
+    
+    def rerank(self, query, docs, k):
+        """
+        Args:
+            query: კითხვა
+            docs: კანდიდატები საწყისი (ვექტორული/RRF) რიგით
+            k: რამდენი დარჩეს
+        
+        Returns:
+            list: k საუკეთესო Document
+        """
+        if len(docs) <= 1:
+            return docs[:k]
+        
+        model = self.model
+        budget = self.latency_budget_ms / 1000 if self.latency_budget_ms else None
+        
+        with span("rerank", candidates=len(docs), k=k) as current:
+            started = time.perf_counter()
+            scores = []
+            for start in range(0, len(docs), self.batch_size):
+                batch = docs[start:start + self.batch_size]
+                scores.extend(model.predict(
+                    [(query, doc.page_content) for doc in batch],
+                    batch_size=self.batch_size, show_progress_bar=False
+                ))
+                # ბიუჯეტი ამოიწურა და კანდიდატები ჯერ კიდევ დარჩა - ვექტორული რიგი
+                if budget and len(scores) < len(docs) and time.perf_counter() - started > budget:
+                    self.fallbacks += 1
+                    metrics.inc("rag_rerank_fallback_total")
+                    current.set(fallback=True, scored=len(scores))
+                    return docs[:k]
+            
+            order = sorted(range(len(docs)), key=lambda i: float(scores[i]), reverse=True)
+            current.set(fallback=False)
+            return [docs[i] for i in order[:k]]
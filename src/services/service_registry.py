@@ -0,0 +1,161 @@
+"""
+Service Registry - პროცესის დონის საერთო RAG სერვისები
+"""
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import threading
+
+from config.settings import settings
+
+
+class ServiceRegistry:
+    """
+    ერთი VectorDBService (embedding მოდელი + Chroma) და თითო RAGService
+    prompt ტიპზე, გაზიარებული ყველა Streamlit სესიას შორის.
+    
+    ყველა ოპერაცია lock-ით არის დაცული, ამიტომ ერთდროული სესიები
+    სერვისს მხოლოდ ერთხელ ქმნიან.
+    
+    მძიმე მოდულები (langchain, chromadb, torch, anthropic) იმპორტდება
+    მხოლოდ სერვისების შექმნისას - ჩვეულებრივ warm-up thread-ში, ამიტომ
+    UI-ს პირველი გვერდი მოდელის ჩატვირთვამდე იხატება.
+    """
+    
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._vectordb_service = None
+        self._rag_services = {}
+        self._warmup_thread = None
+        self._building = False
+        self.last_error = None
+        self.warmup_status = None
+    
+    @property
+    def vectordb_service(self):
+        with self._lock:
+            if self._vectordb_service is None:
+                from src.services.vectordb_service import VectorDBService
+                
+                self._vectordb_service = VectorDBService()
+            return self._vectordb_service
+    
+    def database_exists(self):
+        """
+        არსებობს თუ არა ბაზა (lock-ისა და მძიმე იმპორტების გარეშე -
+        UI-ს ყოველ rerun-ზე გამოიძახება, warm-up-ის პარალელურად)
+        """
+        directory = settings.VECTOR_DB_DIR
+        return os.path.isdir(directory) and len(os.listdir(directory)) > 0
+    
+    def ensure_database(self, progress_callback=None):
+        """
+        ბაზის შექმნა თუ ჯერ არ არსებობს
+        
+        Returns:
+            bool: True თუ ბაზა ახლა შეიქმნა
+        """
+        with self._lock:
+            service = self.vectordb_service
+            if service.database_exists():
+                return False
+            self._building = True
+            try:
+                service.create_database(force_recreate=True, progress_callback=progress_callback)
+            finally:
+                self._building = False
+            return True
+    
+    def get_rag_service(self, prompt_type="base"):
+        """საერთო RAGService (პირველ გამოძახებაზე იქმნება)"""
+        # მიმდინარე warm-up-ს ველოდებით, რომ ბაზა/მოდელი ორჯერ არ ჩაიტვირთოს
+        thread = self._warmup_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        
+        with self._lock:
+            service = self._rag_services.get(prompt_type)
+            if service is None:
+                from src.services.rag_service import RAGService
+                
+                service = RAGService(prompt_type=prompt_type,
+                                     vectordb_service=self.vectordb_service)
+                self._rag_services[prompt_type] = service
+            return service
+    
+    def is_ready(self, prompt_type="base"):
+        """სერვისი უკვე შექმნილია?"""
+        return prompt_type in self._rag_services
+    
+    def is_warming_up(self):
+        return self._warmup_thread is not None and self._warmup_thread.is_alive()
+    
+    def is_building(self):
+        """მიმდინარეობს თუ არა ბაზის პირველი აგება (ensure_database)"""
+        return self._building
+    
+    def warm_up(self, prompt_type="base", background=True):
+        """
+        სერვისის წინასწარი ჩატვირთვა (მოდელი, ბაზა, LLM კლიენტი)
+        
+        ბაზა თუ ჯერ არ არსებობს, warm-up არ იწყება - მის შექმნას
+        UI აკეთებს პროგრესის ჩვენებით.
+        
+        UI-ს ყოველ rerun-ზე გამოიძახება, ამიტომ დაწყებული/დასრულებული
+        warm-up-ის ან მიმდინარე აგების დროს lock-ს არ იღებს - სხვაგვარად
+        ყველა სესია დაელოდებოდა ensure_database-ს.
+        """
+        if self.is_ready(prompt_type) or self.is_warming_up() or self.is_building():
+            return
+        with self._lock:
+            if self.is_ready(prompt_type) or self.is_warming_up():
+                return
+            if not self.database_exists():
+                return
+            self.warmup_status = "starting"
+            
+            if not background:
+                self._warm_up(prompt_type)
+                return
+            
+            self._warmup_thread = threading.Thread(
+                target=self._warm_up, args=(prompt_type,),
+                name="rag-warmup", daemon=True
+            )
+            self._warmup_thread.start()
+    
+    def _warm_up(self, prompt_type):
+        try:
+            # ბაზა და embedding მოდელი პარალელურად, შემდეგ LLM კლიენტი
+            self.warmup_status = "vector store + embeddings"
+            self.vectordb_service.warm_up()
+            self.warmup_status = "llm client"
+            self.get_rag_service(prompt_type)
+            self.warmup_status = "ready"
+            self.last_error = None
+        except Exception as e:
+            self.warmup_status = "failed"
+            self.last_error = e
+            print(f"❌ warm-up ვერ შესრულდა: {e}")
+    
+    def reload(self, prompt_type="base"):
+        """ყველა სერვისის თავიდან შექმნა (მაგ. რეინდექსაციის შემდეგ)"""
+        with self._lock:
+            replaced = list(self._rag_services.values())
+            vectordb_service = self._vectordb_service
+            self._rag_services.clear()
+            self._vectordb_service = None
+            self.last_error = None
+        # ძველი სერვისების thread pool-ები აღარ უნდა დარჩეს ყოველ გადატვირთვაზე
+        for service in replaced:
+            service.close()
+        if vectordb_service is not None:
+            vectordb_service.close()
+        self.warm_up(prompt_type)
+
+
+# Global registry instance
+registry = ServiceRegistry()
@@ -0,0 +1,597 @@
+"""
+Vector Stores - ვექტორული ბაზის backend-ები (Chroma / NumPy)
+"""
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import json
+import heapq
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from langchain_core.documents import Document
+
+
+def matches(metadata, filters):
+    """
+    ფილტრის შემოწმება: {"field": value} - ტოლობა, {"field": [a, b]} - ერთ-ერთი
+    """
+    for field, expected in filters.items():
+        value = metadata.get(field)
+        if isinstance(expected, (list, tuple, set)):
+            if value not in expected:
+                return False
+        elif value != expected:
+            return False
+    return True
+
+
+class ChromaStore:
+    """Chroma კოლექცია (SQLite + HNSW)"""
+    
+    name = "chroma"
+    
+    def __init__(self, persist_directory, collection_name, embedding_function=None):
+        self.persist_directory = Path(persist_directory)
+        self.collection_name = collection_name
+        self.embedding_function = embedding_function
+        from langchain_community.vectorstores import Chroma  # chromadb - lazy import
+        
+        self.vectorstore = Chroma(
+            persist_directory=str(self.persist_directory),
+            embedding_function=embedding_function,
+            collection_name=collection_name
+        )
+        self._collection = self.vectorstore._collection
+        self._filter_ids = {}
+    
+    def count(self):
+        return self._collection.count()
+    
+    def add(self, ids, texts, metadatas, embeddings):
+        """chunks-ის ჩაწერა უკვე გამოთვლილი embeddings-ით"""
+        self._filter_ids = {}
+        self._collection.upsert(
+            ids=list(ids), embeddings=[list(map(float, e)) for e in embeddings],
+            documents=list(texts), metadatas=[metadata or None for metadata in metadatas]
+        )
+    
+    def delete(self, ids):
+        self._filter_ids = {}
+        self._collection.delete(ids=list(ids))
+    
+    def search(self, embedding, k, filters=None):
+        """
+        Returns:
+            list: [(chunk_id, Document, score), ...] - score = cosine (ნორმალიზებული ვექტორებისთვის)
+        """
+        k = min(k, self.count())
+        if k == 0:
+            return []
+        result = self._collection.query(
+            query_embeddings=[list(map(float, embedding))], n_results=k,
+            where=self._where(filters), include=["documents", "metadatas", "distances"]
+        )
+        # Chroma აბრუნებს L2²-ს; ერთეულოვანი ვექტორებისთვის cos = 1 - d/2
+        return [
+            (chunk_id, Document(page_content=text, metadata=metadata or {}), 1.0 - distance / 2.0)
+            for chunk_id, text, metadata, distance in zip(
+                result["ids"][0], result["documents"][0],
+                result["metadatas"][0], result["distances"][0]
+            )
+        ]
+    
+    def search_many(self, embeddings, k, filters=None):
+        """რამდენიმე კითხვის ძებნა ერთი query-ით (filters → Chroma where)"""
+        k = min(k, self.count())
+        if k == 0 or len(embeddings) == 0:
+            return [[] for _ in embeddings]
+        result = self._collection.query(
+            query_embeddings=[list(map(float, e)) for e in embeddings], n_results=k,
+            where=self._where(filters), include=["documents", "metadatas", "distances"]
+        )
+        return [
+            [
+                (chunk_id, Document(page_content=text, metadata=metadata or {}), 1.0 - distance / 2.0)
+                for chunk_id, text, metadata, distance in zip(ids, texts, metadatas, distances)
+            ]
+            for ids, texts, metadatas, distances in zip(
+                result["ids"], result["documents"], result["metadatas"], result["distances"]
+            )
+        ]
+    
+    def get(self, ids):
+        """chunks ID-ებით: {chunk_id: Document}"""
+        result = self._collection.get(ids=list(ids), include=["documents", "metadatas"])
+        return {
+            chunk_id: Document(page_content=text, metadata=metadata or {})
+            for chunk_id, text, metadata in zip(
+                result["ids"], result["documents"], result["metadatas"]
+            )
+        }
+    
+    def all_texts(self):
+        """ყველა chunk: (ids, texts)"""
+        result = self._collection.get(include=["documents"])
+        return result["ids"], result["documents"]
+    
+    def filter_ids(self, filters):
+        """
+        ფილტრის შესაბამისი chunk ID-ები (BM25-ის შესაზღუდად)
+        
+        ქეშირდება ფილტრის მიხედვით კოლექციის შემდეგ ცვლილებამდე (სხვა
+        პროცესისა - refresh-ით) - ყოველ კითხვაზე სრული where-სკანი აღარ სრულდება
+        """
+        key = json.dumps(filters, sort_keys=True, ensure_ascii=False, default=list)
+        ids = self._filter_ids.get(key)
+        if ids is None:
+            ids = frozenset(self._collection.get(where=self._where(filters), include=[])["ids"])
+            self._filter_ids[key] = ids
+        return ids
+    
+    @staticmethod
+    def _where(filters):
+        """{"tax_type": "vat", "article": ["1", "2"]} → Chroma where"""
+        if not filters:
+            return None
+        clauses = [
+            {field: {"$in": list(value)}} if isinstance(value, (list, tuple, set)) else {field: value}
+            for field, value in filters.items()
+        ]
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+    
+    def clear(self):
+        """
+        ყველა chunk-ის წაშლა: კოლექცია იშლება და თავიდან იქმნება იმავე
+        client-ით (ცარიელ კოლექციას ვექტორის განზომილება აღარ აქვს)
+        """
+        from langchain_community.vectorstores import Chroma
+        
+        client = self.vectorstore._client
+        self.vectorstore.delete_collection()
+        self.vectorstore = Chroma(
+            client=client,
+            embedding_function=self.embedding_function,
+            collection_name=self.collection_name
+        )
+        self._collection = self.vectorstore._collection
+        self._filter_ids = {}
+    
+    def drop(self):
+        """
+        კოლექციის წაშლა client-ით. საქაღალდე არ იშლება - Chroma client-ი
+        გზის მიხედვით ქეშირდება და ღია რჩება (rmtree მის SQLite/HNSW
+        ფაილებს ქვეშ გამოაცლიდა); იმავე გზაზე ახალი store ცარიელ კოლექციას ქმნის
+        """
+        self._filter_ids = {}
+        self.vectorstore.delete_collection()
+    
+    def close(self):
+        """Chroma-ს client-ი პროცესის დონეზე ქეშირდება - დასახური რესურსი არ აქვს"""
+    
+    def persist(self):
+        """Chroma ცვლილებებს თავად ინახავს"""
+        self._filter_ids = {}
+    
+    def refresh(self):
+        """სხვა პროცესის ცვლილების შემდეგ: ძებნა კოლექციას პირდაპირ კითხულობს, ქეშირებულია მხოლოდ ფილტრები"""
+        self._filter_ids = {}
+
+
+class NumpyStore:
+    """
+    Brute-force ვექტორული ინდექსი memory-mapped .npy ფაილზე
+    
+    embeddings.npy - ნორმალიზებული float32 მატრიცა (N × D), იტვირთება
+    mmap-ით და პრაქტიკულად მყისიერად. chunks.json - ID-ები, ტექსტი და
+    metadata იმავე რიგით. ძებნა არის ერთი matmul + argpartition.
+    
+    ცვლილებები (add/delete) მეხსიერებაში გროვდება და დისკზე persist()-ით
+    იწერება; ძებნა ხედავს მხოლოდ შენახულ მდგომარეობას.
+    """
+    
+    name = "numpy"
+    
+    def __init__(self, persist_directory, collection_name, embedding_function=None):
+        self.directory = Path(persist_directory) / "numpy" / collection_name
+        self.collection_name = collection_name
+        self.matrix_path = self.directory / "embeddings.npy"
+        self.chunks_path = self.directory / "chunks.json"
+        self._matrix = None
+        self._ids = []
+        self._texts = []
+        self._metadatas = []
+        self._positions = {}
+        self._pending = {}
+        self._deleted = set()
+        self._filter_rows = {}
+        self._load()
+    
+    def count(self):
+        return len(self._ids) - len(self._deleted) + len(self._pending)
+    
+    def add(self, ids, texts, metadatas, embeddings):
+        """chunks-ის დამატება (ან ჩანაცვლება) - ჩაიწერება persist()-ზე"""
+        for chunk_id, text, metadata, embedding in zip(ids, texts, metadatas, embeddings):
+            if chunk_id in self._positions:
+                self._deleted.add(chunk_id)
+            self._pending[chunk_id] = (text, metadata or {}, np.asarray(embedding, dtype=np.float32))
+    
+    def delete(self, ids):
+        for chunk_id in ids:
+            self._pending.pop(chunk_id, None)
+            if chunk_id in self._positions:
+                self._deleted.add(chunk_id)
+    
+    def search(self, embedding, k, filters=None):
+        """
+        Returns:
+            list: [(chunk_id, Document, score), ...] - score = cosine
+        """
+        return self.search_many([embedding], k, filters)[0]
+    
+    def search_many(self, embeddings, k, filters=None):
+        """
+        რამდენიმე კითხვის ძებნა ერთი matmul-ით (Q × Mᵀ)
+        
+        ფილტრისას: ვიწრო ფილტრი - matmul მხოლოდ შესაბამის სტრიქონებზე
+        (მცირე ასლი); ფართო (ნახევარზე მეტი) - matmul მთელ mmap-ზე და
+        შესაბამისი სვეტები ქულებიდან, რომ ყოველ კითხვაზე მატრიცის თითქმის
+        სრული ასლი არ შეიქმნას.
+        """
+        if self._matrix is None or len(self._ids) == 0:
+            return [[] for _ in embeddings]
+        
+        rows = self._rows(filters) if filters else None
+        if rows is not None and len(rows) == 0:
+            return [[] for _ in embeddings]
+        
+        queries = self._normalize(np.asarray(embeddings, dtype=np.float32))
+        if rows is None:
+            scores = queries @ self._matrix.T
+        elif 2 * len(rows) > len(self._ids):
+            scores = (queries @ self._matrix.T)[:, rows]
+        else:
+            scores = queries @ self._matrix[rows].T
+        positions = rows if rows is not None else np.arange(len(self._ids))
+        return [
+            [(self._ids[positions[i]], self._document(positions[i]), float(row[i]))
+             for i in self._top_k(row, k)]
+            for row in scores
+        ]
+    
+    def filter_ids(self, filters):
+        """ფილტრის შესაბამისი chunk ID-ები (BM25-ის შესაზღუდად)"""
+        return {self._ids[i] for i in self._rows(filters)}
+    
+    def _rows(self, filters):
+        """ფილტრის შესაბამისი სტრიქონები (ქეშირდება შემდეგ persist()-მდე)"""
+        key = json.dumps(filters, sort_keys=True, ensure_ascii=False, default=list)
+        rows = self._filter_rows.get(key)
+        if rows is None:
+            rows = np.array([i for i, metadata in enumerate(self._metadatas)
+                             if matches(metadata, filters)], dtype=np.int64)
+            self._filter_rows[key] = rows
+        return rows
+    
+    def get(self, ids):
+        """chunks ID-ებით: {chunk_id: Document}"""
+        return {chunk_id: self._document(self._positions[chunk_id])
+                for chunk_id in ids if chunk_id in self._positions}
+    
+    def all_texts(self):
+        """ყველა chunk: (ids, texts)"""
+        return list(self._ids), list(self._texts)
+    
+    def drop(self):
+        """store-ის წაშლა დისკიდან (ღია ფაილი მხოლოდ mmap-ია, რომელიც აქვე იხურება)"""
+        self._matrix = None
+        self._ids, self._texts, self._metadatas, self._positions = [], [], [], {}
+        self._filter_rows = {}
+        self._pending.clear()
+        self._deleted.clear()
+        if self.directory.exists():
+            shutil.rmtree(self.directory)
+    
+    def clear(self):
+        """ყველა chunk-ის წაშლა (ახალი ვექტორები შეიძლება სხვა განზომილების იყოს)"""
+        self._pending.clear()
+        self._deleted = set(self._ids)
+        self.persist()
+    
+    def close(self):
+        """mmap რჩება - მიმდინარე ძებნები ძველ store-ს ჯერ კიდევ შეიძლება იყენებდნენ"""
+    
+    def refresh(self):
+        """სხვა პროცესის ცვლილების შემდეგ ფაილების ხელახლა ჩატვირთვა (ჩაუწერელი ცვლილებებისას - არა)"""
+        if self._pending or self._deleted:
+            return
+        self._matrix = None
+        self._ids, self._texts, self._metadatas, self._positions = [], [], [], {}
+        self._filter_rows = {}
+        self._load()
+    
+    def persist(self):
+        """ცვლილებების ჩაწერა: ახალი .npy იწერება ნაწილ-ნაწილ და ანაცვლებს ძველს"""
+        if not self._pending and not self._deleted:
+            return
+        
+        keep = [i for i, chunk_id in enumerate(self._ids) if chunk_id not in self._deleted]
+        pending = list(self._pending.items())
+        # ახალი ვექტორების განზომილება (clear()-ის შემდეგ შეიძლება განსხვავდებოდეს)
+        dimension = (len(pending[0][1][2]) if pending
+                     else self._matrix.shape[1] if self._matrix is not None else 0)
+        if keep and self._matrix.shape[1] != dimension:
+            raise ValueError(f"❌ ვექტორის განზომილება {dimension} არ ემთხვევა ბაზისას "
+                             f"({self._matrix.shape[1]}) - ჯერ clear()")
+        total = len(keep) + len(pending)
+        
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if total == 0:
+            self._matrix = None
+            for path in (self.matrix_path, self.chunks_path):
+                if path.exists():
+                    path.unlink()
+            self._ids, self._texts, self._metadatas, self._positions = [], [], [], {}
+            self._filter_rows = {}
+            self._pending.clear()
+            self._deleted.clear()
+            return
+        
+        tmp_matrix = self.directory / "embeddings.tmp.npy"
+        matrix = np.lib.format.open_memmap(tmp_matrix, mode="w+", dtype=np.float32,
+                                           shape=(total, dimension))
+        for start in range(0, len(keep), 4096):
+            rows = keep[start:start + 4096]
+            matrix[start:start + len(rows)] = self._matrix[rows]
+        for offset, (_, (_, _, embedding)) in enumerate(pending, len(keep)):
+            matrix[offset] = self._normalize(embedding)
+        matrix.flush()
+        del matrix
+        
+        chunks = {
+            "ids": [self._ids[i] for i in keep] + [chunk_id for chunk_id, _ in pending],
+            "texts": [self._texts[i] for i in keep] + [text for _, (text, _, _) in pending],
+            "metadatas": [self._metadatas[i] for i in keep] + [metadata for _, (_, metadata, _) in pending]
+        }
+        tmp_chunks = self.chunks_path.with_suffix(".tmp")
+        with open(tmp_chunks, 'w', encoding='utf-8') as f:
+            json.dump(chunks, f, ensure_ascii=False)
+        
+        # ძველი mmap უნდა დაიხუროს ფაილის ჩანაცვლებამდე
+        self._matrix = None
+        os.replace(tmp_matrix, self.matrix_path)
+        os.replace(tmp_chunks, self.chunks_path)
+        
+        self._pending.clear()
+        self._deleted.clear()
+        self._load()
+    
+    def _load(self):
+        if not (self.matrix_path.exists() and self.chunks_path.exists()):
+            return
+        with open(self.chunks_path, 'r', encoding='utf-8') as f:
+            chunks = json.load(f)
+        self._ids = chunks["ids"]
+        self._texts = chunks["texts"]
+        self._metadatas = chunks["metadatas"]
+        self._positions = {chunk_id: i for i, chunk_id in enumerate(self._ids)}
+        self._filter_rows = {}
+        self._matrix = np.load(self.matrix_path, mmap_mode="r")
+    
+    def _document(self, position):
+        return Document(page_content=self._texts[position],
+                        metadata=dict(self._metadatas[position]))
+    
+    @staticmethod
+    def _top_k(scores, k):
+        """k საუკეთესო ინდექსი კლებადობით (argpartition + მცირე sort)"""
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.argsort(-scores[top])].tolist()
+    
+    @staticmethod
+    def _normalize(vector):
+        norm = np.linalg.norm(vector, axis=-1, keepdims=True)
+        return vector / np.maximum(norm, 1e-12)
+
+
+# shard-ის გასაღები: (metadata ველი, მნიშვნელობა → shard-ის სახელი)
+SHARD_KEYS = {
+    "year": ("issue_date", lambda value: str(value)[:4]),
+    "tax_type": ("tax_type", str),
+}
+# chunk, რომელსაც shard-ის ველი არ აქვს
+DEFAULT_SHARD = "other"
+
+
+class ShardedStore:
+    """
+    რამდენიმე store (shard) ერთი ინტერფეისით
+    
+    chunk იწერება metadata-ს მიხედვით არჩეულ shard-ში (მაგ. issue_date-ის
+    წელი ან tax_type). ძებნა ეგზავნება მხოლოდ ფილტრის შესაბამის
+    shard-ებს (ფილტრის გარეშე - ყველას) პარალელურ thread-ებში, შედეგები
+    ერთიანდება score-ით. თითო shard ცალკე საქაღალდეა
+    (persist_directory/shards/<shard>), ამიტომ მისი წაშლა და თავიდან
+    აგება დანარჩენებს არ ეხება.
+    """
+    
+    def __init__(self, backend, persist_directory, collection_name, shard_by, workers=4):
+        if shard_by not in SHARD_KEYS:
+            raise ValueError(f"უცნობი shard-ის გასაღები: {shard_by} ({', '.join(SHARD_KEYS)})")
+        self.name = backend
+        self.backend = backend
+        self.directory = Path(persist_directory) / "shards"
+        self.collection_name = collection_name
+        self.shard_by = shard_by
+        self.field, self._shard_name = SHARD_KEYS[shard_by]
+        self.workers = workers
+        self._executor = None
+        self._stores = {}
+        if self.directory.exists():
+            for path in sorted(self.directory.iterdir()):
+                # წაშლილი Chroma shard-ის საქაღალდე რჩება (იხ. drop_shard) - ცარიელი არ ჩაითვლება
+                if path.is_dir() and self._open(path.name).count() == 0:
+                    self._stores.pop(path.name)
+    
+    def _open(self, shard):
+        store = self._stores.get(shard)
+        if store is None:
+            store = create_vector_store(self.backend, self.directory / shard, self.collection_name)
+            self._stores[shard] = store
+        return store
+    
+    def shard_for(self, metadata):
+        """chunk-ის shard metadata-დან"""
+        value = (metadata or {}).get(self.field)
+        return self._shard_name(value) if value else DEFAULT_SHARD
+    
+    def route(self, filters):
+        """shard-ები, რომლებშიც ფილტრის შესაბამისი chunks შეიძლება იყოს"""
+        expected = (filters or {}).get(self.field)
+        if expected is None:
+            return list(self._stores)
+        values = expected if isinstance(expected, (list, tuple, set)) else [expected]
+        shards = {self._shard_name(value) for value in values}
+        return [shard for shard in self._stores if shard in shards]
+    
+    def shards(self):
+        """{shard: chunks-ის რაოდენობა}"""
+        return {shard: store.count() for shard, store in self._stores.items()}
+    
+    def drop_shard(self, shard):
+        """
+        shard-ის სრული წაშლა store-ის საშუალებით: Chroma - კოლექცია
+        client-ით, numpy - ფაილები. საქაღალდე rmtree-ით მხოლოდ numpy-სთვის
+        იშლება - Chroma-ს ღია client-ს ფაილებს ქვეშ არ გამოვაცლით
+        """
+        store = self._stores.pop(shard, None)
+        if store is not None:
+            store.drop()
+        path = self.directory / shard
+        if self.backend != ChromaStore.name and path.exists():
+            shutil.rmtree(path)
+    
+    def clear(self):
+        """ყველა shard-ის წაშლა"""
+        for shard in list(self._stores):
+            self.drop_shard(shard)
+    
+    def count(self):
+        return sum(store.count() for store in self._stores.values())
+    
+    def add(self, ids, texts, metadatas, embeddings):
+        """chunks-ის ჩაწერა shard-ების მიხედვით"""
+        groups = {}
+        for row in zip(ids, texts, metadatas, embeddings):
+            groups.setdefault(self.shard_for(row[2]), []).append(row)
+        
+        for shard, rows in groups.items():
+            # metadata-ს შეცვლისას chunk შეიძლება სხვა shard-ში გადავიდეს
+            moved = [row[0] for row in rows]
+            for other, store in self._stores.items():
+                if other != shard:
+                    store.delete(moved)
+            self._open(shard).add(*(list(column) for column in zip(*rows)))
+    
+    def delete(self, ids):
+        for store in self._stores.values():
+            store.delete(ids)
+    
+    def search(self, embedding, k, filters=None):
+        return self.search_many([embedding], k, filters)[0]
+    
+    def search_many(self, embeddings, k, filters=None):
+        """
+        fan-out: თითო shard-იდან k საუკეთესო, შემდეგ საერთო top-k score-ით
+        """
+        shards = self.route(filters)
+        if not shards:
+            return [[] for _ in embeddings]
+        
+        def search_shard(shard):
+            return self._stores[shard].search_many(embeddings, k, filters)
+        
+        if len(shards) == 1:
+            per_shard = [search_shard(shards[0])]
+        else:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix="shard-search")
+            per_shard = list(self._executor.map(search_shard, shards))
+        
+        return [
+            heapq.nlargest(k, (hit for hits in shard_hits for hit in hits), key=lambda hit: hit[2])
+            for shard_hits in zip(*per_shard)
+        ]
+    
+    def filter_ids(self, filters):
+        ids = set()
+        for shard in self.route(filters):
+            ids |= self._stores[shard].filter_ids(filters)
+        return ids
+    
+    def get(self, ids):
+        documents = {}
+        for store in self._stores.values():
+            missing = [chunk_id for chunk_id in ids if chunk_id not in documents]
+            if not missing:
+                break
+            documents.update(store.get(missing))
+        return documents
+    
+    def all_texts(self):
+        ids, texts = [], []
+        for store in self._stores.values():
+            shard_ids, shard_texts = store.all_texts()
+            ids.extend(shard_ids)
+            texts.extend(shard_texts)
+        return ids, texts
+    
+    def close(self):
+        """fan-out ძებნის thread pool-ის დახურვა (შემდეგი ძებნა ახალს შექმნის)"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        for store in self._stores.values():
+            store.close()
+    
+    def persist(self):
+        for store in self._stores.values():
+            store.persist()
+    
+    def refresh(self):
+        """სხვა პროცესის ცვლილების შემდეგ: ახალი shard-ები იხსნება, არსებულები ახლდება"""
+        if self.directory.exists():
+            for path in sorted(self.directory.iterdir()):
+                if path.is_dir() and path.name not in self._stores:
+                    self._open(path.name)
+        for store in self._stores.values():
+            store.refresh()
+
+
+BACKENDS = {
+    ChromaStore.name: ChromaStore,
+    NumpyStore.name: NumpyStore,
+}
+
+
+def create_vector_store(backend, persist_directory, collection_name, embedding_function=None,
+                        shard_by=None, shard_workers=4):
+    """
+    backend-ის შექმნა სახელით (settings.VECTOR_STORE_BACKEND)
+    
+    shard_by ("year" / "tax_type") - ShardedStore იმავე backend-ის shard-ებით
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"უცნობი vector store backend: {backend} ({', '.join(BACKENDS)})")
+    if shard_by:
+        return ShardedStore(backend, persist_directory, collection_name, shard_by, shard_workers)
+    return BACKENDS[backend](persist_directory, collection_name, embedding_function)
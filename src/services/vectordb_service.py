@@ -6,43 +6,121 @@ from pathlib import Path
 project_root = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_community.vectorstores import Chroma
 from config.settings import settings
 from src.services.document_service import DocumentService
+from src.services.embedding_cache import CachedEmbeddings
+from src.services.bm25_index import BM25Index, reciprocal_rank_fusion
+from src.services.vector_stores import create_vector_store
+from src.services.reranker import CrossEncoderReranker
+from src.core.telemetry import span
 import os
+import json
 import shutil
+import hashlib
+import uuid
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+
+def _batched(iterable, size):
+    """იტერატორის დაყოფა ფიქსირებული ზომის ნაწილებად"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def embedding_cache_key(backend=None, model_name=None):
+    """embedding ქეშის გასაღების პრეფიქსი (ONNX/int8 ვექტორები torch-ისგან ოდნავ განსხვავდება)"""
+    backend = backend or settings.EMBEDDING_BACKEND
+    model_name = model_name or settings.EMBEDDING_MODEL
+    if backend == "onnx":
+        return f"{model_name}|{'onnx-int8' if settings.ONNX_QUANTIZE else 'onnx'}"
+    return model_name
+
+
+def create_embeddings(backend=None, model_name=None, device=None):
+    """embedding მოდელის შექმნა (ქეშის გარეშე) - სერვისისთვის და embedding worker-ებისთვის"""
+    backend = backend or settings.EMBEDDING_BACKEND
+    model_name = model_name or settings.EMBEDDING_MODEL
+    if backend == "onnx":
+        from src.services.onnx_embeddings import OnnxEmbeddings
+        return OnnxEmbeddings(model_name=model_name)
+    if backend == "torch":
+        # sentence-transformers/torch იმპორტი მძიმეა - მხოლოდ პირველ გამოყენებაზე
+        from langchain_community.embeddings import HuggingFaceEmbeddings
+        return HuggingFaceEmbeddings(
+            model_name=model_name,
+            model_kwargs={'device': device or settings.EMBEDDING_DEVICE}
+        )
+    raise ValueError(f"უცნობი embedding backend: {backend}")
 
 
 class VectorDBService:
     """Vector Database მენეჯმენტი"""
     
-    def __init__(self):
-        self.persist_directory = settings.VECTOR_DB_DIR
-        self.collection_name = settings.COLLECTION_NAME
+    def __init__(self, persist_directory=None, collection_name=None, backend=None):
+        self.persist_directory = Path(persist_directory or settings.VECTOR_DB_DIR)
+        self.collection_name = collection_name or settings.COLLECTION_NAME
+        self.backend = backend or settings.VECTOR_STORE_BACKEND
+        self.shard_by = settings.SHARD_BY
         self.embedding_model = settings.EMBEDDING_MODEL
         self.embedding_device = settings.EMBEDDING_DEVICE
+        self.embedding_backend = settings.EMBEDDING_BACKEND
+        self.embedding_workers = settings.EMBEDDING_WORKERS
+        self.manifest_path = self.persist_directory / "manifest.json"
+        self.batch_size = settings.EMBEDDING_BATCH_SIZE
+        self.hybrid_search = settings.HYBRID_SEARCH_ENABLED
+        self.lexical_index_path = self.persist_directory / "bm25_index.json"
         self._embeddings = None
         self._vectordb = None
+        self._lexical_index = None
+        self._info_cache = None
+        self._version_cache = None
+        self._seen_version = None
+        self.reranker = CrossEncoderReranker() if settings.RERANK_ENABLED else None
     
     @property
     def embeddings(self):
         """Lazy load embeddings"""
         if self._embeddings is None:
-            print("🧮 ვქმნი embeddings...")
-            self._embeddings = HuggingFaceEmbeddings(
-                model_name=self.embedding_model,
-                model_kwargs={'device': self.embedding_device}
+            print(f"🧮 ვქმნი embeddings ({self.embedding_backend})...")
+            embeddings = create_embeddings(
+                self.embedding_backend, self.embedding_model, self.embedding_device
             )
+            # იგივე ტექსტი (კითხვა თუ chunk) ხელახლა აღარ გამოითვლება
+            if settings.EMBEDDING_CACHE_ENABLED:
+                embeddings = CachedEmbeddings(
+                    embeddings, embedding_cache_key(self.embedding_backend, self.embedding_model)
+                )
+            self._embeddings = embeddings
         return self._embeddings
     
-    def create_database(self, documents=None, force_recreate=False):
+    @property
+    def lexical_index(self):
+        """BM25 ინდექსი (თუ ფაილი არ არსებობს, აიგება კოლექციიდან)"""
+        if self._lexical_index is None:
+            index = BM25Index(self.lexical_index_path)
+            if index.exists():
+                index.load()
+            elif self._vectordb is not None and self._vectordb.count() > 0:
+                print("🔤 ვაგებ BM25 ინდექსს არსებული ბაზიდან...")
+                index.add(*self._vectordb.all_texts())
+                index.save()
+            self._lexical_index = index
+        return self._lexical_index
+    
+    def create_database(self, documents=None, force_recreate=False, progress_callback=None):
         """
         ვექტორული ბაზის შექმნა
         
         Args:
             documents: დოკუმენტები (თუ None, ჩაიტვირთება)
             force_recreate: თუ True, წაშლის ძველ ბაზას
+            progress_callback: callback(done, total, message) პროგრესისთვის
         """
         print("🔧 ვქმნი ვექტორულ ბაზას...")
         
@@ -50,30 +128,507 @@ class VectorDBService:
         if force_recreate and os.path.exists(self.persist_directory):
             print(f"🗑️ ვშლი ძველ ბაზას...")
             shutil.rmtree(self.persist_directory)
+            self._vectordb = None
+            self._lexical_index = None
+            self._info_cache = None
         
-        # ჩავტვირთოთ დოკუმენტები თუ არ არის
+        # საქაღალდიდან აწყობა ხდება sync-ით, რომ manifest-იც შეიქმნას
         if documents is None:
-            doc_service = DocumentService()
-            documents = doc_service.load_documents()
+            stats = self.sync_database(progress_callback=progress_callback)
+            if self._vectordb.count() == 0:
+                raise ValueError("❌ დოკუმენტები ცარიელია!")
+            print(f"✅ ბაზა შეიქმნა: {self.persist_directory}")
+            print(f"📊 დოკუმენტები: {stats['total_chunks']}")
+            return self._vectordb
         
         if len(documents) == 0:
             raise ValueError("❌ დოკუმენტები ცარიელია!")
         
         print(f"📊 ვქმნი ვექტორულ ბაზას {len(documents)} დოკუმენტიდან...")
         
-        # ვქმნით ბაზას
-        self._vectordb = Chroma.from_documents(
-            documents=documents,
-            embedding=self.embeddings,
-            persist_directory=str(self.persist_directory),
-            collection_name=self.collection_name
-        )
+        # წინა sync-ის ფაილების კატალოგი ნარჩუნდება, თუ ბაზა იგივე პარამეტრებით არის აგებული
+        manifest = self._load_manifest()
+        embedding_key = embedding_cache_key(self.embedding_backend, self.embedding_model)
+        self._reconcile_manifest(manifest, embedding_key)
+        
+        # ვქმნით ბაზას (batch-ებად)
+        self._open_collection()
+        chunk_ids = self._chunk_ids("", documents)
+        embedder = self._parallel_embedder()
+        try:
+            self._add_in_batches(documents, chunk_ids,
+                                 progress_callback=progress_callback, embedder=embedder)
+        finally:
+            if embedder is not None:
+                embedder.close()
+        self._persist()
+        
+        # ხელით გადაცემული დოკუმენტები ფაილებს ვერ დაუკავშირდება - მათი chunk ID-ები
+        # ცალკე ინახება (manifest["manual"]), რომ შემდეგმა sync-მა წაშალოს. ემატება
+        # ახალი ვერსია (პასუხების ქეშის namespace-ისთვის) და აგების პარამეტრები;
+        # chunking-ი ფაილების კატალოგს ეკუთვნის, ამიტომ არსებული არ იცვლება
+        manual = manifest.setdefault("manual", {"chunk_ids": []})
+        manual["chunk_ids"] = list(dict.fromkeys(manual["chunk_ids"] + chunk_ids))
+        self._bump_version(manifest)
+        manifest["embedding_model"] = self.embedding_model
+        manifest["embedding_key"] = embedding_key
+        manifest["backend"] = self.backend
+        manifest["shard_by"] = self.shard_by
+        if "chunking" not in manifest:
+            manifest["chunking"] = (f"recursive/{settings.CHUNK_SIZE}/{settings.CHUNK_OVERLAP}"
+                                    if manifest["files"] else DocumentService().chunking)
+        self._save_manifest(manifest)
         
         print(f"✅ ბაზა შეიქმნა: {self.persist_directory}")
-        print(f"📊 დოკუმენტები: {self._vectordb._collection.count()}")
+        print(f"📊 დოკუმენტები: {self._vectordb.count()}")
+        
+        return self._vectordb
+    
+    def sync_database(self, directory_path=None, progress_callback=None):
+        """
+        ინკრემენტული სინქრონიზაცია დოკუმენტების საქაღალდესთან
+        
+        მხოლოდ ახალი/შეცვლილი ფაილების chunks იქმნება და ემატება,
+        წაშლილი ფაილების chunks იშლება ბაზიდან. ფაილები მუშავდება
+        ნაკადად (გვერდები → chunks → batch-ები), ამიტომ მეხსიერებაში
+        ერთდროულად მხოლოდ რამდენიმე ფაილია და არა მთელი კორპუსი.
+        
+        Args:
+            directory_path: საქაღალდის გზა (None = default)
+            progress_callback: callback(done, total, message) - ფაილების მიხედვით
+        
+        Returns:
+            dict: სინქრონიზაციის სტატისტიკა
+        """
+        doc_service = DocumentService()
+        if directory_path is None:
+            directory_path = doc_service.documents_dir
+        
+        print(f"🔄 ვასინქრონებ ბაზას: {directory_path}")
+        
+        manifest = self._load_manifest()
+        embedding_key = embedding_cache_key(self.embedding_backend, self.embedding_model)
+        self._reconcile_manifest(manifest, embedding_key)
+        files = manifest["files"]
+        # სხვა პარამეტრებით დაყოფილი ფაილები თავიდან იყოფა (ძველი chunks იშლება)
+        legacy_chunking = f"recursive/{settings.CHUNK_SIZE}/{settings.CHUNK_OVERLAP}"
+        rechunk = manifest.get("chunking", legacy_chunking) != doc_service.chunking
+        if rechunk and files:
+            print(f"✂️ დაყოფის პარამეტრები შეიცვალა ({doc_service.chunking}) - ყველა ფაილი თავიდან იყოფა")
+        
+        current = {}
+        for file_path in doc_service.list_pdf_files(directory_path):
+            relative = file_path.relative_to(directory_path).as_posix()
+            current[relative] = file_path
+        
+        self._open_collection()
+        
+        stats = {"added": 0, "deleted": 0, "unchanged_files": 0,
+                 "changed_files": 0, "removed_files": 0}
+        
+        # create_database(documents=...)-ით დამატებული chunks საქაღალდეს არ ეკუთვნის
+        manual = manifest.pop("manual", None)
+        if manual and manual["chunk_ids"]:
+            self._delete_chunks(manual["chunk_ids"])
+            stats["deleted"] += len(manual["chunk_ids"])
+            print(f"🗑️ წაიშალა ხელით დამატებული {len(manual['chunk_ids'])} chunk")
+        
+        # წაშლილი ფაილები
+        for relative in sorted(set(files) - set(current)):
+            stale_ids = files.pop(relative)["chunk_ids"]
+            self._delete_chunks(stale_ids)
+            stats["deleted"] += len(stale_ids)
+            stats["removed_files"] += 1
+            print(f"🗑️ წაიშალა: {relative} ({len(stale_ids)} chunk)")
+        
+        # ახალი და შეცვლილი ფაილები
+        changed = {}
+        for relative, file_path in current.items():
+            file_hash = doc_service.file_hash(file_path)
+            entry = files.get(relative)
+            if entry and entry["hash"] == file_hash and not rechunk:
+                stats["unchanged_files"] += 1
+                continue
+            changed[file_path] = (relative, file_hash)
+        
+        total_files = len(current)
+        done_files = stats["unchanged_files"]
+        self._report(progress_callback, done_files, total_files,
+                     f"{done_files} ფაილი უცვლელია, ვამუშავებ {len(changed)} ფაილს...")
+        
+        # EMBEDDING_WORKERS > 1: embedding პროცესების pool
+        embedder = self._parallel_embedder()
+        pending_chunks, pending_ids = [], []
+        # hash-ები უკვე გამოთვლილია - page cache-მა ფაილები მეორედ აღარ წაიკითხოს
+        known_hashes = {file_path: file_hash for file_path, (_, file_hash) in changed.items()}
+        try:
+            for file_path, pages, error in doc_service.iter_file_pages(changed, hashes=known_hashes):
+                done_files += 1
+                if error is not None:
+                    self._report(progress_callback, done_files, total_files,
+                                 f"❌ {Path(file_path).name}")
+                    continue
+                
+                relative, file_hash = changed[file_path]
+                entry = files.get(relative)
+                chunks = doc_service.split_documents(pages)
+                
+                chunk_ids = self._chunk_ids(relative, chunks)
+                old_ids = set(entry["chunk_ids"]) if entry else set()
+                document_metadata = doc_service.document_metadata.get(str(file_path), {})
+                # ხელახალი დაყოფისას ან სათაურის (ნომერი, თარიღი, გადასახადი) ცვლილებისას
+                # იგივე ID-ის chunk-საც ახალი metadata აქვს - ყველა chunk თავიდან იწერება
+                # (ვექტორები embedding ქეშიდან მოდის; shard-ის შეცვლისას chunk გადადის)
+                metadata_changed = entry is not None and entry.get("metadata") != document_metadata
+                kept_ids = set() if rechunk or metadata_changed else old_ids
+                
+                new_chunks = [chunk for chunk_id, chunk in zip(chunk_ids, chunks)
+                              if chunk_id not in kept_ids]
+                new_ids = [chunk_id for chunk_id in chunk_ids if chunk_id not in kept_ids]
+                stale_ids = sorted(old_ids - set(chunk_ids))
+                
+                self._delete_chunks(stale_ids)
+                if new_chunks and embedder is None:
+                    self._add_in_batches(new_chunks, new_ids)
+                elif new_chunks:
+                    # რამდენიმე ფაილის chunks ერთად - pool-ის ყველა worker დაკავებულია
+                    pending_chunks.extend(new_chunks)
+                    pending_ids.extend(new_ids)
+                    if len(pending_chunks) >= embedder.flush_size:
+                        self._add_in_batches(pending_chunks, pending_ids, embedder=embedder)
+                        pending_chunks, pending_ids = [], []
+                
+                files[relative] = {
+                    "hash": file_hash,
+                    "chunk_ids": chunk_ids,
+                    # დოკუმენტების კატალოგი: ნომერი, თარიღი, გადასახადის სახე
+                    "metadata": document_metadata
+                }
+                stats["added"] += len(new_ids)
+                stats["deleted"] += len(stale_ids)
+                stats["changed_files"] += 1
+                print(f"📄 {relative}: +{len(new_ids)} / -{len(stale_ids)} chunk")
+                self._report(progress_callback, done_files, total_files,
+                             f"📄 {relative}: +{len(new_ids)} chunk")
+            
+            if pending_chunks:
+                self._add_in_batches(pending_chunks, pending_ids, embedder=embedder)
+        finally:
+            if embedder is not None:
+                embedder.close()
+        
+        stats["failed_files"] = len(doc_service.load_errors)
+        
+        if stats["added"] or stats["deleted"] or stats["removed_files"]:
+            self._bump_version(manifest)
+        manifest["embedding_model"] = self.embedding_model
+        manifest["embedding_key"] = embedding_key
+        manifest["backend"] = self.backend
+        manifest["shard_by"] = self.shard_by
+        manifest["chunking"] = doc_service.chunking
+        self._persist()
+        self._save_manifest(manifest)
+        
+        stats["total_chunks"] = self._vectordb.count()
+        stats["index_version"] = manifest["version"]
+        print(f"✅ სინქრონიზაცია დასრულდა: +{stats['added']} / -{stats['deleted']} chunk, "
+              f"{stats['unchanged_files']} ფაილი უცვლელია")
+        
+        return stats
+    
+    def rebuild_shard(self, shard, progress_callback=None):
+        """
+        ერთი shard-ის თავიდან აგება (დანარჩენი shard-ები არ იცვლება)
+        
+        shard-ი იშლება და ივსება manifest-ის ფაილებიდან: გვერდები მოდის
+        page cache-იდან, ვექტორები - embedding ქეშიდან, ამიტომ PDF-ის
+        ხელახალი parse და embedding მხოლოდ ქეშის გარეშე ხდება.
+        
+        Returns:
+            int: shard-ში ჩაწერილი chunks
+        """
+        if not self.shard_by:
+            raise ValueError("❌ shard-ები გამორთულია (settings.SHARD_BY)")
+        
+        doc_service = DocumentService()
+        manifest = self._load_manifest()
+        if manifest.get("chunking") != doc_service.chunking:
+            raise ValueError("❌ დაყოფის პარამეტრები შეიცვალა - ჯერ sync_database()")
+        
+        store = self._open_collection()
+        store.drop_shard(shard)
+        print(f"🧱 ვაგებ shard-ს თავიდან: {shard}")
+        
+        files = {doc_service.documents_dir / relative: relative for relative in manifest["files"]}
+        chunks, ids = [], []
+        for file_path, pages, error in doc_service.iter_file_pages(
+                [path for path in files if path.exists()]):
+            if error is not None:
+                continue
+            file_chunks = doc_service.split_documents(pages)
+            for chunk_id, chunk in zip(self._chunk_ids(files[file_path], file_chunks), file_chunks):
+                if store.shard_for(chunk.metadata) == shard:
+                    chunks.append(chunk)
+                    ids.append(chunk_id)
+        
+        embedder = self._parallel_embedder()
+        try:
+            self._add_in_batches(chunks, ids, progress_callback=progress_callback, embedder=embedder)
+        finally:
+            if embedder is not None:
+                embedder.close()
+        self._persist()
+        self._bump_version(manifest)
+        self._save_manifest(manifest)
+        print(f"✅ shard {shard}: {len(ids)} chunk")
+        return len(ids)
+    
+    def _parallel_embedder(self):
+        """ინდექსის აგების embedding pool (EMBEDDING_WORKERS > 1), სხვა შემთხვევაში None"""
+        if self.embedding_workers <= 1:
+            return None
+        from src.services.parallel_embedder import ParallelEmbedder
+        
+        # ქეშის შემოწმებისთვის მოდელის ჩატვირთვა მთავარ პროცესში საჭირო არაა
+        cache = None
+        if isinstance(self._embeddings, CachedEmbeddings):
+            cache = self._embeddings
+        elif settings.EMBEDDING_CACHE_ENABLED:
+            cache = CachedEmbeddings(None, embedding_cache_key(self.embedding_backend,
+                                                               self.embedding_model))
+        return ParallelEmbedder(
+            workers=self.embedding_workers, shard_size=self.batch_size,
+            backend=self.embedding_backend, model_name=self.embedding_model,
+            device=self.embedding_device, cache=cache
+        )
+    
+    def _add_in_batches(self, chunks, ids, progress_callback=None, embedder=None):
+        """chunks-ის ბაზაში ჩაწერა ფიქსირებული ზომის embedding batch-ებით"""
+        total = len(chunks)
+        if embedder is not None:
+            # ყველა ვექტორი ერთად pool-იდან, შემდეგ ჩაწერა batch-ებად
+            with span("embed_documents", chunks=total, workers=embedder.workers):
+                embeddings = embedder.embed([chunk.page_content for chunk in chunks])
+            with span("index_write", chunks=total):
+                for start in range(0, total, self.batch_size):
+                    end = start + self.batch_size
+                    self._write_batch(ids[start:end], chunks[start:end], embeddings[start:end])
+            self._report(progress_callback, total, total, f"{total}/{total} chunk")
+            return
+        
+        done = 0
+        for batch in _batched(zip(chunks, ids), self.batch_size):
+            batch_chunks = [chunk for chunk, _ in batch]
+            batch_ids = [chunk_id for _, chunk_id in batch]
+            with span("embed_documents", chunks=len(batch_chunks)):
+                embeddings = self.embeddings.embed_documents(
+                    [chunk.page_content for chunk in batch_chunks]
+                )
+            with span("index_write", chunks=len(batch_chunks)):
+                self._write_batch(batch_ids, batch_chunks, embeddings)
+            
+            done += len(batch)
+            self._report(progress_callback, done, total, f"{done}/{total} chunk")
+    
+    def add_precomputed(self, ids, documents, embeddings):
+        """
+        chunks-ის ჩაწერა უკვე გამოთვლილი embeddings-ით (manifest-ის გარეშე)
+        
+        გამოიყენება benchmark-ებში და გარე pipeline-ებში, სადაც ვექტორები
+        სხვაგან გამოითვალა.
+        """
+        self._open_collection()
+        for start in range(0, len(ids), self.batch_size):
+            end = start + self.batch_size
+            self._write_batch(ids[start:end], documents[start:end], embeddings[start:end])
+        self._persist()
+    
+    def _write_batch(self, ids, chunks, embeddings):
+        """ერთი batch-ის ჩაწერა ვექტორულ და ლექსიკურ ინდექსებში"""
+        texts = [chunk.page_content for chunk in chunks]
+        self._vectordb.add(ids, texts, [chunk.metadata for chunk in chunks], embeddings)
+        if self.hybrid_search:
+            self.lexical_index.add(ids, texts)
+    
+    def _delete_chunks(self, ids):
+        """chunks-ის წაშლა ვექტორული და ლექსიკური ინდექსებიდან"""
+        if not ids:
+            return
+        self._vectordb.delete(ids)
+        if self.hybrid_search:
+            self.lexical_index.remove(ids)
+    
+    def _persist(self):
+        """ვექტორული და ლექსიკური ინდექსების დისკზე ჩაწერა"""
+        self._info_cache = None
+        self._vectordb.persist()
+        if self.hybrid_search:
+            self.lexical_index.save()
+    
+    @staticmethod
+    def _report(progress_callback, done, total, message):
+        if progress_callback is not None:
+            progress_callback(done, total, message)
+    
+    @staticmethod
+    def _bump_version(manifest):
+        """
+        ახალი ინდექსის ვერსია: მთვლელი + აგების უნიკალური ID
+        
+        მთვლელი ბაზის საქაღალდეშია და სრული აგებისას (force_recreate)
+        თავიდან იწყება - ID-ის გარეშე ძველი და ახალი ინდექსი ერთნაირ
+        ვერსიას მიიღებდა და პასუხების ქეში ძველ პასუხებს დააბრუნებდა.
+        """
+        manifest["version"] = manifest.get("version", 0) + 1
+        manifest["build_id"] = uuid.uuid4().hex[:12]
+        manifest["updated_at"] = datetime.now().isoformat(timespec="seconds")
+    
+    def get_index_version(self):
+        """
+        ინდექსის ვერსია ("<მთვლელი>-<build_id>"), იცვლება ყოველ ცვლილებაზე
+        
+        manifest ხელახლა იკითხება მხოლოდ ფაილის შეცვლისას, ამიტომ სხვა
+        პროცესის (მაგ. CLI --sync) ცვლილება გაშვებულ აპლიკაციაშიც ჩანს.
+        """
+        try:
+            stat = os.stat(self.manifest_path)
+        except FileNotFoundError:
+            return "0"
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if self._version_cache is not None and self._version_cache[0] == key:
+            return self._version_cache[1]
+        
+        manifest = self._load_manifest()
+        version = str(manifest["version"])
+        if manifest.get("build_id"):
+            version = f"{version}-{manifest['build_id']}"
+        self._version_cache = (key, version)
+        return version
+    
+    def _refresh_if_changed(self):
+        """
+        სხვა პროცესის (მაგ. CLI --sync) ცვლილების შემდეგ ქეშების განახლება
         
+        ვერსია get_index_version-ით მოწმდება (manifest იკითხება მხოლოდ მისი
+        შეცვლისას). ახალ ვერსიაზე store-ის ფილტრების ქეში/ფაილები და BM25
+        ინდექსი დისკიდან ხელახლა იტვირთება.
+        """
+        version = self.get_index_version()
+        if version == self._seen_version:
+            return
+        changed = self._seen_version is not None
+        self._seen_version = version
+        if changed:
+            print(f"🔄 ინდექსი შეიცვალა (ვერსია {version}) - ვანახლებ ქეშებს")
+            self._vectordb.refresh()
+            self._lexical_index = None
+    
+    def _reconcile_manifest(self, manifest, embedding_key):
+        """
+        manifest-ის შედარება მიმდინარე backend-თან, shard_by-სა და embeddings-თან
+        
+        შეუსაბამობისას ძველი ინდექსი იშლება, manifest["files"] ცარიელდება
+        (ფაილები სრულად თავიდან აიგება) და manifest["manual"] ქრება.
+        """
+        # სხვა backend-ით აგებული manifest ამ backend-ისთვის არ გამოდგება
+        if manifest.get("backend", self.backend) != self.backend:
+            print(f"⚠️ manifest აგებულია '{manifest['backend']}' backend-ით - სრული აგება")
+            self._reset_index(backend=manifest["backend"],
+                              shard_by=manifest.get("shard_by", self.shard_by))
+            manifest["files"] = {}
+            manifest.pop("manual", None)
+        elif manifest.get("shard_by", self.shard_by) != self.shard_by:
+            print(f"⚠️ manifest აგებულია shard_by={manifest['shard_by']} პარამეტრით - სრული აგება")
+            # ძველი განლაგების (კოლექცია ან shard-ები) chunks აღარ უნდა დაბრუნდეს
+            self._reset_index(shard_by=manifest["shard_by"])
+            manifest["files"] = {}
+            manifest.pop("manual", None)
+        # სხვა მოდელის/ვარიანტის (torch / onnx / onnx-int8) ვექტორები ახალ კითხვებს
+        # არ შეესაბამება - ძველი chunks იშლება და ყველაფერი თავიდან ითვლება
+        built_with = self._manifest_embedding_key(manifest)
+        if (manifest["files"] or manifest.get("manual")) and built_with != embedding_key:
+            print(f"⚠️ ბაზა აგებულია '{built_with}' embeddings-ით ('{embedding_key}'-ის ნაცვლად) - სრული აგება")
+            self._reset_index()
+            manifest["files"] = {}
+            manifest.pop("manual", None)
+    
+    def _reset_index(self, backend=None, shard_by=None):
+        """
+        სრული აგების წინ ვექტორული და BM25 ინდექსების გასუფთავება
+        
+        manifest-ის (ძველი) backend-ით აგებული store-იც იშლება: სხვაგვარად
+        პარამეტრის უკან დაბრუნებისას ის თავიდან გაიხსნებოდა და შუალედში
+        წაშლილი ფაილების chunks დააბრუნებდა. ასევე სუფთავდება მიმდინარე
+        store - მასში შეიძლება უფრო ადრინდელი აგების მონაცემები იყოს.
+        """
+        backend = backend or self.backend
+        self._vectordb = None
+        if (backend, shard_by) != (self.backend, self.shard_by):
+            try:
+                create_vector_store(backend, self.persist_directory, self.collection_name,
+                                    shard_by=shard_by).clear()
+            except ImportError as e:
+                print(f"⚠️ ძველი '{backend}' store-ის გასუფთავება ვერ მოხერხდა: {e}")
+        self._open_collection().clear()
+        if self.hybrid_search:
+            self.lexical_index.remove(list(self.lexical_index.doc_lengths))
+        self._persist()
+    
+    def _create_store(self):
+        return create_vector_store(
+            self.backend, self.persist_directory, self.collection_name,
+            shard_by=self.shard_by, shard_workers=settings.SHARD_SEARCH_WORKERS
+        )
+    
+    def _open_collection(self):
+        """კოლექციის გახსნა (იქმნება თუ არ არსებობს)"""
+        if self._vectordb is None:
+            self._vectordb = self._create_store()
+            # BM25 ინდექსი იტვირთება (ან აიგება) ცვლილებების დაწყებამდე
+            if self.hybrid_search:
+                self._lexical_index = None
+                _ = self.lexical_index
         return self._vectordb
     
+    @staticmethod
+    def _chunk_ids(relative_path, chunks):
+        """დეტერმინისტული chunk ID-ები შიგთავსის hash-ით"""
+        ids = []
+        seen = {}
+        for chunk in chunks:
+            key = f"{relative_path}|{chunk.metadata.get('page', '')}|{chunk.page_content}"
+            chunk_id = hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+            # ერთ გვერდზე იდენტური ტექსტი რომ არ დაემთხვეს
+            count = seen.get(chunk_id, 0)
+            seen[chunk_id] = count + 1
+            ids.append(chunk_id if count == 0 else f"{chunk_id}-{count}")
+        return ids
+    
+    @staticmethod
+    def _manifest_embedding_key(manifest):
+        """
+        embeddings, რომლითაც ბაზა აიგო (embedding_cache_key). ძველ manifest-ში
+        მხოლოდ embedding_model იწერებოდა - torch backend-ის გასაღები
+        """
+        return manifest.get("embedding_key") or manifest.get("embedding_model")
+    
+    def _load_manifest(self):
+        """manifest-ის ჩატვირთვა (ფაილების hash-ები და chunk ID-ები)"""
+        if not self.manifest_path.exists():
+            return {"version": 0, "files": {}}
+        
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def _save_manifest(self, manifest):
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".json.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+        # ამ პროცესის ცვლილება - store-ი და BM25 უკვე განახლებულია
+        self._seen_version = self.get_index_version()
+    
     def load_database(self):
         """არსებული ბაზის ჩატვირთვა"""
         print(f"📂 ვტვირთავ ბაზას: {self.persist_directory}")
@@ -81,37 +636,213 @@ class VectorDBService:
         if not os.path.exists(self.persist_directory):
             raise FileNotFoundError(f"❌ ბაზა ვერ მოიძებნა: {self.persist_directory}")
         
-        self._vectordb = Chroma(
-            persist_directory=str(self.persist_directory),
-            embedding_function=self.embeddings,
-            collection_name=self.collection_name
-        )
+        # embeddings ყოველთვის აქ ითვლება, store-ს მოდელი არ სჭირდება -
+        # ამიტომ ბაზის გახსნა embedding მოდელის ჩატვირთვას არ ელოდება
+        self._seen_version = self.get_index_version()
+        self._vectordb = self._create_store()
+        
+        manifest = self._load_manifest()
+        # VECTOR_STORE_BACKEND-ის შეცვლის შემდეგ ახალი store ცარიელია
+        if manifest.get("backend", self.backend) != self.backend:
+            print(f"⚠️ ბაზა აგებულია '{manifest['backend']}' backend-ით, მიმდინარეა '{self.backend}' - "
+                  f"საჭიროა სინქრონიზაცია (სრული აგება)")
+        built_with = self._manifest_embedding_key(manifest)
+        embedding_key = embedding_cache_key(self.embedding_backend, self.embedding_model)
+        if built_with and built_with != embedding_key:
+            print(f"⚠️ ბაზა აგებულია '{built_with}' embeddings-ით, მიმდინარეა '{embedding_key}' - "
+                  f"საჭიროა სინქრონიზაცია (სრული აგება)")
         
-        print(f"✅ ბაზა ჩაიტვირთა! დოკუმენტები: {self._vectordb._collection.count()}")
+        shards = f", shard-ები: {len(self._vectordb.shards())}" if self.shard_by else ""
+        print(f"✅ ბაზა ჩაიტვირთა ({self.backend}{shards})! დოკუმენტები: {self._vectordb.count()}")
         
         return self._vectordb
     
-    def search(self, query, k=3):
-        """ძებნა ვექტორულ ბაზაში"""
+    def get_database(self):
+        """ჩატვირთული ბაზა (საჭიროების შემთხვევაში ჩაიტვირთება)"""
+        if self._vectordb is None:
+            self.load_database()
+        return self._vectordb
+    
+    def database_exists(self):
+        """არსებობს თუ არა შენახული ბაზა დისკზე"""
+        return os.path.exists(self.persist_directory) and len(os.listdir(self.persist_directory)) > 0
+    
+    def close(self):
+        """store-ის thread pool-ების დახურვა (registry.reload-ისას ძველი სერვისისთვის)"""
+        if self._vectordb is not None:
+            self._vectordb.close()
+    
+    def warm_up(self):
+        """
+        ბაზისა და embedding მოდელის პარალელური ჩატვირთვა პირველ კითხვამდე
+        
+        ერთი საცდელი ძებნა ტვირთავს BM25 ინდექსს და mmap/HNSW გვერდებს.
+        """
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="vectordb-warmup") as executor:
+            database = executor.submit(self.get_database)
+            embedding = executor.submit(self.embed_query, "warm-up")
+            database.result()
+            query_embedding = embedding.result()
+        
+        self.search_by_vector(query_embedding, k=1, query="warm-up")
+        if self.reranker is not None:
+            self.reranker.warm_up()
+    
+    def search(self, query, k=3, filters=None):
+        """ძებნა ვექტორულ ბაზაში (hybrid რეჟიმში - BM25-თან ერთად)"""
+        return self.search_by_vector(self.embed_query(query), k=k, query=query, filters=filters)
+    
+    def embed_query(self, query):
+        """კითხვის embedding-ის გამოთვლა"""
+        return self.embeddings.embed_query(query)
+    
+    def embed_queries(self, queries):
+        """რამდენიმე კითხვის embedding ერთი batch-ით"""
+        if hasattr(self.embeddings, "embed_queries"):
+            return self.embeddings.embed_queries(queries)
+        return self.embeddings.embed_documents(queries)
+    
+    def search_by_vector(self, embedding, k=3, query=None, filters=None, strict=True):
+        """
+        ძებნა უკვე გამოთვლილი embedding-ით
+        
+        query თუ გადმოეცა და hybrid ძებნა ჩართულია, ვექტორული და BM25
+        შედეგები ერთიანდება Reciprocal Rank Fusion-ით.
+        """
+        return self.search_many_by_vector([embedding], k=k, queries=[query],
+                                          filters=[filters], strict=strict)[0]
+    
+    def search_many_by_vector(self, embeddings, k=3, queries=None, filters=None, strict=True):
+        """
+        ვექტორიზებული ძებნა რამდენიმე კითხვისთვის ერთდროულად
+        
+        Args:
+            filters: metadata ფილტრი ({"tax_type": "vat"}, {"article": ["165", "166"]})
+                - ერთი ყველა კითხვისთვის ან სია თითო კითხვაზე. გადაეცემა
+                store-ს (Chroma where / NumPy სტრიქონების ნიღაბი) და BM25-ს
+            strict: False - ფილტრით k-ზე ნაკლები შედეგისას დანარჩენი
+                ივსება ფილტრის გარეშე ძებნით
+        
+        Returns:
+            list: დოკუმენტების სია თითო კითხვაზე, იგივე რიგით
+        """
         if self._vectordb is None:
             self.load_database()
+        self._refresh_if_changed()
+        
+        if queries is None:
+            queries = [None] * len(embeddings)
+        if filters is None or isinstance(filters, dict):
+            filters = [filters] * len(embeddings)
+        
+        # ერთნაირი ფილტრის კითხვები ერთ ვექტორიზებულ ძებნაში
+        groups = {}
+        for i, query_filters in enumerate(filters):
+            key = json.dumps(query_filters or {}, sort_keys=True, ensure_ascii=False, default=list)
+            groups.setdefault(key, []).append(i)
         
-        return self._vectordb.similarity_search(query, k=k)
+        results = [None] * len(embeddings)
+        for indices in groups.values():
+            found = self._search_group([embeddings[i] for i in indices], k,
+                                       [queries[i] for i in indices], filters[indices[0]])
+            for i, docs in zip(indices, found):
+                results[i] = docs
+        
+        short = [i for i, docs in enumerate(results) if filters[i] and len(docs) < k]
+        if short and not strict:
+            extra = self._search_group([embeddings[i] for i in short], k,
+                                       [queries[i] for i in short], None)
+            for i, docs in zip(short, extra):
+                seen = {self._document_key(doc) for doc in results[i]}
+                fill = [doc for doc in docs if self._document_key(doc) not in seen]
+                results[i] = results[i] + fill[:k - len(results[i])]
+        return results
+    
+    @staticmethod
+    def _document_key(doc):
+        return doc.metadata.get("source"), doc.metadata.get("page"), doc.page_content
+    
+    def _search_group(self, embeddings, k, queries, filters):
+        """ერთი ფილტრით ძებნა: ვექტორები → (BM25 fusion) → (rerank) → k"""
+        # reranking-ისთვის ჯერ მეტი კანდიდატი მოგვაქვს (over-fetch), შემდეგ k რჩება
+        rerank = self.reranker is not None and any(queries)
+        depth = max(k, settings.RERANK_CANDIDATES) if rerank else k
+        hybrid = self.hybrid_search and any(queries)
+        candidates = max(depth, settings.HYBRID_CANDIDATES) if hybrid else depth
+        all_hits = self._vectordb.search_many(embeddings, candidates, filters)
+        allowed_ids = self._vectordb.filter_ids(filters) if hybrid and filters else None
+        
+        results = []
+        for hits, query in zip(all_hits, queries):
+            if not (self.hybrid_search and query):
+                docs = [doc for _, doc, _ in hits[:depth]]
+            else:
+                docs = self._fuse(hits, query, depth, candidates, allowed_ids)
+            if rerank and query:
+                docs = self.reranker.rerank(query, docs, k)
+            results.append(docs[:k])
+        return results
+    
+    def _fuse(self, vector_hits, query, k, candidates, allowed_ids=None):
+        """ვექტორული და BM25 შედეგების გაერთიანება (RRF)"""
+        lexical_hits = self.lexical_index.search(query, k=candidates, allowed_ids=allowed_ids)
+        
+        fused = reciprocal_rank_fusion([
+            [chunk_id for chunk_id, _, _ in vector_hits],
+            [chunk_id for chunk_id, _ in lexical_hits]
+        ])
+        top_ids = [chunk_id for chunk_id, _ in fused[:k]]
+        
+        documents = {chunk_id: doc for chunk_id, doc, _ in vector_hits}
+        missing = [chunk_id for chunk_id in top_ids if chunk_id not in documents]
+        if missing:
+            documents.update(self._vectordb.get(missing))
+        
+        return [documents[chunk_id] for chunk_id in top_ids if chunk_id in documents]
+    
+    def get_catalog(self):
+        """
+        ინდექსირებული დოკუმენტების კატალოგი (manifest-იდან)
+        
+        Returns:
+            list: [{"file", "chunks", "doc_number", "issue_date", "tax_type"}, ...]
+        """
+        files = self._load_manifest()["files"]
+        return [
+            {"file": relative, "chunks": len(entry["chunk_ids"]), **entry.get("metadata", {})}
+            for relative, entry in sorted(files.items())
+        ]
     
     def get_database_info(self):
-        """ბაზის შესახებ ინფორმაცია"""
+        """
+        ბაზის შესახებ ინფორმაცია
+        
+        ქეშირდება ინდექსის ცვლილებამდე (manifest-ის mtime / ამ სერვისის
+        persist), რომ UI-ის ყოველ rerun-ზე store-ის count() არ გამოიძახოს.
+        """
         if not os.path.exists(self.persist_directory):
             return {"exists": False}
         
         if self._vectordb is None:
             self.load_database()
         
-        return {
+        try:
+            version = os.stat(self.manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            version = None
+        if self._info_cache is not None and self._info_cache[0] == version:
+            return dict(self._info_cache[1])
+        
+        info = {
             "exists": True,
-            "documents_count": self._vectordb._collection.count(),
+            "documents_count": self._vectordb.count(),
             "collection_name": self.collection_name,
+            "backend": self.backend,
+            "shards": self._vectordb.shards() if self.shard_by else None,
             "path": str(self.persist_directory)
         }
+        self._info_cache = (version, info)
+        return dict(info)
 
 
 # ტესტი
@@ -122,8 +853,13 @@ if __name__ == "__main__":
     print("🗄️ Vector Database Service - ტესტი")
     print("="*60)
     
-    # შექმნა
-    db = service.create_database(force_recreate=True)
+    # შექმნა (--sync: მხოლოდ ცვლილებები)
+    if "--sync" in sys.argv:
+        service.sync_database()
+    elif "--rebuild-shard" in sys.argv:
+        service.rebuild_shard(sys.argv[sys.argv.index("--rebuild-shard") + 1])
+    else:
+        db = service.create_database(force_recreate=True)
     
     # ტესტ ძებნა
     print("\n🔍 ტესტ ძებნა:")
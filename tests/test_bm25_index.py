@@ -0,0 +1,37 @@
+"""
+BM25Index - დამატება, ჩანაცვლება, წაშლა და დისკიდან ჩატვირთვა
+"""
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.services.bm25_index import BM25Index
+
+
+def test_replace_and_remove_touch_only_own_terms(tmp_path):
+    index = BM25Index(tmp_path / "bm25.json")
+    index.add(["a", "b"], ["დღგ განაკვეთი", "საშემოსავლო გადასახადი"])
+    index.add(["a"], ["ქონების გადასახადი"])
+
+    assert "დღგ" not in index.postings
+    assert index.postings["გადასახადი"] == {"a": 1, "b": 1}
+    assert index.total_length == 4
+
+    index.remove(["b"])
+    assert index.postings["გადასახადი"] == {"a": 1}
+    assert "საშემოსავლო" not in index.postings
+    assert [doc_id for doc_id, _ in index.search("გადასახადი")] == ["a"]
+
+
+def test_remove_after_load(tmp_path):
+    path = tmp_path / "bm25.json"
+    index = BM25Index(path)
+    index.add(["a", "b"], ["დღგ განაკვეთი", "დღგ ჩათვლა"])
+    index.save()
+
+    loaded = BM25Index(path).load()
+    loaded.remove(["a"])
+    assert loaded.postings == {"დღგ": {"b": 1}, "ჩათვლა": {"b": 1}}
+    assert loaded.doc_terms == {"b": ["დღგ", "ჩათვლა"]}
+    assert len(loaded) == 1
@@ -0,0 +1,98 @@
+"""
+GeorgianLegalTextSplitter - სათაურები, გვერდის საზღვრები, გრძელი მუხლები
+"""
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from langchain_core.documents import Document
+
+from src.services.legal_splitter import GeorgianLegalTextSplitter
+
+
+def page(text, number=0, source="code.pdf"):
+    return Document(page_content=text, metadata={"source": source, "page": number})
+
+
+def split(pages, chunk_size=200, chunk_overlap=20):
+    return GeorgianLegalTextSplitter(chunk_size, chunk_overlap).split_documents(pages)
+
+
+def test_heading_before_long_paragraph_is_not_a_chunk():
+    text = "მუხლი 166. გათავისუფლება\n1. " + " ".join(["გადასახადი"] * 19) + ".\n2. მოკლე პუნქტი."
+    chunks = split([page(text)])
+
+    assert all(chunk.page_content != "მუხლი 166. გათავისუფლება" for chunk in chunks)
+    assert chunks[0].page_content.startswith("მუხლი 166. გათავისუფლება\n1. ")
+    assert all(chunk.metadata["article"] == "166" for chunk in chunks)
+
+
+def test_heading_followed_by_another_article_is_not_a_chunk():
+    text = "მუხლი 2. სათაური\nმუხლი 3. სხვა\n1. პირველი პუნქტი."
+    chunks = split([page(text)])
+
+    assert [chunk.page_content for chunk in chunks] == ["მუხლი 3. სხვა\n1. პირველი პუნქტი."]
+    assert chunks[0].metadata["article"] == "3"
+
+
+def test_heading_at_page_end_moves_to_next_page():
+    first = page("მუხლი 2. წინა\n1. ტექსტი.\nმუხლი 3. სათაური", number=0)
+    second = page("1. გაგრძელება შემდეგ გვერდზე.", number=1)
+    chunks = split([first, second])
+
+    contents = [chunk.page_content for chunk in chunks]
+    assert "მუხლი 3. სათაური" not in contents
+    assert contents[-1] == "მუხლი 3. სათაური\n1. გაგრძელება შემდეგ გვერდზე."
+    assert chunks[-1].metadata["article"] == "3"
+    assert chunks[-1].metadata["page"] == 1
+
+
+def test_carried_heading_has_no_position_on_next_page():
+    first = page("მუხლი 3. სათაური\n1. პირველი პუნქტი.", number=0)
+    second = page("2. მეორე პუნქტი.", number=1)
+    chunks = split([first, second])
+
+    assert chunks[0].metadata["start_index"] == 0
+    assert chunks[1].page_content == "მუხლი 3. სათაური\n2. მეორე პუნქტი."
+    assert "start_index" not in chunks[1].metadata
+
+
+def test_oversized_article_falls_back_to_recursive_split():
+    paragraph = " ".join(["სიტყვა"] * 60) + "."
+    text = f"მუხლი 7. გრძელი\n1. {paragraph}"
+    chunks = split([page(text)])
+
+    assert len(chunks) > 1
+    assert all(len(chunk.page_content) <= 200 for chunk in chunks)
+    assert all(chunk.metadata["article"] == "7" for chunk in chunks)
+    assert all(chunk.page_content.startswith("მუხლი 7. გრძელი\n") for chunk in chunks)
+    starts = [chunk.metadata["start_index"] for chunk in chunks]
+    assert starts == sorted(starts) and starts[0] == 0
+    # პოზიცია - სადაც chunk დაიწყებოდა, სათაური მის წინ რომ ყოფილიყო
+    prefix = len("მუხლი 7. გრძელი\n")
+    for chunk, start in zip(chunks, starts):
+        body = chunk.page_content[prefix:]
+        assert text[start + prefix:start + prefix + len(body)] == body
+
+
+def test_oversized_continuation_without_position():
+    paragraph = " ".join(["სიტყვა"] * 60) + "."
+    chunks = split([page("მუხლი 7. გრძელი\n1. მოკლე.", number=0),
+                    page(f"2. {paragraph}", number=1)])
+
+    continuation = [chunk for chunk in chunks if chunk.metadata["page"] == 1]
+    assert len(continuation) > 1
+    assert continuation[0].page_content.startswith("მუხლი 7. გრძელი\n2. ")
+    assert "start_index" not in continuation[0].metadata
+    assert all(chunk.metadata["start_index"] >= 0 for chunk in continuation[1:])
+
+
+def test_oversized_article_reassembles_in_context():
+    from src.core.context_builder import ContextAssembler
+
+    text = "მუხლი 7. გრძელი\n1. " + " ".join(f"სიტყვა{i}" for i in range(60)) + "."
+    chunks = split([page(text, number=3)], chunk_overlap=40)
+
+    context = ContextAssembler().assemble(chunks[::-1])
+    assert context == f"[დოკუმენტი 1: code.pdf, გვ. 3]\n{text}\n"
@@ -0,0 +1,57 @@
+"""
+NumpyStore - ფილტრირებული ძებნა და განზომილების შეცვლა
+"""
+import sys
+from pathlib import Path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+
+from src.services.vector_stores import NumpyStore
+
+
+def make_store(tmp_path, count=40, dimension=8):
+    rng = np.random.default_rng(0)
+    store = NumpyStore(tmp_path, "test")
+    vectors = rng.normal(size=(count, dimension))
+    store.add([f"id{i}" for i in range(count)], [f"text {i}" for i in range(count)],
+              [{"tax_type": "vat" if i % 4 else "property"} for i in range(count)], vectors)
+    store.persist()
+    return store, rng
+
+
+def brute_force(store, query, filters, k):
+    rows = [i for i, metadata in enumerate(store._metadatas) if metadata["tax_type"] in filters]
+    scores = store._matrix[rows] @ (query / np.linalg.norm(query))
+    return [store._ids[rows[i]] for i in np.argsort(-scores)[:k]]
+
+
+def test_filtered_search_matches_brute_force(tmp_path):
+    store, rng = make_store(tmp_path)
+    query = rng.normal(size=8)
+
+    for filters in ({"tax_type": "vat"}, {"tax_type": "property"}):  # ფართო და ვიწრო
+        hits = store.search(query, 5, filters)
+        assert [chunk_id for chunk_id, _, _ in hits] == brute_force(store, query, filters.values(), 5)
+        assert all(doc.metadata == filters for _, doc, _ in hits)
+
+
+def test_clear_then_new_dimension(tmp_path):
+    store, rng = make_store(tmp_path)
+    store.clear()
+    store.add(["new"], ["ახალი"], [{}], rng.normal(size=(1, 4)))
+    store.persist()
+
+    reopened = NumpyStore(tmp_path, "test")
+    assert reopened._matrix.shape == (1, 4)
+    assert reopened.search(rng.normal(size=4), 1)[0][0] == "new"
+
+
+def test_replace_all_vectors_with_new_dimension_in_one_persist(tmp_path):
+    store, rng = make_store(tmp_path)
+    store.delete(list(store._ids))
+    store.add(["new"], ["ახალი"], [{}], rng.normal(size=(1, 4)))
+    store.persist()
+
+    assert store._matrix.shape == (1, 4)